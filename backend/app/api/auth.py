@@ -1,23 +1,54 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import os
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from typing import Optional
-from ..models.user import User
+from ..models.user import User, UserResponse, UserUpdate
+from ..services.auth_cache import AuthCacheFactory
 from ..services.user_service import UserService
+from ..utils.metrics import timed
+from ..utils.tasks import ServiceTasks
+from ..utils.security import ConcurrencyLimiter, HasherBusy, TooManyAttempts, password_hasher
 
 router = APIRouter()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+auth_cache = AuthCacheFactory.create_cache()
+login_limiter = ConcurrencyLimiter(int(os.getenv("LOGIN_MAX_CONCURRENT_PER_IP", "2")))
+service_tasks = ServiceTasks()
 
 SECRET_KEY = "your-secret-key"  # Move to environment variables
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+@router.on_event("startup")
+async def start_auth():
+    await asyncio.to_thread(password_hasher.calibrate)
+    service_tasks.start(auth_cache.run())
+
+@router.on_event("shutdown")
+async def stop_auth():
+    await service_tasks.cancel_all()
+
 @router.post("/token")
-async def login(form_data: OAuth2PasswordRequestForm = Depends()):
-    user = await UserService.authenticate_user(form_data.username, form_data.password)
+async def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends()):
+    client = request.client.host if request.client else "unknown"
+    try:
+        async with login_limiter.acquire(client):
+            user = await UserService.authenticate_user(form_data.username, form_data.password)
+    except TooManyAttempts:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts in progress",
+            headers={"Retry-After": "1"},
+        )
+    except HasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Login temporarily unavailable",
+            headers={"Retry-After": "1"},
+        )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -39,20 +70,60 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(token: str = Depends(oauth2_scheme)):
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def _decode_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
     except JWTError:
-        raise credentials_exception
-    user = await UserService.get_user_by_username(username)
+        raise _credentials_exception()
+    if payload.get("sub") is None:
+        raise _credentials_exception()
+    return payload
+
+@timed("auth")
+async def get_current_user(token: str = Depends(oauth2_scheme)):
+    # Cached entries never outlive the token's exp, so a hit needs no decode;
+    # revoked tokens are dropped from the cache when they are revoked
+    user = auth_cache.get(token)
+    if user is not None:
+        return user
+    if await auth_cache.is_revoked(token):
+        raise _credentials_exception()
+    payload = _decode_token(token)
+    user = await UserService.get_user_by_username(payload["sub"])
+    if user is None:
+        raise _credentials_exception()
+    auth_cache.set(token, user, float(payload.get("exp", 0)))
+    return user
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(token: str = Depends(oauth2_scheme)):
+    if not auth_cache.shared:
+        # Other workers would keep accepting the token until it expires
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Logout is disabled with AUTH_CACHE_BACKEND=memory"
+        )
+    payload = _decode_token(token)
+    await auth_cache.revoke(token, float(payload.get("exp", 0)))
+
+@router.get("/users/me", response_model=UserResponse)
+async def read_current_user(current_user: User = Depends(get_current_user)):
+    return current_user
+
+@router.put("/users/me", response_model=UserResponse)
+async def update_current_user(
+    user_update: UserUpdate,
+    current_user: User = Depends(get_current_user)
+):
+    user = await UserService.update_user(current_user.id, user_update.model_dump(exclude_unset=True))
     if user is None:
-        raise credentials_exception
-    return user 
\ No newline at end of file
+        raise HTTPException(status_code=404, detail="User not found")
+    await auth_cache.invalidate_user(current_user.username)
+    return user
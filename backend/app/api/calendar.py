@@ -0,0 +1,67 @@
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from ..models.user import User
+from ..services.farm_service import FarmService
+from ..services.planting_calendar import KINDS, PlantingCalendarIndex
+from .auth import get_current_user
+from .routes import reference_data
+
+router = APIRouter(prefix="/calendar")
+
+calendar_index = PlantingCalendarIndex(reference_data)
+
+@router.get("/plantable")
+async def get_plantable_crops(
+    region: str,
+    start: Optional[date] = Query(None, description="First day of the period (default today)"),
+    days: int = Query(7, ge=1, le=365)
+):
+    """Crops that can be planted in a region during the period"""
+    start = start or date.today()
+    return {
+        "status": "success",
+        "region": region,
+        "start": start,
+        "days": days,
+        "crops": [window._asdict() for window in calendar_index.plantable(region, start, days)]
+    }
+
+@router.get("/harvest-due")
+async def get_harvest_due(
+    region: str,
+    crops: Optional[str] = Query(None, description="Comma-separated crop names"),
+    start: Optional[date] = Query(None, description="First day of the period (default today)"),
+    days: int = Query(14, ge=1, le=365)
+):
+    """Harvesting windows in a region during the period"""
+    start = start or date.today()
+    names = crops.split(",") if crops else None
+    return {
+        "status": "success",
+        "region": region,
+        "start": start,
+        "days": days,
+        "crops": [window._asdict() for window in calendar_index.harvest_due(region, start, days, names)]
+    }
+
+@router.get("/farms")
+async def get_farm_calendars(
+    kind: str = Query("harvesting", description="planting or harvesting"),
+    start: Optional[date] = Query(None, description="First day of the period (default today)"),
+    days: int = Query(14, ge=1, le=365),
+    current_user: User = Depends(get_current_user),
+    farm_service: FarmService = Depends()
+):
+    """Evaluate the calendar question for every farm of the current user at once"""
+    if kind not in KINDS:
+        raise HTTPException(status_code=400, detail=f"kind must be one of {', '.join(KINDS)}")
+    start = start or date.today()
+    farms = await farm_service.get_farms_by_user(current_user.id)
+    return {
+        "status": "success",
+        "kind": kind,
+        "start": start,
+        "days": days,
+        "farms": calendar_index.for_farms(farms, kind, start, days)
+    }
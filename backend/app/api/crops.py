@@ -1,9 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
-from ..models.crop import Crop, CropCreate, CropUpdate
+import os
+from collections import Counter
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+from ..models.crop import Crop, CropBulkRequest, CropBulkResponse, CropCreate, CropUpdate
 from ..models.user import User
 from ..services.crop import CropService
-from ..utils.auth import get_current_user
+from .auth import get_current_user
+from ..utils.pagination import next_link
+
+MAX_BULK_ITEMS = int(os.getenv("CROPS_MAX_BULK_ITEMS", "500"))
 
 router = APIRouter(
     prefix="/crops",
@@ -19,13 +25,56 @@ async def create_crop(
     """Create a new crop."""
     return await crop_service.create_crop(crop_data, current_user.id)
 
+@router.post("/bulk", response_model=CropBulkResponse)
+async def bulk_mutate_crops(
+    request: CropBulkRequest,
+    current_user: User = Depends(get_current_user),
+    crop_service: CropService = Depends()
+):
+    """Create, update and delete many crops in a single transaction."""
+    items = len(request.create) + len(request.update) + len(request.delete)
+    if items > MAX_BULK_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {MAX_BULK_ITEMS} items per request"
+        )
+    # Each crop may be touched once, or its results would contradict each other
+    counts = Counter([item.id for item in request.update] + request.delete)
+    repeated = sorted(crop_id for crop_id, count in counts.items() if count > 1)
+    if repeated:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Crop IDs referenced more than once: {repeated}"
+        )
+    results = await crop_service.bulk_mutate(request, current_user.id)
+    return {"results": results}
+
 @router.get("/", response_model=List[Crop])
 async def get_crops(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
+    limit: int = Query(100, ge=1, le=500),
     current_user: User = Depends(get_current_user),
     crop_service: CropService = Depends()
 ):
-    """Get all crops associated with the current user."""
-    return await crop_service.get_user_crops(current_user.id)
+    """Get a page of crops associated with the current user."""
+    try:
+        crops, next_cursor = await crop_service.get_user_crops(current_user.id, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+        response.headers["Link"] = next_link(request.url, next_cursor)
+    return crops
+
+@router.get("/export")
+async def export_crops(current_user: User = Depends(get_current_user)):
+    """Stream every crop of the current user as NDJSON."""
+    return StreamingResponse(
+        CropService.export_user_crops(current_user.id),
+        media_type="application/x-ndjson"
+    )
 
 @router.get("/{crop_id}", response_model=Crop)
 async def get_crop(
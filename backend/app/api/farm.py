@@ -1,51 +1,59 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
-from ..models.farm import Farm
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List, Optional
+from ..models.farm import FarmCreate, FarmResponse, FarmUpdate
 from ..services.farm_service import FarmService
 from .auth import get_current_user
 from ..models.user import User
 
 router = APIRouter()
 
-@router.post("/farms/", response_model=Farm)
+@router.post("/farms/", response_model=FarmResponse)
 async def create_farm(
-    farm_data: dict,
-    current_user: User = Depends(get_current_user)
+    farm_data: FarmCreate,
+    current_user: User = Depends(get_current_user),
+    farm_service: FarmService = Depends()
 ):
-    return await FarmService.create_farm(farm_data, current_user)
+    return await farm_service.create_farm(farm_data, current_user)
 
-@router.get("/farms/", response_model=List[Farm])
-async def get_user_farms(current_user: User = Depends(get_current_user)):
-    return await FarmService.get_farms_by_user(current_user.id)
+@router.get("/farms/", response_model=List[FarmResponse])
+async def get_user_farms(
+    crop: Optional[str] = Query(None, description="Only farms growing this crop"),
+    current_user: User = Depends(get_current_user),
+    farm_service: FarmService = Depends()
+):
+    return await farm_service.get_farms_by_user(current_user.id, crop)
 
-@router.get("/farms/{farm_id}", response_model=Farm)
+@router.get("/farms/{farm_id}", response_model=FarmResponse)
 async def get_farm(
     farm_id: int,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    farm_service: FarmService = Depends()
 ):
-    farm = await FarmService.get_farm(farm_id)
-    if not farm or farm.user_id != current_user.id:
+    farm = await farm_service.get_farm(farm_id, current_user.id)
+    if not farm:
         raise HTTPException(status_code=404, detail="Farm not found")
     return farm
 
-@router.put("/farms/{farm_id}", response_model=Farm)
+@router.put("/farms/{farm_id}", response_model=FarmResponse)
 async def update_farm(
     farm_id: int,
-    farm_data: dict,
-    current_user: User = Depends(get_current_user)
+    farm_data: FarmUpdate,
+    current_user: User = Depends(get_current_user),
+    farm_service: FarmService = Depends()
 ):
-    farm = await FarmService.get_farm(farm_id)
-    if not farm or farm.user_id != current_user.id:
+    farm = await farm_service.get_farm(farm_id, current_user.id)
+    if not farm:
         raise HTTPException(status_code=404, detail="Farm not found")
-    return await FarmService.update_farm(farm_id, farm_data)
+    return await farm_service.update_farm(farm, farm_data)
 
 @router.delete("/farms/{farm_id}")
 async def delete_farm(
     farm_id: int,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    farm_service: FarmService = Depends()
 ):
-    farm = await FarmService.get_farm(farm_id)
-    if not farm or farm.user_id != current_user.id:
+    farm = await farm_service.get_farm(farm_id, current_user.id)
+    if not farm:
         raise HTTPException(status_code=404, detail="Farm not found")
-    await FarmService.delete_farm(farm_id)
-    return {"message": "Farm deleted successfully"} 
\ No newline at end of file
+    await farm_service.delete_farm(farm)
+    return {"message": "Farm deleted successfully"}
@@ -1,13 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, UploadFile, File, Request, Query
 from typing import List, Optional
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from datetime import datetime
 import os
+import json
+import asyncio
+import logging
 from ..ml.disease_classifier import DiseaseClassifierFactory
 from ..ml.weather_predictor import WeatherPredictorFactory
 from ..ml.market_analyzer import MarketAnalyzerFactory
+from ..ml.market_comparison import MarketComparisonEngineFactory
 from ..utils.translator import TranslatorFactory
 from ..services.sms_service import SMSServiceFactory
+from ..services.market_snapshot_service import (
+    MarketSnapshotServiceFactory,
+    snapshot_response
+)
+from ..services.ussd_content import USSDContentRendererFactory
+from ..services.alert_broadcast import AlertBroadcasterFactory
+from ..services.reference_data import ReferenceDataCacheFactory
+from ..utils.tasks import ServiceTasks
 
 router = APIRouter()
 
@@ -16,7 +29,17 @@ disease_classifier = DiseaseClassifierFactory.create_classifier()
 weather_predictor = WeatherPredictorFactory.create_predictor()
 market_analyzer = MarketAnalyzerFactory.create_analyzer()
 translator = TranslatorFactory.create_translator()
-sms_service = SMSServiceFactory.create_sms_service()
+market_comparison = MarketComparisonEngineFactory.create_engine(market_analyzer)
+market_snapshots = MarketSnapshotServiceFactory.create_snapshot_service(
+    market_analyzer, translator
+)
+ussd_content = USSDContentRendererFactory.create_renderer(
+    weather_predictor, market_analyzer, market_snapshots, translator
+)
+sms_service = SMSServiceFactory.create_sms_service(ussd_content.lookup)
+alert_broadcaster = AlertBroadcasterFactory.create_broadcaster(sms_service, translator)
+reference_data = ReferenceDataCacheFactory.create_cache()
+service_tasks = ServiceTasks()
 
 class DiseaseQuery(BaseModel):
     image_url: Optional[str] = None
@@ -36,6 +59,27 @@ class MarketQuery(BaseModel):
 class SMSQuery(BaseModel):
     phone_number: str
     message: str
+    idempotency_key: Optional[str] = None
+
+class ScheduledSMSQuery(SMSQuery):
+    send_at: datetime
+
+class BulkSMSQuery(BaseModel):
+    phone_numbers: List[str]
+    message: str
+
+@router.on_event("startup")
+async def start_background_refresh():
+    try:
+        await asyncio.to_thread(reference_data.load)
+    except Exception:
+        logging.getLogger(__name__).exception("Reference data unavailable at startup")
+    service_tasks.start(reference_data.run())
+    service_tasks.start(ussd_content.run_periodic())
+
+@router.on_event("shutdown")
+async def stop_background_refresh():
+    await service_tasks.cancel_all()
 
 @router.post("/diagnose-disease")
 async def diagnose_disease(query: DiseaseQuery):
@@ -87,7 +131,13 @@ async def get_weather_forecast(region: str, language: str = "en"):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/market-prices")
-async def get_market_prices(crop: str, region: str, language: str = "en"):
+async def get_market_prices(request: Request, crop: str, region: str,
+                            language: str = "en"):
+    # Serve the precomputed snapshot (with ETag revalidation) when available
+    snapshot = market_snapshots.get(crop, region, language)
+    if snapshot is not None:
+        return snapshot_response(request, snapshot)
+
     try:
         insights = market_analyzer.get_market_insights(crop, region)
         
@@ -102,10 +152,49 @@ async def get_market_prices(crop: str, region: str, language: str = "en"):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/market-comparison")
+async def get_market_comparison(crop: Optional[str] = None,
+                                horizon_days: int = Query(7, ge=1, le=90)):
+    """Compare prices across regions and rank the best markets to sell in"""
+    try:
+        comparison = market_comparison.compare(crop, horizon_days)
+        return {
+            "status": "success",
+            "comparison": comparison
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/market-stats")
+async def get_market_stats(crop: Optional[str] = None, region: Optional[str] = None):
+    """Get moving averages, volatility and seasonal indices per price series"""
+    return {
+        "status": "success",
+        "statistics": market_analyzer.stats.get_all(crop, region)
+    }
+
 @router.post("/send-sms")
 async def send_sms(query: SMSQuery):
     try:
-        result = sms_service.send_sms(query.phone_number, query.message)
+        # Queued rather than sent inline so a gateway outage cannot lose it
+        result = await asyncio.to_thread(
+            sms_service.enqueue_sms,
+            query.phone_number, query.message, query.idempotency_key
+        )
+        return {
+            "status": "success",
+            "result": result
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/schedule-sms")
+async def schedule_sms(query: ScheduledSMSQuery):
+    try:
+        result = await asyncio.to_thread(
+            sms_service.schedule_sms,
+            query.phone_number, query.message, query.send_at, query.idempotency_key
+        )
         return {
             "status": "success",
             "result": result
@@ -113,6 +202,34 @@ async def send_sms(query: SMSQuery):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/sms/queue/metrics")
+async def get_sms_queue_metrics():
+    """Outbound SMS queue depth, due backlog and lag"""
+    return {
+        "status": "success",
+        "metrics": await asyncio.to_thread(sms_service.queue.metrics)
+    }
+
+@router.post("/send-bulk-sms")
+async def send_bulk_sms(query: BulkSMSQuery):
+    """Send an SMS to many recipients, streaming one NDJSON result line per recipient"""
+    async def results():
+        async for result in sms_service.stream_bulk_sms(query.phone_numbers, query.message):
+            yield json.dumps(result) + "\n"
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+@router.post("/alerts/broadcast", status_code=202)
+async def broadcast_alerts(background_tasks: BackgroundTasks, region: Optional[str] = None):
+    """Start sending active weather alerts by SMS to the farmers in the affected regions"""
+    regions = [region] if region else list(weather_predictor.regions)
+    # A region can have many thousands of farmers: fan out after responding
+    background_tasks.add_task(alert_broadcaster.run, regions)
+    return {
+        "status": "accepted",
+        "regions": regions
+    }
+
 @router.post("/ussd")
 async def handle_ussd(session_id: str, phone_number: str, 
                      ussd_code: str, text: str):
@@ -143,4 +260,29 @@ async def get_supported_regions():
     return {
         "status": "success",
         "regions": weather_predictor.regions
-    } 
\ No newline at end of file
+    }
+
+@router.get("/reference/crops")
+async def get_reference_crops():
+    """All crops from the in-memory reference snapshot"""
+    snapshot = reference_data.snapshot
+    return {
+        "status": "success",
+        "version": snapshot.version,
+        "crops": [crop._asdict() for crop in snapshot.crops]
+    }
+
+@router.get("/reference/crops/{crop}")
+async def get_reference_crop(crop: str, region: Optional[str] = None):
+    """A crop with its diseases and planting calendars, by id or name"""
+    snapshot = reference_data.snapshot
+    record = snapshot.crop(int(crop) if crop.isdigit() else crop)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Crop not found")
+    return {
+        "status": "success",
+        "version": snapshot.version,
+        "crop": record._asdict(),
+        "diseases": [disease._asdict() for disease in snapshot.diseases_for(record.id)],
+        "calendars": [calendar._asdict() for calendar in snapshot.calendars_for(record.id, region)]
+    }
@@ -0,0 +1,21 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from ..models.user import User
+from ..services.sync_service import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, SyncService
+from .auth import get_current_user
+
+router = APIRouter(prefix="/sync")
+
+@router.get("")
+async def sync_changes(
+    token: Optional[str] = Query(None, description="Token from the previous sync; omit for a full download"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    current_user: User = Depends(get_current_user),
+    sync_service: SyncService = Depends()
+):
+    """Crops, prices, weather and reference rows changed since the token"""
+    try:
+        result = await sync_service.changes_since(current_user.id, token, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid sync token")
+    return {"status": "success", **result}
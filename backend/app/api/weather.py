@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
 from typing import Dict, List
-from ..services.weather_service import WeatherService
+from ..services.weather_service import WeatherService, compact_current, compact_forecast
 from .auth import get_current_user
 from ..models.user import User
 
@@ -9,19 +9,23 @@ router = APIRouter()
 @router.get("/weather/current/{location}")
 async def get_current_weather(
     location: str,
+    compact: bool = False,
     current_user: User = Depends(get_current_user)
 ) -> Dict:
     """Get current weather data for a specific location"""
-    return await WeatherService.get_current_weather(location)
+    weather = await WeatherService.get_current_weather(location)
+    return compact_current(weather) if compact else weather
 
 @router.get("/weather/forecast/{location}")
 async def get_weather_forecast(
     location: str,
     days: int = 7,
+    compact: bool = False,
     current_user: User = Depends(get_current_user)
 ) -> List[Dict]:
-    """Get weather forecast for a specific location"""
-    return await WeatherService.get_forecast(location, days)
+    """Get weather forecast for a specific location; `compact` gives daily summaries only"""
+    forecast = await WeatherService.get_forecast(location, days)
+    return compact_forecast(forecast) if compact else forecast
 
 @router.get("/weather/alerts/{location}")
 async def get_weather_alerts(
@@ -0,0 +1,66 @@
+from typing import AsyncIterator
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+# App-owned tables (users, farms, crops) share the users metadata; the
+# model modules are imported so relationship targets always resolve
+from ..models.user import Base
+from ..models import crop_db, farm  # noqa: F401
+from ..utils.config import get_settings
+
+settings = get_settings()
+
+# Async drivers for the sync URLs used elsewhere (scripts, migrations)
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite"
+}
+
+engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def to_async_url(database_url: str) -> str:
+    """Swap the driver of a database URL for its asyncio counterpart"""
+    url = make_url(database_url)
+    driver = ASYNC_DRIVERS.get(url.drivername)
+    return url.set(drivername=driver).render_as_string(hide_password=False) if driver else database_url
+
+def create_async_db_engine(database_url: str, **overrides):
+    """Async engine with the pool tuned from settings.
+
+    SQLite (local development and tests) keeps SQLAlchemy's default pool,
+    which does not take sizing arguments.
+    """
+    url = to_async_url(database_url)
+    options = {"pool_pre_ping": True}
+    if not url.startswith("sqlite"):
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS
+        )
+    options.update(overrides)
+    return create_async_engine(url, **options)
+
+async_engine = create_async_db_engine(settings.DATABASE_URL)
+# expire_on_commit=False: returned objects stay readable after commit
+# without an implicit (and, under asyncio, illegal) lazy refresh
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
+def get_db():
+    """Yield a database session scoped to a single request"""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Yield an async database session scoped to a single request"""
+    async with AsyncSessionLocal() as session:
+        yield session
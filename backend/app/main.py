@@ -1,29 +1,71 @@
+import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from .utils.encoding import NegotiatedResponse, ResponseEncodingMiddleware
+from .utils.memory import memory_usage
+from .utils.metrics import MetricsMiddleware, metrics
 
-app = FastAPI(
-    title="AgroGPT Uganda API",
-    description="Backend API for AgroGPT Uganda application",
-    version="1.0.0"
-)
-
-# Configure CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # In production, replace with specific origins
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-@app.get("/")
-async def root():
-    return {
-        "message": "Welcome to AgroGPT Uganda API",
-        "status": "active",
-        "version": "1.0.0"
-    }
-
-if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+def create_app() -> FastAPI:
+    """Build the API application.
+
+    Importing the routers loads the ML models and market data, so under
+    gunicorn with preload_app this runs once in the master and the workers
+    share those pages copy-on-write (see gunicorn.conf.py).
+    """
+    from .api import auth, calendar, crops, farm, routes, sync, weather
+
+    app = FastAPI(
+        title="AgroGPT Uganda API",
+        description="API for AgroGPT Uganda - Agricultural Advisory and Support System",
+        version="1.0.0",
+        # JSON or MessagePack, with `fields=` selection (see utils/encoding.py)
+        default_response_class=NegotiatedResponse
+    )
+
+    # Configure CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # In production, replace with specific origins
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        # Crop listings return the next page's cursor in these headers
+        expose_headers=["X-Next-Cursor", "Link"],
+    )
+    app.add_middleware(
+        ResponseEncodingMiddleware,
+        minimum_size=int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "512"))
+    )
+    # Outermost, so the recorded latency covers every other middleware too
+    app.add_middleware(MetricsMiddleware, registry=metrics)
+
+    # Include routers from different modules
+    app.include_router(auth.router, prefix="/api/v1", tags=["Authentication"])
+    app.include_router(farm.router, prefix="/api/v1", tags=["Farm Management"])
+    # Paginated listings, NDJSON export and bulk mutations under /api/v1/crops
+    app.include_router(crops.router, prefix="/api/v1", tags=["Crops"])
+    app.include_router(weather.router, prefix="/api/v1", tags=["Weather"])
+    app.include_router(routes.router, prefix="/api/v1", tags=["General"])
+    app.include_router(calendar.router, prefix="/api/v1", tags=["Planting Calendar"])
+    app.include_router(sync.router, prefix="/api/v1", tags=["Offline Sync"])
+
+    @app.get("/")
+    async def root():
+        return {
+            "message": "Welcome to AgroGPT Uganda API",
+            "version": "1.0.0",
+            "status": "active"
+        }
+
+    @app.get("/metrics", include_in_schema=False)
+    async def prometheus_metrics():
+        """Latency histograms in the Prometheus text format"""
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+    @app.get("/debug/memory", include_in_schema=False)
+    async def worker_memory():
+        """Memory of the worker answering: unique to it vs shared with others"""
+        return memory_usage()
+
+    return app
@@ -6,10 +6,12 @@ from PIL import Image
 import os
 from typing import Dict, List, Tuple
 import json
+from ..utils.metrics import timed
 
 class DiseaseClassifier:
-    def __init__(self, model_path: str, config_path: str):
+    def __init__(self, model_path: str, config_path: str, arch: str = "resnet50"):
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self.arch = arch
         self.model = self._load_model(model_path)
         self.config = self._load_config(config_path)
         self.transform = transforms.Compose([
@@ -22,7 +24,8 @@ class DiseaseClassifier:
 
     def _load_model(self, model_path: str) -> nn.Module:
         """Load the pre-trained model"""
-        model = models.resnet50(pretrained=True)
+        # No pretrained download: the saved state dict replaces every weight
+        model = getattr(models, self.arch)(weights=None)
         num_ftrs = model.fc.in_features
         model.fc = nn.Linear(num_ftrs, 1000)  # Adjust based on number of classes
         model.load_state_dict(torch.load(model_path, map_location=self.device))
@@ -40,6 +43,7 @@ class DiseaseClassifier:
         image = Image.open(image_path).convert('RGB')
         return self.transform(image).unsqueeze(0).to(self.device)
 
+    @timed("disease_model")
     def predict(self, image_path: str) -> Tuple[str, float]:
         """Predict the disease from the image"""
         with torch.no_grad():
@@ -64,4 +68,6 @@ class DiseaseClassifierFactory:
     def create_classifier() -> DiseaseClassifier:
         model_path = os.getenv("DISEASE_MODEL_PATH", "./ml/models/disease_classifier.pth")
         config_path = os.getenv("DISEASE_CONFIG_PATH", "./ml/config/disease_config.json")
-        return DiseaseClassifier(model_path, config_path) 
\ No newline at end of file
+        # Any torchvision ResNet; smaller ones make cheap stand-ins for testing
+        arch = os.getenv("DISEASE_MODEL_ARCH", "resnet50")
+        return DiseaseClassifier(model_path, config_path, arch) 
\ No newline at end of file
@@ -1,10 +1,12 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 from datetime import datetime, timedelta
 import os
 from sklearn.linear_model import LinearRegression
 import joblib
+from ..utils.metrics import timed
+from .market_stats import MarketStatsEngine
 
 class MarketAnalyzer:
     def __init__(self, data_path: str):
@@ -18,6 +20,10 @@ class MarketAnalyzer:
             "cassava": "Cassava"
         }
         self.regions = ["central", "eastern", "northern", "western"]
+        # Incremented on every ingestion so derived views can detect staleness
+        self.version = 0
+        self._ingest_listeners: List[Callable[[str, str], None]] = []
+        self.stats = MarketStatsEngine()
         self._load_data()
 
     def _load_data(self):
@@ -30,20 +36,30 @@ class MarketAnalyzer:
             self.data = pd.DataFrame(columns=[
                 'crop', 'region', 'price', 'unit', 'date', 'source'
             ])
+        self.stats.load(self.data)
 
     def add_price_data(self, crop: str, region: str, price: float, 
                       unit: str, source: str):
         """Add new price data to the dataset"""
+        date = datetime.now()
         new_data = pd.DataFrame([{
             'crop': crop,
             'region': region,
             'price': price,
             'unit': unit,
-            'date': datetime.now(),
+            'date': date,
             'source': source
         }])
         self.data = pd.concat([self.data, new_data], ignore_index=True)
         self.data.to_csv(self.data_path, index=False)
+        self.stats.update(crop, region, price, date)
+        self.version += 1
+        for listener in self._ingest_listeners:
+            listener(crop, region)
+
+    def add_ingest_listener(self, listener: Callable[[str, str], None]):
+        """Register a callback invoked with (crop, region) after new prices are ingested"""
+        self._ingest_listeners.append(listener)
 
     def get_current_prices(self, crop: Optional[str] = None, 
                           region: Optional[str] = None) -> List[Dict]:
@@ -99,6 +115,7 @@ class MarketAnalyzer:
             "confidence": 0.8  # Placeholder for actual confidence calculation
         }
 
+    @timed("market_analysis")
     def get_market_insights(self, crop: str, region: str) -> Dict:
         """Get comprehensive market insights for a crop in a region"""
         current_prices = self.get_current_prices(crop, region)
@@ -110,12 +127,13 @@ class MarketAnalyzer:
             "current_prices": current_prices,
             "price_trend": price_trend,
             "recommendation": self._generate_recommendation(price_trend),
+            "statistics": self.stats.get(crop, region),
             "last_updated": datetime.now().isoformat()
         }
 
     def _generate_recommendation(self, price_trend: Dict) -> str:
         """Generate recommendation based on price trend"""
-        if price_trend["trend"] == "increasing":
+        if price_trend.get("trend") == "increasing":
             return "Consider holding onto your produce as prices are expected to rise"
         else:
             return "Consider selling now as prices are expected to decrease"
@@ -0,0 +1,164 @@
+import os
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+
+from ..utils.metrics import timed
+from .market_analyzer import MarketAnalyzer
+
+SERIES_KEYS = ["crop", "region"]
+
+class MarketComparisonEngine:
+    """Compares prices of every crop across every region in a single pass.
+
+    Instead of fitting one model per (crop, region) like
+    MarketAnalyzer.predict_price_trend, all series are reduced together with
+    grouped aggregations, so the cost grows with the number of price rows
+    rather than with crops x regions x requests.
+    """
+
+    def __init__(self, market_analyzer: MarketAnalyzer,
+                 volatility_window_days: int = 30):
+        self.market_analyzer = market_analyzer
+        self.volatility_window_days = volatility_window_days
+        self._cache: Dict[Tuple[int, int], Dict] = {}
+
+    @timed("market_comparison")
+    def compare(self, crop: Optional[str] = None, horizon_days: int = 7) -> Dict:
+        """Get the cross-region comparison, optionally restricted to one crop"""
+        key = (self.market_analyzer.version, horizon_days)
+        comparison = self._cache.get(key)
+        if comparison is None:
+            comparison = self._compute(horizon_days)
+            # Entries for older data versions can never be served again
+            self._cache = {k: v for k, v in self._cache.items()
+                           if k[0] == self.market_analyzer.version}
+            self._cache[key] = comparison
+
+        if crop is None:
+            return comparison
+        return {
+            **comparison,
+            "crops": {crop: comparison["crops"][crop]} if crop in comparison["crops"] else {}
+        }
+
+    def _compute(self, horizon_days: int) -> Dict:
+        """Build the crop-by-region matrices and rankings for all series"""
+        frame = self._series_frame(self.market_analyzer.data, horizon_days)
+        regions = sorted(frame.index.get_level_values("region").unique()) if len(frame) else []
+
+        crops = {}
+        if len(frame):
+            latest = frame["latest_price"].unstack("region")
+            forecast = frame["forecast_price"].unstack("region")
+            volatility = frame["volatility"].unstack("region")
+
+            best_forecast = forecast.max(axis=1)
+            spread = best_forecast - forecast.min(axis=1)
+            spread_pct = spread / forecast.min(axis=1).where(forecast.min(axis=1) > 0)
+
+            ranked = frame.reset_index().sort_values(
+                ["crop", "forecast_price"], ascending=[True, False], kind="mergesort"
+            )
+            ranked["rank"] = ranked.groupby("crop").cumcount() + 1
+            ranked["gap_to_best"] = ranked["crop"].map(best_forecast) - ranked["forecast_price"]
+
+            for crop_name, rows in ranked.groupby("crop", sort=False):
+                crops[crop_name] = {
+                    "latest_prices": _row_dict(latest.loc[crop_name]),
+                    "forecast_prices": _row_dict(forecast.loc[crop_name]),
+                    "volatility": _row_dict(volatility.loc[crop_name]),
+                    "spread": _clean(spread.loc[crop_name]),
+                    "spread_pct": _clean(spread_pct.loc[crop_name]),
+                    "best_market": rows["region"].iloc[0],
+                    "ranking": self._ranking(rows)
+                }
+
+        return {
+            "horizon_days": horizon_days,
+            "volatility_window_days": self.volatility_window_days,
+            "regions": regions,
+            "crops": crops,
+            "data_version": self.market_analyzer.version,
+            "last_updated": datetime.now().isoformat()
+        }
+
+    def _series_frame(self, data: pd.DataFrame, horizon_days: int) -> pd.DataFrame:
+        """Reduce raw price rows to one row of statistics per (crop, region)"""
+        columns = ["latest_price", "forecast_price", "trend_per_day",
+                   "volatility", "observations", "last_date"]
+        if data.empty:
+            return pd.DataFrame(columns=columns)
+
+        df = data[SERIES_KEYS + ["price", "date"]].dropna()
+        df = df.sort_values("date", kind="mergesort").reset_index(drop=True)
+        grouped = df.groupby(SERIES_KEYS, sort=False)
+
+        # Closed-form least squares slope per series from grouped sums
+        first_date = grouped["date"].transform("min")
+        x = (df["date"] - first_date).dt.total_seconds() / 86400.0
+        sums = df.assign(x=x, xy=x * df["price"], xx=x * x).groupby(
+            SERIES_KEYS, sort=False
+        )[["x", "price", "xy", "xx"]].sum()
+        n = grouped.size()
+        denominator = n * sums["xx"] - sums["x"] ** 2
+        slope = ((n * sums["xy"] - sums["x"] * sums["price"]) / denominator)
+        slope = slope.where(denominator > 0, 0.0)
+
+        # Volatility: std of log returns inside the trailing window of each series
+        log_returns = np.log(df["price"].where(df["price"] > 0)).groupby(
+            [df["crop"], df["region"]], sort=False
+        ).diff()
+        window_start = grouped["date"].transform("max") - pd.Timedelta(
+            days=self.volatility_window_days
+        )
+        in_window = df["date"] > window_start
+        volatility = log_returns[in_window].groupby(
+            [df.loc[in_window, "crop"], df.loc[in_window, "region"]], sort=False
+        ).std()
+
+        latest = grouped["price"].last()
+        frame = pd.DataFrame({
+            "latest_price": latest,
+            "forecast_price": latest + slope * horizon_days,
+            "trend_per_day": slope,
+            "volatility": volatility,
+            "observations": n,
+            "last_date": grouped["date"].max()
+        })
+        frame.index.names = SERIES_KEYS
+        return frame
+
+    @staticmethod
+    def _ranking(rows: pd.DataFrame) -> List[Dict]:
+        """Format the ranked regions of one crop, best market first"""
+        return [
+            {
+                "rank": int(row.rank),
+                "region": row.region,
+                "latest_price": _clean(row.latest_price),
+                "forecast_price": _clean(row.forecast_price),
+                "trend_per_day": _clean(row.trend_per_day),
+                "volatility": _clean(row.volatility),
+                "gap_to_best": _clean(row.gap_to_best),
+                "observations": int(row.observations),
+                "last_date": row.last_date.isoformat()
+            }
+            for row in rows.itertuples(index=False)
+        ]
+
+def _clean(value) -> Optional[float]:
+    """Convert numpy scalars to JSON-friendly floats, NaN to None"""
+    if value is None or pd.isna(value):
+        return None
+    return round(float(value), 4)
+
+def _row_dict(row: pd.Series) -> Dict[str, Optional[float]]:
+    return {region: _clean(value) for region, value in row.items()}
+
+class MarketComparisonEngineFactory:
+    @staticmethod
+    def create_engine(market_analyzer: MarketAnalyzer) -> MarketComparisonEngine:
+        window = int(os.getenv("MARKET_VOLATILITY_WINDOW_DAYS", "30"))
+        return MarketComparisonEngine(market_analyzer, window)
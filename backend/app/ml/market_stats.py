@@ -0,0 +1,159 @@
+import math
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+class RollingWindow:
+    """Ring buffer over the last `size` values with a running mean and variance.
+
+    Each push is O(1): the running sums are updated with a sliding-window
+    variant of Welford's algorithm instead of rescanning the buffer.
+    """
+
+    __slots__ = ("size", "count", "mean", "_m2", "_values", "_index")
+
+    def __init__(self, size: int):
+        self.size = size
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._values: List[float] = [0.0] * size
+        self._index = 0
+
+    def push(self, value: float):
+        """Add a value, evicting the oldest one once the window is full"""
+        if self.count < self.size:
+            self.count += 1
+            delta = value - self.mean
+            self.mean += delta / self.count
+            self._m2 += delta * (value - self.mean)
+        else:
+            old = self._values[self._index]
+            old_mean = self.mean
+            self.mean += (value - old) / self.size
+            self._m2 += (value - old) * (value - self.mean + old - old_mean)
+        self._values[self._index] = value
+        self._index = (self._index + 1) % self.size
+
+    @property
+    def variance(self) -> Optional[float]:
+        """Sample variance of the values currently in the window"""
+        if self.count < 2:
+            return None
+        # Guard against tiny negative values from floating point drift
+        return max(self._m2, 0.0) / (self.count - 1)
+
+    @property
+    def std(self) -> Optional[float]:
+        variance = self.variance
+        return math.sqrt(variance) if variance is not None else None
+
+    @property
+    def full(self) -> bool:
+        return self.count == self.size
+
+class SeriesStats:
+    """Running statistics of a single (crop, region) price series"""
+
+    __slots__ = ("price_windows", "return_window", "last_price", "last_date",
+                 "count", "_month_sums", "_month_counts", "_total")
+
+    def __init__(self, windows: Tuple[int, ...], volatility_window: int):
+        self.price_windows = {size: RollingWindow(size) for size in windows}
+        self.return_window = RollingWindow(volatility_window)
+        self.last_price: Optional[float] = None
+        self.last_date: Optional[datetime] = None
+        self.count = 0
+        self._month_sums = [0.0] * 12
+        self._month_counts = [0] * 12
+        self._total = 0.0
+
+    def update(self, price: float, date: datetime):
+        """Fold one new price observation into every statistic"""
+        for window in self.price_windows.values():
+            window.push(price)
+        if self.last_price is not None and self.last_price > 0 and price > 0:
+            self.return_window.push(math.log(price / self.last_price))
+        self.last_price = price
+        self.last_date = date
+        self.count += 1
+        self._month_sums[date.month - 1] += price
+        self._month_counts[date.month - 1] += 1
+        self._total += price
+
+    def seasonal_indices(self) -> Dict[int, float]:
+        """Mean price per calendar month relative to the overall mean (1.0 = average)"""
+        if self.count == 0 or self._total == 0:
+            return {}
+        overall_mean = self._total / self.count
+        return {
+            month + 1: round((self._month_sums[month] / self._month_counts[month]) / overall_mean, 4)
+            for month in range(12)
+            if self._month_counts[month]
+        }
+
+    def to_dict(self) -> Dict:
+        return {
+            "observations": self.count,
+            "last_price": self.last_price,
+            "last_date": self.last_date.isoformat() if self.last_date else None,
+            "moving_averages": {
+                str(size): round(window.mean, 4) if window.count else None
+                for size, window in self.price_windows.items()
+            },
+            "volatility": _round(self.return_window.std),
+            "volatility_window": self.return_window.size,
+            "seasonal_indices": self.seasonal_indices()
+        }
+
+class MarketStatsEngine:
+    """Incrementally maintained rolling statistics for every price series.
+
+    Windows count observations rather than calendar days, so each new price
+    costs O(1) regardless of how much history the analyzer holds.
+    """
+
+    def __init__(self, windows: Iterable[int] = (7, 30), volatility_window: int = 30):
+        self.windows = tuple(windows)
+        self.volatility_window = volatility_window
+        self.series: Dict[Tuple[str, str], SeriesStats] = {}
+
+    def update(self, crop: str, region: str, price: float, date: datetime):
+        """Record a new price for a crop in a region"""
+        key = (crop, region)
+        stats = self.series.get(key)
+        if stats is None:
+            stats = self.series[key] = SeriesStats(self.windows, self.volatility_window)
+        stats.update(float(price), date)
+
+    def load(self, data: pd.DataFrame):
+        """Replay historical prices once, in date order, to seed the windows"""
+        self.series = {}
+        if data.empty:
+            return
+        ordered = data.sort_values("date", kind="mergesort")
+        for crop, region, price, date in ordered[["crop", "region", "price", "date"]].itertuples(
+            index=False, name=None
+        ):
+            if pd.isna(price) or pd.isna(date):
+                continue
+            self.update(crop, region, price, date)
+
+    def get(self, crop: str, region: str) -> Optional[Dict]:
+        """Get statistics for one series, or None when it has no prices"""
+        stats = self.series.get((crop, region))
+        return stats.to_dict() if stats is not None else None
+
+    def get_all(self, crop: Optional[str] = None,
+                region: Optional[str] = None) -> List[Dict]:
+        """Get statistics for every series matching the optional filters"""
+        return [
+            {"crop": series_crop, "region": series_region, **stats.to_dict()}
+            for (series_crop, series_region), stats in self.series.items()
+            if (crop is None or series_crop == crop)
+            and (region is None or series_region == region)
+        ]
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 6) if value is not None else None
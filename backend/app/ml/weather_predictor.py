@@ -5,6 +5,7 @@ from typing import Dict, List
 import joblib
 import os
 from datetime import datetime, timedelta
+from ..utils.metrics import timed
 
 class WeatherPredictor:
     def __init__(self, model_path: str):
@@ -58,6 +59,7 @@ class WeatherPredictor:
             "region": region
         }
 
+    @timed("weather_model")
     def get_weekly_forecast(self, region: str) -> List[Dict]:
         """Get weather forecast for the next 7 days"""
         forecasts = []
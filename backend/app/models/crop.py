@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field
 
 class CropBase(BaseModel):
@@ -30,4 +30,20 @@ class Crop(CropBase):
     updated_at: datetime
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True 
+class CropBulkUpdate(CropUpdate):
+    id: int = Field(..., description="ID of the crop to update")
+
+class CropBulkRequest(BaseModel):
+    create: List[CropCreate] = Field(default_factory=list, description="Crops to create")
+    update: List[CropBulkUpdate] = Field(default_factory=list, description="Partial updates by crop ID")
+    delete: List[int] = Field(default_factory=list, description="IDs of crops to delete")
+
+class CropBulkResult(BaseModel):
+    operation: str = Field(..., description="create, update or delete")
+    index: int = Field(..., description="Position of the item within its operation list")
+    id: Optional[int] = Field(None, description="ID of the affected crop")
+    status: str = Field(..., description="created, updated, deleted, not_found or forbidden")
+
+class CropBulkResponse(BaseModel):
+    results: List[CropBulkResult]
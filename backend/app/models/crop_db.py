@@ -1,11 +1,15 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
-from app.config.database import Base
+from .user import Base
 
 class CropDB(Base):
-    __tablename__ = "crops"
+    __tablename__ = "user_crops"
+    __table_args__ = (
+        # Keyset pagination seeks on (user_id, id)
+        Index("ix_user_crops_user_id_id", "user_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -20,7 +24,7 @@ class CropDB(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationship with User model
-    user = relationship("UserDB", back_populates="crops")
+    user = relationship("User", back_populates="crops")
 
     def __repr__(self):
         return f"<Crop {self.name} ({self.variety})>" 
\ No newline at end of file
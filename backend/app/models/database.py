@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, ForeignKey, Enum
+from sqlalchemy import create_engine, BigInteger, Column, Integer, String, Float, DateTime, ForeignKey, Enum, Index, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 import enum
@@ -18,6 +18,12 @@ class Language(enum.Enum):
     RUNYANKOLE = "nyn"
     ACHOLI = "ach"
 
+class MessageStatus(enum.Enum):
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    DEAD = "dead"
+
 class User(Base):
     __tablename__ = "users"
 
@@ -27,11 +33,16 @@ class User(Base):
     hashed_password = Column(String)
     user_type = Column(Enum(UserType))
     language = Column(Enum(Language))
-    region = Column(String)
+    region = Column(String, index=True)
     phone_number = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        # Alert broadcasts page through a region's users by id
+        Index("ix_users_region_id", "region", "id"),
+    )
+
 class Crop(Base):
     __tablename__ = "crops"
 
@@ -57,6 +68,11 @@ class Disease(Base):
 
     crop = relationship("Crop")
 
+    __table_args__ = (
+        # Diseases are listed per crop, by name
+        Index("ix_diseases_crop_id_name", "crop_id", "name"),
+    )
+
 class MarketPrice(Base):
     __tablename__ = "market_prices"
 
@@ -71,6 +87,13 @@ class MarketPrice(Base):
 
     crop = relationship("Crop")
 
+    __table_args__ = (
+        # Price lookups filter on crop and region, then range or sort on date
+        Index("ix_market_prices_crop_id_region_date", "crop_id", "region", "date"),
+        # Cross-crop regional snapshots ("all prices in Eastern since ...")
+        Index("ix_market_prices_region_date", "region", "date"),
+    )
+
 class WeatherData(Base):
     __tablename__ = "weather_data"
 
@@ -95,4 +118,76 @@ class PlantingCalendar(Base):
     harvesting_end = Column(DateTime)
     created_at = Column(DateTime, default=datetime.utcnow)
 
-    crop = relationship("Crop") 
\ No newline at end of file
+    crop = relationship("Crop")
+
+    __table_args__ = (
+        # Calendars are read per crop and region
+        Index("ix_planting_calendars_crop_id_region", "crop_id", "region"),
+    )
+
+class OutboundMessage(Base):
+    __tablename__ = "outbound_messages"
+
+    id = Column(Integer, primary_key=True, index=True)
+    idempotency_key = Column(String, unique=True, index=True, nullable=True)
+    phone_number = Column(String, nullable=False)
+    message = Column(String, nullable=False)
+    status = Column(Enum(MessageStatus), nullable=False, default=MessageStatus.PENDING)
+    send_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    last_error = Column(String)
+    provider_message_id = Column(String)
+    locked_by = Column(String)
+    locked_until = Column(DateTime)
+    sent_at = Column(DateTime)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # Workers claim and the scheduler peeks by (status, send_at)
+        Index("ix_outbound_messages_status_send_at", "status", "send_at"),
+    )
+
+class AlertDelivery(Base):
+    __tablename__ = "alert_deliveries"
+
+    id = Column(Integer, primary_key=True, index=True)
+    alert_key = Column(String, nullable=False)
+    phone_number = Column(String, nullable=False)
+    delivered_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # One notification per recipient per alert
+        UniqueConstraint("alert_key", "phone_number", name="uq_alert_deliveries_alert_phone"),
+    )
+
+class ReferenceDataVersion(Base):
+    __tablename__ = "reference_data_versions"
+
+    # Bumped (by triggers, see migration 0004) whenever crops, diseases or
+    # planting calendars change, so caches know when to reload
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class ChangeLog(Base):
+    __tablename__ = "change_log"
+
+    # One row per insert, update or delete of a synced table, written by
+    # triggers (see migration 0005); seq orders changes for delta sync
+    seq = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    table_name = Column(String, nullable=False)
+    row_id = Column(Integer, nullable=False)
+    # Owner of per-user rows (user_crops); NULL for shared tables
+    user_id = Column(Integer)
+    operation = Column(String, nullable=False)  # "upsert" or "delete"
+    changed_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    # Writing transaction on Postgres (see migration 0006), 0 elsewhere;
+    # delta sync reads in (xact_id, seq) order
+    xact_id = Column(BigInteger, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        Index("ix_change_log_changed_at", "changed_at"),
+        Index("ix_change_log_xact_id_seq", "xact_id", "seq"),
+    )
@@ -1,19 +1,85 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime
+from datetime import datetime
+from typing import List, Optional
+from pydantic import AliasChoices, BaseModel, Field, field_validator
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from .user import Base
 
+def normalize_crop_names(crops) -> List[str]:
+    """Lower-cased, de-duplicated crop names from a list or comma-separated string"""
+    if isinstance(crops, str):
+        crops = crops.split(",")
+    names = (crop.strip().lower() for crop in crops or [])
+    return list(dict.fromkeys(name for name in names if name))
+
 class Farm(Base):
     __tablename__ = "farms"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
     name = Column(String)
     location = Column(String)
     size_hectares = Column(Float)
-    main_crops = Column(String)  # Comma-separated list of crops
+    main_crops = Column(String)  # Legacy comma-separated list, superseded by farm_crops
     soil_type = Column(String)
     created_at = Column(DateTime)
     updated_at = Column(DateTime)
 
     # Relationships
-    owner = relationship("User", back_populates="farms") 
\ No newline at end of file
+    owner = relationship("User", back_populates="farms")
+    crops = relationship(
+        "FarmCrop", back_populates="farm", lazy="selectin",
+        cascade="all, delete-orphan", passive_deletes=True
+    )
+
+    @property
+    def crop_names(self) -> List[str]:
+        return [crop.crop_name for crop in self.crops]
+
+class FarmCrop(Base):
+    """One crop grown on one farm"""
+    __tablename__ = "farm_crops"
+    __table_args__ = (
+        # "Which farms grow X" lookups; the primary key serves per-farm reads
+        Index("ix_farm_crops_crop_name_farm_id", "crop_name", "farm_id"),
+    )
+
+    farm_id = Column(Integer, ForeignKey("farms.id", ondelete="CASCADE"), primary_key=True)
+    crop_name = Column(String, primary_key=True)
+
+    farm = relationship("Farm", back_populates="crops")
+
+class FarmBase(BaseModel):
+    name: str = Field(..., description="Name of the farm")
+    location: str = Field(..., description="Location of the farm")
+    size_hectares: float = Field(..., description="Size of the farm in hectares")
+    main_crops: List[str] = Field(default_factory=list, description="Main crops grown on the farm")
+    soil_type: Optional[str] = Field(None, description="Soil type of the farm")
+
+class FarmCreate(FarmBase):
+    pass
+
+class FarmUpdate(BaseModel):
+    name: Optional[str] = Field(None, description="Name of the farm")
+    location: Optional[str] = Field(None, description="Location of the farm")
+    size_hectares: Optional[float] = Field(None, description="Size of the farm in hectares")
+    main_crops: Optional[List[str]] = Field(None, description="Main crops grown on the farm")
+    soil_type: Optional[str] = Field(None, description="Soil type of the farm")
+
+class FarmResponse(FarmBase):
+    id: int
+    user_id: int
+    main_crops: List[str] = Field(
+        default_factory=list, validation_alias=AliasChoices("crop_names", "main_crops"),
+        description="Main crops grown on the farm"
+    )
+    created_at: datetime
+    updated_at: datetime
+
+    @field_validator("main_crops", mode="before")
+    @classmethod
+    def split_main_crops(cls, value):
+        return normalize_crop_names(value)
+
+    class Config:
+        from_attributes = True
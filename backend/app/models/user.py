@@ -1,5 +1,9 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, Field
 from sqlalchemy import Column, Integer, String, DateTime
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
 
 Base = declarative_base()
 
@@ -13,4 +17,26 @@ class User(Base):
     full_name = Column(String)
     language_preference = Column(String, default="en")
     created_at = Column(DateTime)
-    updated_at = Column(DateTime) 
\ No newline at end of file
+    updated_at = Column(DateTime)
+
+    # Relationships
+    farms = relationship("Farm", back_populates="owner", cascade="all, delete-orphan")
+    crops = relationship("CropDB", back_populates="user", cascade="all, delete-orphan")
+
+class UserUpdate(BaseModel):
+    email: Optional[str] = Field(None, description="Email address")
+    full_name: Optional[str] = Field(None, description="Full name")
+    language_preference: Optional[str] = Field(None, description="Preferred language code")
+    password: Optional[str] = Field(None, description="New password")
+
+class UserResponse(BaseModel):
+    id: int
+    username: str
+    email: Optional[str] = None
+    full_name: Optional[str] = None
+    language_preference: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,208 @@
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from collections import defaultdict
+from typing import AsyncIterator, Callable, Dict, List, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..config.database import SessionLocal
+from ..models.database import AlertDelivery, User
+from ..utils.translator import Translator
+from .sms_service import SMSService
+from .ussd_content import SMS_MAX_CHARS, truncate
+from .weather_service import WeatherService
+
+# Place names an upstream alert may use for each of our regions
+REGION_AREAS = {
+    "central": ["central", "kampala", "wakiso", "mukono", "masaka", "mpigi"],
+    "eastern": ["eastern", "mbale", "jinja", "soroti", "tororo", "iganga"],
+    "northern": ["northern", "gulu", "lira", "arua", "kitgum", "moroto"],
+    "western": ["western", "mbarara", "fort portal", "kabale", "hoima", "kasese"]
+}
+
+logger = logging.getLogger(__name__)
+
+Recipient = Tuple[str, str]
+
+class AlertBroadcaster:
+    """Fans weather alerts out by SMS to the farmers in the affected regions.
+
+    Recipients are read from `users` in keyset pages of fixed size, so
+    memory stays flat however many farmers a region has.
+    Each chunk is deduplicated against `alert_deliveries`, grouped by
+    language and handed to the bulk SMS sender before the next is fetched.
+    """
+
+    def __init__(self, sms_service: SMSService, translator: Translator,
+                 session_factory: Callable[[], Session] = SessionLocal,
+                 chunk_size: int = 1000):
+        self.sms_service = sms_service
+        self.translator = translator
+        self.session_factory = session_factory
+        self.chunk_size = chunk_size
+
+    async def broadcast(self, regions: List[str]) -> Dict:
+        """Fetch the active alerts of each region and notify its farmers"""
+        reports = []
+        for region in regions:
+            alerts = await WeatherService.get_alerts(region)
+            for alert in alerts:
+                if self.matches_region(alert, region):
+                    reports.append(await self.broadcast_alert(alert, region))
+        return {
+            "alerts": len(reports),
+            "sent": sum(report["sent"] for report in reports),
+            "reports": reports
+        }
+
+    async def run(self, regions: List[str]):
+        """Broadcast in the background, logging the outcome"""
+        try:
+            report = await self.broadcast(regions)
+        except Exception:
+            logger.exception("Alert broadcast for %s failed", ", ".join(regions))
+            return
+        logger.info("Alert broadcast for %s: %d alerts, %d sent",
+                    ", ".join(regions), report["alerts"], report["sent"])
+
+    async def broadcast_alert(self, alert: Dict, region: str) -> Dict:
+        """Send one alert to every not-yet-notified farmer in a region"""
+        key = self.alert_key(alert)
+        messages: Dict[str, str] = {}
+        stats = {"recipients": 0, "duplicates": 0, "sent": 0, "failed": 0, "chunks": 0}
+        started = time.perf_counter()
+
+        async for chunk in self._recipient_chunks(region):
+            stats["chunks"] += 1
+            stats["recipients"] += len(chunk)
+            fresh = await asyncio.to_thread(self._claim_recipients, key, chunk)
+            stats["duplicates"] += len(chunk) - len(fresh)
+
+            by_language: Dict[str, List[str]] = defaultdict(list)
+            for phone_number, language in fresh:
+                by_language[language].append(phone_number)
+
+            failed = []
+            for language, phone_numbers in by_language.items():
+                if language not in messages:
+                    messages[language] = self.localize(alert, language)
+                async for result in self.sms_service.stream_bulk_sms(phone_numbers, messages[language]):
+                    if result["status"] == "success":
+                        stats["sent"] += 1
+                    else:
+                        failed.append(result["phone_number"])
+            stats["failed"] += len(failed)
+            # Let a later broadcast of the same alert retry these recipients
+            if failed:
+                await asyncio.to_thread(self._release_recipients, key, failed)
+
+        elapsed = time.perf_counter() - started
+        return {
+            "alert_key": key,
+            "headline": alert.get("headline"),
+            "region": region,
+            **stats,
+            "elapsed_seconds": round(elapsed, 3),
+            "recipients_per_second": round(stats["recipients"] / elapsed, 1) if elapsed else None,
+            "sent_per_second": round(stats["sent"] / elapsed, 1) if elapsed else None
+        }
+
+    @staticmethod
+    def alert_key(alert: Dict) -> str:
+        """Stable identifier of an upstream alert, used for deduplication"""
+        identity = "|".join(
+            str(alert.get(field, "")) for field in ("headline", "effective", "expires", "areas")
+        )
+        return hashlib.sha1(identity.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def matches_region(alert: Dict, region: str) -> bool:
+        """Whether an alert applies to a region; alerts without areas apply everywhere"""
+        areas = (alert.get("areas") or "").lower()
+        if not areas:
+            return True
+        return any(area in areas for area in REGION_AREAS.get(region, [region]))
+
+    def localize(self, alert: Dict, language: str) -> str:
+        """Render an alert as an SMS in the recipient's language"""
+        headline = alert.get("headline") or alert.get("event") or ""
+        instruction = alert.get("instruction") or alert.get("desc") or ""
+        text = (
+            f"{self.translator.translate('Weather alert', language)}: "
+            f"{self.translator.translate(headline, language)}. "
+            f"{self.translator.translate(instruction, language)}"
+        )
+        return truncate(text.strip(), SMS_MAX_CHARS)
+
+    async def _recipient_chunks(self, region: str) -> AsyncIterator[List[Recipient]]:
+        """(phone_number, language) rows of a region in fixed-size keyset pages"""
+        last_id = 0
+        while True:
+            # Each page is read on a short-lived session, closed before the
+            # chunk is claimed, so no read stays open while deliveries are
+            # written (SQLite would report the database as locked)
+            rows = await asyncio.to_thread(self._recipient_page, region, last_id)
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            yield [
+                (phone_number, language.value if language else "en")
+                for _, phone_number, language in rows
+            ]
+            if len(rows) < self.chunk_size:
+                break
+
+    def _recipient_page(self, region: str, after_id: int) -> List[Tuple]:
+        with self.session_factory() as db:
+            return db.execute(
+                select(User.id, User.phone_number, User.language).where(
+                    User.region == region,
+                    User.phone_number.isnot(None),
+                    User.id > after_id
+                ).order_by(User.id).limit(self.chunk_size)
+            ).all()
+
+    def _claim_recipients(self, key: str, chunk: List[Recipient]) -> List[Recipient]:
+        """Record deliveries for recipients not yet notified of this alert"""
+        unique = dict(chunk)
+        with self.session_factory() as db:
+            for _ in range(2):
+                already = set(db.scalars(
+                    select(AlertDelivery.phone_number).where(
+                        AlertDelivery.alert_key == key,
+                        AlertDelivery.phone_number.in_(list(unique))
+                    )
+                ))
+                fresh = [(phone, language) for phone, language in unique.items()
+                         if phone not in already]
+                if not fresh:
+                    return []
+                try:
+                    db.execute(insert(AlertDelivery), [
+                        {"alert_key": key, "phone_number": phone} for phone, _ in fresh
+                    ])
+                    db.commit()
+                    return fresh
+                except IntegrityError:
+                    # A concurrent broadcast claimed some of them; re-check once
+                    db.rollback()
+        return []
+
+    def _release_recipients(self, key: str, phone_numbers: List[str]):
+        with self.session_factory() as db:
+            db.execute(delete(AlertDelivery).where(
+                AlertDelivery.alert_key == key,
+                AlertDelivery.phone_number.in_(phone_numbers)
+            ))
+            db.commit()
+
+class AlertBroadcasterFactory:
+    @staticmethod
+    def create_broadcaster(sms_service: SMSService, translator: Translator) -> AlertBroadcaster:
+        chunk_size = int(os.getenv("ALERT_BROADCAST_CHUNK_SIZE", "1000"))
+        return AlertBroadcaster(sms_service, translator, chunk_size=chunk_size)
@@ -0,0 +1,175 @@
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from ..models.user import User
+
+logger = logging.getLogger(__name__)
+
+REVOKED_PREFIX = "auth:revoked:"
+
+def token_digest(token: str) -> str:
+    """Cache key of a bearer token; the token itself is never stored"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+class AuthCache:
+    """Verified tokens and their users, kept in memory for a short TTL.
+
+    An entry lives for `ttl_seconds` or until its token expires, whichever
+    is sooner, so a cached token is never accepted past its `exp`. Entries
+    are dropped when their user is updated and tokens can be revoked on
+    logout. With Redis configured, revocations are stored there and both
+    kinds of invalidation are broadcast to every API process; that is the
+    default whenever REDIS_URL is set. With the in-memory backend a
+    revocation would only reach the process that received the logout, so
+    revocation is not offered (see `shared`).
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0, max_entries: int = 10000,
+                 redis_url: Optional[str] = None, channel: str = "auth-invalidate"):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.redis_url = redis_url
+        self.channel = channel
+        self._entries: "OrderedDict[str, Tuple[float, User]]" = OrderedDict()
+        self._by_username: Dict[str, Set[str]] = {}
+        # digest -> wall-clock expiry of the revoked token
+        self._revoked: Dict[str, float] = {}
+        self._redis = None
+        if redis_url:
+            import redis.asyncio as aioredis
+            self._redis = aioredis.Redis.from_url(redis_url)
+
+    @property
+    def shared(self) -> bool:
+        """Whether invalidations reach every API process"""
+        return self._redis is not None
+
+    def get(self, token: str) -> Optional[User]:
+        digest = token_digest(token)
+        entry = self._entries.get(digest)
+        if entry is None:
+            return None
+        expires_at, user = entry
+        if expires_at < time.monotonic():
+            self._discard(digest)
+            return None
+        self._entries.move_to_end(digest)
+        return user
+
+    def set(self, token: str, user: User, token_expires_at: float):
+        """Cache a verified token; `token_expires_at` is its `exp` claim"""
+        if self.ttl_seconds <= 0:
+            return
+        digest = token_digest(token)
+        lifetime = min(self.ttl_seconds, token_expires_at - time.time())
+        if lifetime <= 0:
+            return
+        self._discard(digest)
+        self._entries[digest] = (time.monotonic() + lifetime, user)
+        self._by_username.setdefault(user.username, set()).add(digest)
+        self._evict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _discard(self, digest: str):
+        entry = self._entries.pop(digest, None)
+        if entry is None:
+            return
+        digests = self._by_username.get(entry[1].username)
+        if digests is not None:
+            digests.discard(digest)
+            if not digests:
+                del self._by_username[entry[1].username]
+
+    def _evict(self):
+        # Least recently used first; expired entries are dropped on access
+        while len(self._entries) > self.max_entries:
+            self._discard(next(iter(self._entries)))
+
+    def _drop_user(self, username: str):
+        for digest in list(self._by_username.get(username, ())):
+            self._discard(digest)
+
+    def _drop_token(self, digest: str, token_expires_at: float):
+        self._discard(digest)
+        self._revoked[digest] = token_expires_at
+        now = time.time()
+        for revoked, expires_at in list(self._revoked.items()):
+            if expires_at < now:
+                del self._revoked[revoked]
+
+    async def is_revoked(self, token: str) -> bool:
+        digest = token_digest(token)
+        if digest in self._revoked:
+            return True
+        if self._redis is None:
+            return False
+        try:
+            return bool(await self._redis.exists(REVOKED_PREFIX + digest))
+        except Exception:
+            logger.exception("Could not check token revocation")
+            return False
+
+    async def revoke(self, token: str, token_expires_at: float):
+        """Reject a token from now until it would have expired anyway"""
+        if not self.shared:
+            raise RuntimeError("Token revocation needs the Redis auth cache backend")
+        digest = token_digest(token)
+        self._drop_token(digest, token_expires_at)
+        if self._redis is None:
+            return
+        remaining = int(token_expires_at - time.time()) + 1
+        if remaining > 0:
+            await self._redis.set(REVOKED_PREFIX + digest, 1, ex=remaining)
+        await self._redis.publish(self.channel, f"token:{digest}:{token_expires_at}")
+
+    async def invalidate_user(self, username: str):
+        """Forget cached copies of a user after it changed"""
+        self._drop_user(username)
+        if self._redis is not None:
+            await self._redis.publish(self.channel, f"user:{username}")
+
+    def _apply(self, message: str):
+        kind, _, rest = message.partition(":")
+        if kind == "user":
+            self._drop_user(rest)
+        elif kind == "token":
+            digest, _, expires_at = rest.partition(":")
+            self._drop_token(digest, float(expires_at or 0))
+
+    async def run(self):
+        """Apply invalidations published by other processes"""
+        if self._redis is None:
+            return
+        while True:
+            try:
+                async with self._redis.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            data = message["data"]
+                            self._apply(data.decode() if isinstance(data, bytes) else data)
+            except Exception:
+                logger.exception("Auth invalidation subscription lost; retrying")
+                # A missed message could leave a stale entry, so start clean
+                self._entries.clear()
+                self._by_username.clear()
+                await asyncio.sleep(5)
+
+class AuthCacheFactory:
+    @staticmethod
+    def create_cache() -> AuthCache:
+        ttl_seconds = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+        max_entries = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+        # Redis whenever it is configured, so logout works out of the box;
+        # "memory" is an explicit opt-out for single-process deployments
+        backend = (os.getenv("AUTH_CACHE_BACKEND") or ("redis" if os.getenv("REDIS_URL") else "memory")).lower()
+        redis_url = os.getenv("REDIS_URL") if backend == "redis" else None
+        channel = os.getenv("AUTH_CACHE_CHANNEL", "auth-invalidate")
+        return AuthCache(ttl_seconds, max_entries, redis_url, channel)
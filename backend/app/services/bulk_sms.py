@@ -0,0 +1,282 @@
+import asyncio
+import os
+import random
+import time
+from datetime import datetime
+from typing import AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
+
+import httpx
+
+PhoneNumbers = Union[Iterable[str], AsyncIterable[str]]
+
+# Only failures where the provider cannot have accepted the message are
+# retried: it refused it outright (429, 503) or it was never sent (no
+# connection). A timeout or a 5xx from a proxy may follow a delivery, so
+# retrying those could send the SMS twice.
+RETRYABLE_STATUS_CODES = {429, 503}
+RETRYABLE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+_DONE = object()
+
+class TokenBucket:
+    """Async token bucket limiting the rate of provider calls"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float = 1.0):
+        """Wait until `tokens` can be taken from the bucket.
+
+        A request larger than the bucket (a big batch) goes ahead once the
+        bucket is full and leaves it in debt, so later callers wait for the
+        whole cost to be paid back and the average rate still holds.
+        """
+        needed = min(tokens, self.capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= needed:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((needed - self._tokens) / self.rate)
+
+class AsyncBulkSMSSender:
+    """Concurrent SMS sender sharing one pooled HTTP client.
+
+    A fixed number of workers pull recipients from a bounded queue, so memory
+    stays flat however many numbers are streamed in. When `batch_size` is set
+    the provider's batch endpoint is used and each worker sends whole batches.
+    """
+
+    def __init__(self, api_key: str, base_url: str, sender_id: str = "AgroGPT",
+                 max_concurrency: int = 50, rate_per_second: float = 30.0,
+                 burst: Optional[float] = None, batch_size: int = 0,
+                 batch_path: str = "/sms/batch", max_retries: int = 3,
+                 backoff_base: float = 0.5, timeout: float = 10.0):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.sender_id = sender_id
+        self.max_concurrency = max_concurrency
+        self.batch_size = batch_size
+        self.batch_path = batch_path
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.timeout = timeout
+        self.rate_limiter = TokenBucket(rate_per_second, burst)
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json"
+                },
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency
+                ),
+                timeout=self.timeout
+            )
+        return self._client
+
+    async def close(self):
+        """Close the pooled HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def send(self, phone_numbers: PhoneNumbers, message: str) -> Dict:
+        """Send a message to every recipient and collect the results"""
+        results = [result async for result in self.stream(phone_numbers, message)]
+        sent = sum(1 for result in results if result["status"] == "success")
+        return {
+            "status": "completed",
+            "results": results,
+            "total_sent": sent,
+            "total_failed": len(results) - sent
+        }
+
+    async def stream(self, phone_numbers: PhoneNumbers,
+                     message: str) -> AsyncIterator[Dict]:
+        """Send a message to every recipient, yielding each result as it completes"""
+        async def units():
+            async for unit in self._units(phone_numbers):
+                yield unit, message
+
+        async for _, result in self._stream_units(units()):
+            yield result
+
+    async def stream_messages(self, messages: Dict[str, List[str]]) -> AsyncIterator[Tuple[str, Dict]]:
+        """Send several messages, each to its own recipients, through one pool of workers.
+
+        Yields (message, result) as each send completes, so distinct messages
+        go out concurrently instead of one after another.
+        """
+        async def units():
+            for message, phone_numbers in messages.items():
+                async for unit in self._units(phone_numbers):
+                    yield unit, message
+
+        async for item in self._stream_units(units()):
+            yield item
+
+    async def _stream_units(self, units_in: AsyncIterator[Tuple[List[str], str]]
+                            ) -> AsyncIterator[Tuple[str, Dict]]:
+        units: asyncio.Queue = asyncio.Queue(maxsize=self.max_concurrency * 2)
+        results: asyncio.Queue = asyncio.Queue(maxsize=max(self.max_concurrency, self.batch_size) * 2)
+
+        async def produce():
+            try:
+                async for unit in units_in:
+                    await units.put(unit)
+            finally:
+                for _ in range(self.max_concurrency):
+                    await units.put(None)
+
+        async def work():
+            try:
+                while True:
+                    unit = await units.get()
+                    if unit is None:
+                        break
+                    phone_numbers, message = unit
+                    for result in await self._send_unit(phone_numbers, message):
+                        await results.put((message, result))
+            finally:
+                await results.put(_DONE)
+
+        producer = asyncio.create_task(produce())
+        workers = [asyncio.create_task(work()) for _ in range(self.max_concurrency)]
+        finished = 0
+        try:
+            while finished < len(workers):
+                item = await results.get()
+                if item is _DONE:
+                    finished += 1
+                    continue
+                yield item
+            # Surface errors raised by workers or while iterating the recipients
+            await asyncio.gather(*workers)
+            await producer
+        finally:
+            for task in [producer, *workers]:
+                task.cancel()
+            await asyncio.gather(producer, *workers, return_exceptions=True)
+
+    async def _units(self, phone_numbers: PhoneNumbers) -> AsyncIterator[List[str]]:
+        """Group recipients into send units: single numbers, or provider batches"""
+        size = self.batch_size if self.batch_size > 1 else 1
+        unit: List[str] = []
+        if hasattr(phone_numbers, "__aiter__"):
+            async for phone_number in phone_numbers:
+                unit.append(phone_number)
+                if len(unit) == size:
+                    yield unit
+                    unit = []
+        else:
+            for phone_number in phone_numbers:
+                unit.append(phone_number)
+                if len(unit) == size:
+                    yield unit
+                    unit = []
+        if unit:
+            yield unit
+
+    async def _send_unit(self, phone_numbers: List[str], message: str) -> List[Dict]:
+        """Send one unit with retries and backoff, returning per-recipient results"""
+        if len(phone_numbers) > 1 or self.batch_size > 1:
+            path = self.batch_path
+            payload = {"to": phone_numbers, "message": message, "from": self.sender_id}
+        else:
+            path = "/sms/send"
+            payload = {"to": phone_numbers[0], "message": message, "from": self.sender_id}
+
+        error = None
+        attempt = 0
+        for attempt in range(1, self.max_retries + 2):
+            await self.rate_limiter.acquire(len(phone_numbers))
+            delay = self.backoff_base * (2 ** (attempt - 1)) * (1 + random.random())
+            try:
+                response = await self._get_client().post(path, json=payload)
+            except httpx.TransportError as e:
+                error = str(e) or e.__class__.__name__
+                if not isinstance(e, RETRYABLE_ERRORS):
+                    break
+            else:
+                if response.status_code < 400:
+                    return self._parse_results(phone_numbers, response, attempt)
+                error = f"HTTP {response.status_code}"
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    break
+                retry_after = response.headers.get("Retry-After")
+                if retry_after and retry_after.isdigit():
+                    delay = max(delay, float(retry_after))
+            if attempt <= self.max_retries:
+                await asyncio.sleep(delay)
+
+        timestamp = datetime.now().isoformat()
+        return [
+            {
+                "phone_number": phone_number,
+                "status": "error",
+                "message_id": None,
+                "error": error,
+                "attempts": attempt,
+                "timestamp": timestamp
+            }
+            for phone_number in phone_numbers
+        ]
+
+    @staticmethod
+    def _parse_results(phone_numbers: List[str], response: httpx.Response,
+                       attempts: int) -> List[Dict]:
+        """Map a provider response onto one result per recipient"""
+        timestamp = datetime.now().isoformat()
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+        if len(phone_numbers) == 1 and "results" not in body:
+            items = {phone_numbers[0]: body}
+        else:
+            items = {item.get("to"): item for item in body.get("results", [])}
+
+        results = []
+        for phone_number in phone_numbers:
+            item = items.get(phone_number, {})
+            failed = item.get("status") in ("error", "failed", "rejected")
+            results.append({
+                "phone_number": phone_number,
+                "status": "error" if failed else "success",
+                "message_id": item.get("message_id"),
+                "error": item.get("error") if failed else None,
+                "attempts": attempts,
+                "timestamp": timestamp
+            })
+        return results
+
+class BulkSMSSenderFactory:
+    @staticmethod
+    def create_sender(api_key: str, base_url: str) -> AsyncBulkSMSSender:
+        burst = os.getenv("SMS_RATE_LIMIT_BURST")
+        return AsyncBulkSMSSender(
+            api_key,
+            base_url,
+            sender_id=os.getenv("SMS_SENDER_ID", "AgroGPT"),
+            max_concurrency=int(os.getenv("SMS_MAX_CONCURRENCY", "50")),
+            rate_per_second=float(os.getenv("SMS_RATE_LIMIT_PER_SECOND", "30")),
+            burst=float(burst) if burst else None,
+            batch_size=int(os.getenv("SMS_BATCH_SIZE", "0")),
+            batch_path=os.getenv("SMS_BATCH_PATH", "/sms/batch"),
+            max_retries=int(os.getenv("SMS_MAX_RETRIES", "3"))
+        )
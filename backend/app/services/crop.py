@@ -1,14 +1,20 @@
 from fastapi import Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import delete, insert, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, List, Optional, Tuple
 from datetime import datetime
 
-from ..config.database import get_db
-from ..models.database.crop import CropDB
-from ..models.crop import CropCreate, CropUpdate
+from ..config.database import AsyncSessionLocal, get_async_db
+from ..models.crop_db import CropDB
+from ..models.crop import (
+    Crop, CropBulkRequest, CropBulkResult, CropCreate, CropUpdate
+)
+from ..utils.pagination import decode_cursor, encode_cursor
+
+Page = Tuple[List[CropDB], Optional[str]]
 
 class CropService:
-    def __init__(self, db: Session = Depends(get_db)):
+    def __init__(self, db: AsyncSession = Depends(get_async_db)):
         self.db = db
 
     async def create_crop(self, crop_data: CropCreate, user_id: int) -> CropDB:
@@ -18,20 +24,54 @@ class CropService:
             **crop_data.dict()
         )
         self.db.add(db_crop)
-        self.db.commit()
-        self.db.refresh(db_crop)
+        await self.db.commit()
+        await self.db.refresh(db_crop)
         return db_crop
 
     async def get_crop(self, crop_id: int) -> Optional[CropDB]:
         """Get a specific crop by ID."""
-        return self.db.query(CropDB).filter(CropDB.id == crop_id).first()
+        return await self.db.get(CropDB, crop_id)
+
+    async def get_crops(self, cursor: Optional[str] = None, limit: int = 100) -> Page:
+        """Get a page of all crops ordered by (user_id, id), with the next cursor."""
+        statement = select(CropDB).order_by(CropDB.user_id, CropDB.id)
+        after = decode_cursor(cursor, 2)
+        if after is not None:
+            statement = statement.where(tuple_(CropDB.user_id, CropDB.id) > after)
+        return await self._page(statement, limit)
+
+    async def get_user_crops(self, user_id: int, cursor: Optional[str] = None,
+                             limit: int = 100) -> Page:
+        """Get a page of crops for a specific user, with the next cursor."""
+        statement = select(CropDB).where(CropDB.user_id == user_id).order_by(CropDB.id)
+        after = decode_cursor(cursor, 2)
+        if after is not None:
+            if after[0] != user_id:
+                raise ValueError("Invalid cursor")
+            statement = statement.where(CropDB.id > after[1])
+        return await self._page(statement, limit)
 
-    async def get_crops(self, skip: int = 0, limit: int = 100) -> List[CropDB]:
-        return self.db.query(CropDB).offset(skip).limit(limit).all()
+    async def _page(self, statement, limit: int) -> Page:
+        # Keyset pagination: seek past the last key on the (user_id, id)
+        # index instead of counting through OFFSET rows; one extra row tells
+        # whether another page exists
+        crops = list(await self.db.scalars(statement.limit(limit + 1)))
+        if len(crops) <= limit:
+            return crops, None
+        crops = crops[:limit]
+        return crops, encode_cursor(crops[-1].user_id, crops[-1].id)
 
-    async def get_user_crops(self, user_id: int) -> List[CropDB]:
-        """Get all crops for a specific user."""
-        return self.db.query(CropDB).filter(CropDB.user_id == user_id).all()
+    @staticmethod
+    async def export_user_crops(user_id: int, batch_size: int = 500) -> AsyncIterator[str]:
+        """Yield all crops of a user as NDJSON lines from a server-side cursor."""
+        # Own session: the stream outlives the request-scoped one
+        async with AsyncSessionLocal() as db:
+            result = await db.stream_scalars(
+                select(CropDB).where(CropDB.user_id == user_id).order_by(CropDB.id)
+                .execution_options(yield_per=batch_size)
+            )
+            async for crop in result:
+                yield Crop.model_validate(crop).model_dump_json() + "\n"
 
     async def update_crop(self, crop_id: int, crop_data: CropUpdate) -> CropDB:
         """Update a specific crop."""
@@ -47,8 +87,8 @@ class CropService:
             setattr(db_crop, field, value)
 
         db_crop.updated_at = datetime.utcnow()
-        self.db.commit()
-        self.db.refresh(db_crop)
+        await self.db.commit()
+        await self.db.refresh(db_crop)
         return db_crop
 
     async def delete_crop(self, crop_id: int) -> None:
@@ -60,5 +100,76 @@ class CropService:
                 detail="Crop not found"
             )
 
-        self.db.delete(db_crop)
-        self.db.commit() 
\ No newline at end of file
+        await self.db.delete(db_crop)
+        await self.db.commit()
+
+    async def bulk_mutate(self, request: CropBulkRequest, user_id: int) -> List[CropBulkResult]:
+        """Apply a batch of creates, updates and deletes in one transaction."""
+        results: List[CropBulkResult] = []
+
+        # Ownership of every referenced crop in a single query
+        referenced = {item.id for item in request.update} | set(request.delete)
+        owners = {}
+        if referenced:
+            rows = await self.db.execute(
+                select(CropDB.id, CropDB.user_id).where(CropDB.id.in_(referenced))
+            )
+            owners = dict(rows.all())
+
+        def check(operation: str, index: int, crop_id: int) -> bool:
+            owner = owners.get(crop_id)
+            if owner == user_id:
+                return True
+            results.append(CropBulkResult(
+                operation=operation, index=index, id=crop_id,
+                status="not_found" if owner is None else "forbidden"
+            ))
+            return False
+
+        now = datetime.utcnow()
+        updates = []
+        for index, item in enumerate(request.update):
+            if check("update", index, item.id):
+                updates.append((index, item.id, {
+                    **item.model_dump(exclude_unset=True, exclude={"id"}),
+                    "id": item.id,
+                    "updated_at": now
+                }))
+        deletes = [(index, crop_id) for index, crop_id in enumerate(request.delete)
+                   if check("delete", index, crop_id)]
+
+        try:
+            if request.create:
+                # executemany with RETURNING; ids come back in parameter order
+                created = await self.db.scalars(
+                    insert(CropDB).returning(CropDB.id, sort_by_parameter_order=True),
+                    [{**item.model_dump(), "user_id": user_id, "created_at": now, "updated_at": now}
+                     for item in request.create]
+                )
+                results.extend(
+                    CropBulkResult(operation="create", index=index, id=crop_id, status="created")
+                    for index, crop_id in enumerate(created)
+                )
+            if updates:
+                # ORM bulk UPDATE by primary key, batched per set of columns
+                await self.db.execute(update(CropDB), [values for _, _, values in updates])
+                results.extend(
+                    CropBulkResult(operation="update", index=index, id=crop_id, status="updated")
+                    for index, crop_id, _ in updates
+                )
+            if deletes:
+                await self.db.execute(
+                    delete(CropDB).where(CropDB.id.in_([crop_id for _, crop_id in deletes]))
+                )
+                results.extend(
+                    CropBulkResult(operation="delete", index=index, id=crop_id, status="deleted")
+                    for index, crop_id in deletes
+                )
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+
+        order = {"create": 0, "update": 1, "delete": 2}
+        results.sort(key=lambda result: (order[result.operation], result.index))
+        return results
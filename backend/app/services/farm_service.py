@@ -1,51 +1,76 @@
 from datetime import datetime
-from sqlalchemy.orm import Session
-from ..models.farm import Farm
+from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from ..config.database import get_async_db
+from ..models.farm import Farm, FarmCreate, FarmCrop, FarmUpdate, normalize_crop_names
 from ..models.user import User
 from typing import List, Optional
 
 class FarmService:
+    def __init__(self, db: AsyncSession = Depends(get_async_db)):
+        self.db = db
+
     @staticmethod
-    async def create_farm(farm_data: dict, user: User) -> Farm:
+    def _set_crops(farm: Farm, main_crops: List[str]):
+        # Keep rows for crops that stay so they are not deleted and re-inserted
+        existing = {crop.crop_name: crop for crop in farm.crops}
+        farm.crops = [
+            existing.get(name) or FarmCrop(crop_name=name)
+            for name in normalize_crop_names(main_crops)
+        ]
+
+    async def create_farm(self, farm_data: FarmCreate, user: User) -> Farm:
+        now = datetime.utcnow()
         farm = Farm(
             user_id=user.id,
-            name=farm_data["name"],
-            location=farm_data["location"],
-            size_hectares=farm_data["size_hectares"],
-            main_crops=farm_data["main_crops"],
-            soil_type=farm_data.get("soil_type"),
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
+            name=farm_data.name,
+            location=farm_data.location,
+            size_hectares=farm_data.size_hectares,
+            soil_type=farm_data.soil_type,
+            created_at=now,
+            updated_at=now,
+            crops=[]
         )
-        # Add to database session and commit
+        self._set_crops(farm, farm_data.main_crops)
+        self.db.add(farm)
+        await self.db.commit()
         return farm
 
-    @staticmethod
-    async def get_farms_by_user(user_id: int) -> List[Farm]:
-        # Query farms by user_id
-        return []
+    async def get_farms_by_user(self, user_id: int, crop: Optional[str] = None) -> List[Farm]:
+        """Farms of a user with their crops in two queries, optionally only those growing `crop`"""
+        statement = (
+            select(Farm)
+            .where(Farm.user_id == user_id)
+            .options(selectinload(Farm.crops))
+            .order_by(Farm.id)
+        )
+        if crop:
+            statement = statement.where(
+                Farm.id.in_(select(FarmCrop.farm_id).where(FarmCrop.crop_name == crop.strip().lower()))
+            )
+        result = await self.db.scalars(statement)
+        return list(result)
 
-    @staticmethod
-    async def get_farm(farm_id: int) -> Optional[Farm]:
-        # Query farm by id
-        return None
+    async def get_farm(self, farm_id: int, user_id: Optional[int] = None) -> Optional[Farm]:
+        """Get a farm by id, optionally only if it belongs to user_id"""
+        statement = select(Farm).where(Farm.id == farm_id).options(selectinload(Farm.crops))
+        if user_id is not None:
+            statement = statement.where(Farm.user_id == user_id)
+        return await self.db.scalar(statement)
 
-    @staticmethod
-    async def update_farm(farm_id: int, farm_data: dict) -> Farm:
-        farm = await FarmService.get_farm(farm_id)
-        if farm:
-            for key, value in farm_data.items():
-                if hasattr(farm, key):
-                    setattr(farm, key, value)
-            farm.updated_at = datetime.utcnow()
-            # Update in database
-            return farm
-        return None
+    async def update_farm(self, farm: Farm, farm_data: FarmUpdate) -> Farm:
+        for key, value in farm_data.model_dump(exclude_unset=True).items():
+            if key == "main_crops":
+                self._set_crops(farm, value or [])
+            else:
+                setattr(farm, key, value)
+        farm.updated_at = datetime.utcnow()
+        await self.db.commit()
+        return farm
 
-    @staticmethod
-    async def delete_farm(farm_id: int) -> bool:
-        farm = await FarmService.get_farm(farm_id)
-        if farm:
-            # Delete from database
-            return True
-        return False 
\ No newline at end of file
+    async def delete_farm(self, farm: Farm) -> bool:
+        await self.db.delete(farm)
+        await self.db.commit()
+        return True
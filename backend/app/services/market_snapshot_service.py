@@ -0,0 +1,183 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from ..ml.market_analyzer import MarketAnalyzer
+from ..utils.encoding import MSGPACK_MEDIA_TYPE, current_negotiation, encode_msgpack, select_fields
+from ..utils.translator import Translator
+
+logger = logging.getLogger(__name__)
+
+class MarketSnapshot(NamedTuple):
+    # Decoded body, for `fields=` selection and MessagePack
+    payload: Any
+    body: bytes
+    etag: str
+    built_at: datetime
+
+class MarketSnapshotService:
+    """Serves precomputed /market-prices payloads for every crop, region and language.
+
+    Insights only change when new prices are ingested, so they are computed
+    once per ingestion instead of once per request.
+    """
+
+    def __init__(self, market_analyzer: MarketAnalyzer, translator: Translator,
+                 max_age_seconds: int = 3600):
+        self.market_analyzer = market_analyzer
+        self.translator = translator
+        # The 7-day price window slides even without ingestion, so snapshots
+        # are also rebuilt once they are older than this
+        self.max_age = timedelta(seconds=max_age_seconds)
+        self._snapshots: Dict[Tuple[str, str, str], MarketSnapshot] = {}
+        # Reported as last_updated: when prices of a crop and region last
+        # changed, not when insights were recomputed, so an age-based rebuild
+        # of unchanged prices keeps the same body and ETag
+        self._loaded_at = datetime.now()
+        self._ingested_at: Dict[Tuple[str, str], datetime] = {}
+        self._refreshing = set()
+        market_analyzer.add_ingest_listener(self._on_ingest)
+
+    def rebuild(self):
+        """Precompute snapshots for every crop, region and language"""
+        snapshots = {}
+        for crop in self.market_analyzer.crops:
+            for region in self.market_analyzer.regions:
+                snapshots.update(self._build(crop, region))
+        # Swap the whole table at once so readers never see a partial build
+        self._snapshots = snapshots
+
+    def refresh(self, crop: str, region: str):
+        """Rebuild the snapshots of one crop and region in every language"""
+        self._snapshots.update(self._build(crop, region))
+
+    def get(self, crop: str, region: str, language: str) -> Optional[MarketSnapshot]:
+        """Return the snapshot for a crop, region and language if one exists.
+
+        An expired snapshot is still returned while a rebuild runs in the
+        background, so no request waits for the model fit and translations.
+        """
+        snapshot = self._snapshots.get((crop, region, language))
+        if snapshot is not None and datetime.now() - snapshot.built_at > self.max_age:
+            self._schedule_refresh(crop, region)
+        return snapshot
+
+    def peek(self, crop: str, region: str, language: str) -> Optional[MarketSnapshot]:
+        """Return the current snapshot as is, never triggering a rebuild"""
+        return self._snapshots.get((crop, region, language))
+
+    def _on_ingest(self, crop: str, region: str):
+        self._ingested_at[(crop, region)] = datetime.now()
+        self.refresh(crop, region)
+
+    def _schedule_refresh(self, crop: str, region: str):
+        if (crop, region) in self._refreshing:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Not on the event loop: nothing to block, rebuild in place
+            self.refresh(crop, region)
+            return
+        self._refreshing.add((crop, region))
+        future = loop.run_in_executor(None, self.refresh, crop, region)
+        future.add_done_callback(lambda done: self._refresh_done(crop, region, done))
+
+    def _refresh_done(self, crop: str, region: str, future: asyncio.Future):
+        self._refreshing.discard((crop, region))
+        if not future.cancelled() and future.exception() is not None:
+            logger.error("Failed to refresh market snapshot for %s/%s", crop, region,
+                         exc_info=future.exception())
+
+    def _build(self, crop: str, region: str) -> Dict[Tuple[str, str, str], MarketSnapshot]:
+        """Compute insights once and render them for every supported language"""
+        insights = self.market_analyzer.get_market_insights(crop, region)
+        updated_at = self._ingested_at.get((crop, region), self._loaded_at)
+        insights = {**insights, "last_updated": updated_at.isoformat()}
+        built_at = datetime.now()
+        snapshots = {}
+        for language in self.translator.supported_languages:
+            translated = insights
+            if language != "en":
+                translated = self.translator.translate_market_insights(insights, language)
+            body = self._encode({"status": "success", "insights": translated})
+            snapshots[(crop, region, language)] = MarketSnapshot(
+                # Exactly what the JSON body holds, string keys included
+                payload=json.loads(body),
+                body=body,
+                etag=self._etag(body),
+                built_at=built_at
+            )
+        return snapshots
+
+    @staticmethod
+    def _encode(payload: Any) -> bytes:
+        """Serialize deterministically so identical content yields identical ETags"""
+        return json.dumps(
+            jsonable_encoder(payload),
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False
+        ).encode("utf-8")
+
+    @staticmethod
+    def _etag(body: bytes) -> str:
+        """Strong ETag derived from the exact response bytes"""
+        return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison, RFC 7232)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+def snapshot_response(request: Request, snapshot: MarketSnapshot) -> Response:
+    """Serve a snapshot, answering 304 when the client already holds it.
+
+    Honours `fields=` and MessagePack like NegotiatedResponse; each
+    representation gets its own ETag, derived without encoding it.
+    """
+    use_msgpack, fields = current_negotiation()
+    etag = snapshot.etag
+    if use_msgpack or fields is not None:
+        variant = json.dumps([use_msgpack, fields], sort_keys=True).encode("utf-8")
+        etag = MarketSnapshotService._etag(etag.encode("utf-8") + variant)
+    headers = {
+        "ETag": etag,
+        # Clients may store the payload but must revalidate before reuse
+        "Cache-Control": "no-cache",
+        "Vary": "Accept"
+    }
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    if not use_msgpack and fields is None:
+        return Response(content=snapshot.body, media_type="application/json", headers=headers)
+    content = select_fields(snapshot.payload, fields)
+    if use_msgpack:
+        return Response(content=encode_msgpack(content), media_type=MSGPACK_MEDIA_TYPE, headers=headers)
+    return Response(content=MarketSnapshotService._encode(content), media_type="application/json",
+                    headers=headers)
+
+class MarketSnapshotServiceFactory:
+    @staticmethod
+    def create_snapshot_service(market_analyzer: MarketAnalyzer,
+                                translator: Translator) -> MarketSnapshotService:
+        max_age_seconds = int(os.getenv("MARKET_SNAPSHOT_MAX_AGE_SECONDS", "3600"))
+        service = MarketSnapshotService(market_analyzer, translator, max_age_seconds)
+        service.rebuild()
+        return service
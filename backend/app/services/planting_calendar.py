@@ -0,0 +1,131 @@
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from ..utils.interval_tree import IntervalTree
+from .alert_broadcast import REGION_AREAS
+from .reference_data import CalendarRecord, ReferenceDataCache, ReferenceSnapshot
+
+DAYS_IN_YEAR = 365
+KINDS = ("planting", "harvesting")
+
+class CalendarWindow(NamedTuple):
+    crop_id: int
+    crop: str
+    region: str
+    kind: str
+    start: str  # "MM-DD"
+    end: str
+
+def day_of_year(value: date) -> int:
+    """Day 1-365 of the month/day, ignoring the year (29 Feb counts as 28 Feb)"""
+    day = min(value.day, 28) if value.month == 2 else value.day
+    return date(2001, value.month, day).timetuple().tm_yday
+
+def split_window(start: int, end: int) -> List[Tuple[int, int]]:
+    """Day-of-year window as non-wrapping pieces; Nov-Feb becomes two"""
+    if start <= end:
+        return [(start, end)]
+    return [(start, DAYS_IN_YEAR), (1, end)]
+
+def region_for_location(location: Optional[str]) -> Optional[str]:
+    """Map a free-text farm location onto one of our regions"""
+    text = (location or "").lower()
+    for region, areas in REGION_AREAS.items():
+        if any(area in text for area in areas):
+            return region
+    return None
+
+class PlantingCalendarIndex:
+    """Interval trees over the planting and harvesting windows of each region.
+
+    Windows are stored as day-of-year intervals so a calendar applies every
+    year; windows wrapping past 31 Dec are split in two. Built from the
+    reference-data snapshot and rebuilt when its version changes.
+    """
+
+    def __init__(self, reference_data: ReferenceDataCache):
+        self.reference_data = reference_data
+        self.version: Optional[int] = None
+        self.trees: Dict[Tuple[str, str], IntervalTree[CalendarWindow]] = {}
+
+    def _current(self) -> Dict[Tuple[str, str], IntervalTree[CalendarWindow]]:
+        snapshot = self.reference_data.snapshot
+        if snapshot.version != self.version:
+            self.trees = self._build(snapshot)
+            self.version = snapshot.version
+        return self.trees
+
+    @staticmethod
+    def _build(snapshot: ReferenceSnapshot) -> Dict[Tuple[str, str], IntervalTree[CalendarWindow]]:
+        intervals: Dict[Tuple[str, str], list] = {}
+        for calendar in snapshot.calendars:
+            crop = snapshot.crops_by_id.get(calendar.crop_id)
+            if crop is None or not calendar.region:
+                continue
+            region = calendar.region.strip().lower()
+            for kind, start, end in PlantingCalendarIndex._windows(calendar):
+                window = CalendarWindow(
+                    crop.id, crop.name, region, kind,
+                    start.strftime("%m-%d"), end.strftime("%m-%d")
+                )
+                for low, high in split_window(day_of_year(start), day_of_year(end)):
+                    intervals.setdefault((region, kind), []).append((low, high, window))
+        return {key: IntervalTree(items) for key, items in intervals.items()}
+
+    @staticmethod
+    def _windows(calendar: CalendarRecord) -> Iterable[Tuple[str, datetime, datetime]]:
+        if calendar.planting_start and calendar.planting_end:
+            yield "planting", calendar.planting_start, calendar.planting_end
+        if calendar.harvesting_start and calendar.harvesting_end:
+            yield "harvesting", calendar.harvesting_start, calendar.harvesting_end
+
+    def windows(self, region: str, kind: str, start: date, days: int) -> List[CalendarWindow]:
+        """Windows of a kind in a region overlapping the `days` days from `start`"""
+        if kind not in KINDS:
+            raise ValueError(f"Unknown calendar kind: {kind}")
+        tree = self._current().get((region.strip().lower(), kind))
+        if tree is None:
+            return []
+        span = max(1, min(days, DAYS_IN_YEAR))
+        first = day_of_year(start)
+        last = day_of_year(start + timedelta(days=span - 1))
+        if span == DAYS_IN_YEAR:
+            first, last = 1, DAYS_IN_YEAR
+        found = {}
+        for low, high in split_window(first, last):
+            for window in tree.overlapping(low, high):
+                found[window] = None
+        return sorted(found, key=lambda window: (window.crop, window.start))
+
+    def plantable(self, region: str, start: date, days: int = 7) -> List[CalendarWindow]:
+        """Crops whose planting window is open at some point in the period"""
+        return self.windows(region, "planting", start, days)
+
+    def harvest_due(self, region: str, start: date, days: int = 14,
+                    crops: Optional[Iterable[str]] = None) -> List[CalendarWindow]:
+        """Harvesting windows in the period, optionally only for some crops"""
+        windows = self.windows(region, "harvesting", start, days)
+        if crops is None:
+            return windows
+        wanted = {crop.strip().lower() for crop in crops}
+        return [window for window in windows if window.crop.lower() in wanted]
+
+    def for_farms(self, farms: Iterable, kind: str, start: date, days: int) -> List[Dict]:
+        """Evaluate a window query for every farm, sharing one lookup per region"""
+        by_region: Dict[str, List[CalendarWindow]] = {}
+        results = []
+        for farm in farms:
+            region = region_for_location(farm.location)
+            if region is None:
+                results.append({"farm_id": farm.id, "region": None, "windows": []})
+                continue
+            if region not in by_region:
+                by_region[region] = self.windows(region, kind, start, days)
+            grown = {name.lower() for name in farm.crop_names}
+            results.append({
+                "farm_id": farm.id,
+                "region": region,
+                "windows": [window._asdict() for window in by_region[region]
+                            if window.crop.lower() in grown]
+            })
+        return results
@@ -0,0 +1,211 @@
+import asyncio
+import logging
+import os
+from collections import defaultdict
+from datetime import datetime
+from types import MappingProxyType
+from typing import Callable, Iterable, NamedTuple, Optional, Tuple, Union
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from ..config.database import SessionLocal
+from ..models.database import Crop, Disease, PlantingCalendar, ReferenceDataVersion
+
+logger = logging.getLogger(__name__)
+
+VERSION_NAME = "reference"
+
+class CropRecord(NamedTuple):
+    id: int
+    name: str
+    scientific_name: Optional[str]
+    description: Optional[str]
+    optimal_conditions: Optional[str]
+    common_diseases: Optional[str]
+
+class DiseaseRecord(NamedTuple):
+    id: int
+    name: str
+    crop_id: Optional[int]
+    description: Optional[str]
+    symptoms: Optional[str]
+    treatment: Optional[str]
+    prevention: Optional[str]
+
+class CalendarRecord(NamedTuple):
+    id: int
+    crop_id: Optional[int]
+    region: Optional[str]
+    planting_start: Optional[datetime]
+    planting_end: Optional[datetime]
+    harvesting_start: Optional[datetime]
+    harvesting_end: Optional[datetime]
+
+def _key(text: Optional[str]) -> str:
+    return (text or "").strip().casefold()
+
+def _group(records: Iterable, key: Callable) -> MappingProxyType:
+    groups = defaultdict(list)
+    for record in records:
+        groups[key(record)].append(record)
+    return MappingProxyType({name: tuple(items) for name, items in groups.items()})
+
+class ReferenceSnapshot:
+    """Immutable, indexed copy of the crops, diseases and planting calendars.
+
+    Records are tuples and every index is a read-only mapping, so a snapshot
+    can be shared by all requests without locking; updates build a new one.
+    """
+
+    def __init__(self, version: int, crops: Iterable[CropRecord],
+                 diseases: Iterable[DiseaseRecord], calendars: Iterable[CalendarRecord]):
+        self.version = version
+        self.loaded_at = datetime.utcnow()
+        self.crops: Tuple[CropRecord, ...] = tuple(sorted(crops, key=lambda crop: _key(crop.name)))
+        self.diseases: Tuple[DiseaseRecord, ...] = tuple(diseases)
+        self.calendars: Tuple[CalendarRecord, ...] = tuple(calendars)
+
+        self.crops_by_id = MappingProxyType({crop.id: crop for crop in self.crops})
+        self.crops_by_name = MappingProxyType({_key(crop.name): crop for crop in self.crops})
+        self.diseases_by_id = MappingProxyType({disease.id: disease for disease in self.diseases})
+        self.diseases_by_name = _group(self.diseases, lambda disease: _key(disease.name))
+        self.diseases_by_crop = _group(self.diseases, lambda disease: disease.crop_id)
+        self.calendars_by_crop = _group(self.calendars, lambda calendar: calendar.crop_id)
+        self.calendars_by_crop_region = _group(
+            self.calendars, lambda calendar: (calendar.crop_id, _key(calendar.region))
+        )
+
+    @classmethod
+    def empty(cls) -> "ReferenceSnapshot":
+        return cls(0, (), (), ())
+
+    def crop(self, crop: Union[int, str]) -> Optional[CropRecord]:
+        """Look a crop up by id or (case-insensitive) name"""
+        if isinstance(crop, int):
+            return self.crops_by_id.get(crop)
+        return self.crops_by_name.get(_key(crop))
+
+    def diseases_for(self, crop: Union[int, str]) -> Tuple[DiseaseRecord, ...]:
+        record = self.crop(crop)
+        return self.diseases_by_crop.get(record.id, ()) if record else ()
+
+    def calendars_for(self, crop: Union[int, str],
+                      region: Optional[str] = None) -> Tuple[CalendarRecord, ...]:
+        record = self.crop(crop)
+        if record is None:
+            return ()
+        if region is None:
+            return self.calendars_by_crop.get(record.id, ())
+        return self.calendars_by_crop_region.get((record.id, _key(region)), ())
+
+class ReferenceDataCache:
+    """Serves reference data from memory and reloads it when its version moves.
+
+    The whole snapshot is rebuilt off the request path and swapped in with a
+    single assignment. Staleness is detected by polling the one-row version
+    counter and, when Redis is configured, pushed through pub/sub.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal,
+                 poll_seconds: float = 30.0, redis_url: Optional[str] = None,
+                 channel: str = "reference-data"):
+        self.session_factory = session_factory
+        self.poll_seconds = poll_seconds
+        self.redis_url = redis_url
+        self.channel = channel
+        self.snapshot = ReferenceSnapshot.empty()
+
+    def current_version(self) -> int:
+        with self.session_factory() as db:
+            version = db.scalar(
+                select(ReferenceDataVersion.version).where(ReferenceDataVersion.name == VERSION_NAME)
+            )
+        return version or 0
+
+    def load(self) -> ReferenceSnapshot:
+        """Read all reference tables and swap in a fresh snapshot"""
+        with self.session_factory() as db:
+            # Version first: a write racing this load leaves the recorded
+            # version behind the data, so the next check reloads again
+            version = db.scalar(
+                select(ReferenceDataVersion.version).where(ReferenceDataVersion.name == VERSION_NAME)
+            ) or 0
+            crops = [CropRecord(*row) for row in db.execute(select(
+                Crop.id, Crop.name, Crop.scientific_name, Crop.description,
+                Crop.optimal_conditions, Crop.common_diseases
+            ))]
+            diseases = [DiseaseRecord(*row) for row in db.execute(select(
+                Disease.id, Disease.name, Disease.crop_id, Disease.description,
+                Disease.symptoms, Disease.treatment, Disease.prevention
+            ).order_by(Disease.crop_id, Disease.name))]
+            calendars = [CalendarRecord(*row) for row in db.execute(select(
+                PlantingCalendar.id, PlantingCalendar.crop_id, PlantingCalendar.region,
+                PlantingCalendar.planting_start, PlantingCalendar.planting_end,
+                PlantingCalendar.harvesting_start, PlantingCalendar.harvesting_end
+            ).order_by(PlantingCalendar.crop_id, PlantingCalendar.region))]
+        snapshot = ReferenceSnapshot(version, crops, diseases, calendars)
+        self.snapshot = snapshot
+        logger.info("Loaded reference data version %s: %d crops, %d diseases, %d calendars",
+                    version, len(crops), len(diseases), len(calendars))
+        return snapshot
+
+    def refresh_if_changed(self) -> bool:
+        """Reload only if the version counter moved since the last load"""
+        if self.current_version() == self.snapshot.version:
+            return False
+        self.load()
+        return True
+
+    @staticmethod
+    def bump_version(db: Session):
+        """Mark reference data as changed, for databases without the triggers"""
+        db.execute(
+            update(ReferenceDataVersion)
+            .where(ReferenceDataVersion.name == VERSION_NAME)
+            .values(version=ReferenceDataVersion.version + 1, updated_at=datetime.utcnow())
+        )
+
+    def publish_change(self):
+        """Tell every API process to check for new reference data now"""
+        if not self.redis_url:
+            return
+        import redis
+        redis.Redis.from_url(self.redis_url).publish(self.channel, str(self.current_version()))
+
+    async def run(self):
+        """Keep the snapshot current: poll, plus pub/sub when Redis is configured"""
+        if self.redis_url:
+            await asyncio.gather(self._run_polling(), self._run_pubsub())
+        else:
+            await self._run_polling()
+
+    async def _run_polling(self):
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            try:
+                await asyncio.to_thread(self.refresh_if_changed)
+            except Exception:
+                logger.exception("Failed to refresh reference data")
+
+    async def _run_pubsub(self):
+        import redis.asyncio as aioredis
+        while True:
+            try:
+                client = aioredis.Redis.from_url(self.redis_url)
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            await asyncio.to_thread(self.refresh_if_changed)
+            except Exception:
+                logger.exception("Reference data subscription lost; retrying")
+                await asyncio.sleep(self.poll_seconds)
+
+class ReferenceDataCacheFactory:
+    @staticmethod
+    def create_cache() -> ReferenceDataCache:
+        poll_seconds = float(os.getenv("REFERENCE_DATA_POLL_SECONDS", "30"))
+        redis_url = os.getenv("REDIS_URL") if os.getenv("REFERENCE_DATA_PUBSUB", "false").lower() == "true" else None
+        channel = os.getenv("REFERENCE_DATA_CHANNEL", "reference-data")
+        return ReferenceDataCache(poll_seconds=poll_seconds, redis_url=redis_url, channel=channel)
@@ -0,0 +1,304 @@
+import asyncio
+import logging
+import os
+import socket
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import func, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..config.database import SessionLocal
+from ..models.database import MessageStatus, OutboundMessage
+from .bulk_sms import AsyncBulkSMSSender
+
+logger = logging.getLogger(__name__)
+
+class SMSQueue:
+    """Durable outbound SMS queue stored in the `outbound_messages` table.
+
+    Messages are claimed in batches with `FOR UPDATE SKIP LOCKED`, so any
+    number of worker processes can drain the queue without double sends. A
+    claim is a lease: if a worker dies mid-send the message becomes claimable
+    again once `locked_until` passes.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal,
+                 lease_seconds: int = 60, max_attempts: int = 5,
+                 backoff_base_seconds: float = 30.0):
+        self.session_factory = session_factory
+        self.lease = timedelta(seconds=lease_seconds)
+        self.max_attempts = max_attempts
+        self.backoff_base_seconds = backoff_base_seconds
+        self._enqueue_listeners: List[Callable[[datetime], None]] = []
+
+    def add_enqueue_listener(self, listener: Callable[[datetime], None]):
+        """Register a callback invoked with the due time of every new message"""
+        self._enqueue_listeners.append(listener)
+
+    def enqueue(self, phone_number: str, message: str,
+                send_at: Optional[datetime] = None,
+                idempotency_key: Optional[str] = None) -> Dict:
+        """Persist a message for delivery at `send_at` (UTC, default now)"""
+        send_at = send_at or datetime.utcnow()
+        with self.session_factory() as db:
+            if idempotency_key:
+                existing = db.query(OutboundMessage).filter(
+                    OutboundMessage.idempotency_key == idempotency_key
+                ).first()
+                if existing:
+                    return self._serialize(existing, duplicate=True)
+
+            outbound = OutboundMessage(
+                idempotency_key=idempotency_key,
+                phone_number=phone_number,
+                message=message,
+                status=MessageStatus.PENDING,
+                send_at=send_at,
+                max_attempts=self.max_attempts
+            )
+            db.add(outbound)
+            try:
+                db.commit()
+            except IntegrityError:
+                # Lost a race with a concurrent request using the same key
+                db.rollback()
+                existing = db.query(OutboundMessage).filter(
+                    OutboundMessage.idempotency_key == idempotency_key
+                ).one()
+                return self._serialize(existing, duplicate=True)
+            db.refresh(outbound)
+            result = self._serialize(outbound)
+
+        for listener in self._enqueue_listeners:
+            listener(send_at)
+        return result
+
+    def claim_batch(self, worker_id: str, limit: int = 100) -> List[Dict]:
+        """Lease up to `limit` due messages to a worker"""
+        now = datetime.utcnow()
+        with self.session_factory() as db:
+            messages = db.query(OutboundMessage).filter(
+                or_(
+                    (OutboundMessage.status == MessageStatus.PENDING)
+                    & (OutboundMessage.send_at <= now),
+                    # Leases abandoned by crashed workers
+                    (OutboundMessage.status == MessageStatus.SENDING)
+                    & (OutboundMessage.locked_until < now)
+                )
+            ).order_by(
+                OutboundMessage.send_at
+            ).limit(limit).with_for_update(skip_locked=True).all()
+
+            claimed = []
+            for outbound in messages:
+                outbound.status = MessageStatus.SENDING
+                outbound.locked_by = worker_id
+                outbound.locked_until = now + self.lease
+                outbound.attempts += 1
+                claimed.append({
+                    "id": outbound.id,
+                    "phone_number": outbound.phone_number,
+                    "message": outbound.message,
+                    "attempts": outbound.attempts,
+                    "max_attempts": outbound.max_attempts
+                })
+            db.commit()
+            return claimed
+
+    def complete_batch(self, worker_id: str, results: List[Dict]):
+        """Record delivery results of claimed messages in one transaction.
+
+        Each result needs `id`, `status` and optionally `message_id`/`error`.
+        Failures are rescheduled with exponential backoff until `max_attempts`
+        is reached, after which they are dead-lettered.
+        """
+        if not results:
+            return
+        now = datetime.utcnow()
+        by_id = {result["id"]: result for result in results}
+        with self.session_factory() as db:
+            messages = db.query(OutboundMessage).filter(
+                OutboundMessage.id.in_(by_id),
+                OutboundMessage.locked_by == worker_id
+            ).all()
+            for outbound in messages:
+                result = by_id[outbound.id]
+                outbound.locked_by = None
+                outbound.locked_until = None
+                if result["status"] == "success":
+                    outbound.status = MessageStatus.SENT
+                    outbound.provider_message_id = result.get("message_id")
+                    outbound.sent_at = now
+                    outbound.last_error = None
+                elif outbound.attempts >= outbound.max_attempts:
+                    outbound.status = MessageStatus.DEAD
+                    outbound.last_error = result.get("error")
+                else:
+                    outbound.status = MessageStatus.PENDING
+                    outbound.last_error = result.get("error")
+                    outbound.send_at = now + timedelta(
+                        seconds=self.backoff_base_seconds * 2 ** (outbound.attempts - 1)
+                    )
+            db.commit()
+
+    def requeue_dead(self, message_ids: Optional[List[int]] = None) -> int:
+        """Move dead-lettered messages back to the queue for another round of attempts"""
+        with self.session_factory() as db:
+            query = db.query(OutboundMessage).filter(
+                OutboundMessage.status == MessageStatus.DEAD
+            )
+            if message_ids is not None:
+                query = query.filter(OutboundMessage.id.in_(message_ids))
+            count = query.update({
+                OutboundMessage.status: MessageStatus.PENDING,
+                OutboundMessage.attempts: 0,
+                OutboundMessage.send_at: datetime.utcnow()
+            }, synchronize_session=False)
+            db.commit()
+            return count
+
+    def next_due_at(self) -> Optional[datetime]:
+        """When the earliest pending message (or expiring lease) becomes claimable"""
+        with self.session_factory() as db:
+            next_pending = db.query(func.min(OutboundMessage.send_at)).filter(
+                OutboundMessage.status == MessageStatus.PENDING
+            ).scalar()
+            next_expiry = db.query(func.min(OutboundMessage.locked_until)).filter(
+                OutboundMessage.status == MessageStatus.SENDING
+            ).scalar()
+        candidates = [due for due in (next_pending, next_expiry) if due is not None]
+        return min(candidates) if candidates else None
+
+    def metrics(self) -> Dict:
+        """Queue depth per status and the lag of the oldest due message"""
+        now = datetime.utcnow()
+        with self.session_factory() as db:
+            counts = dict(
+                db.query(OutboundMessage.status, func.count(OutboundMessage.id))
+                .group_by(OutboundMessage.status).all()
+            )
+            due_count, oldest_due = db.query(
+                func.count(OutboundMessage.id), func.min(OutboundMessage.send_at)
+            ).filter(
+                OutboundMessage.status == MessageStatus.PENDING,
+                OutboundMessage.send_at <= now
+            ).one()
+        depth = {status.value: counts.get(status, 0) for status in MessageStatus}
+        return {
+            "depth": depth,
+            "due": due_count,
+            "lag_seconds": (now - oldest_due).total_seconds() if oldest_due else 0.0,
+            "dead_letters": depth[MessageStatus.DEAD.value],
+            "timestamp": now.isoformat()
+        }
+
+    @staticmethod
+    def _serialize(outbound: OutboundMessage, duplicate: bool = False) -> Dict:
+        return {
+            "status": "queued" if outbound.status == MessageStatus.PENDING else outbound.status.value,
+            "message_id": str(outbound.id),
+            "phone_number": outbound.phone_number,
+            "scheduled_time": outbound.send_at.isoformat(),
+            "idempotency_key": outbound.idempotency_key,
+            "duplicate": duplicate
+        }
+
+class SMSQueueWorker:
+    """Drains the SMS queue, sleeping until the next message is due.
+
+    Database calls run in a thread so the event loop stays free for the
+    concurrent sends of the bulk sender.
+    """
+
+    def __init__(self, queue: SMSQueue, sender: AsyncBulkSMSSender,
+                 batch_size: int = 100, idle_poll_seconds: float = 5.0,
+                 worker_id: Optional[str] = None):
+        self.queue = queue
+        self.sender = sender
+        self.batch_size = batch_size
+        # Upper bound on sleep, so messages enqueued by other processes are
+        # picked up even though their enqueue signal is not seen here
+        self.idle_poll_seconds = idle_poll_seconds
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopping = False
+        self.sent = 0
+        self.failed = 0
+        queue.add_enqueue_listener(self._on_enqueue)
+
+    def stop(self):
+        """Ask the worker loop to exit after the current batch"""
+        self._stopping = True
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def run(self):
+        """Claim and deliver batches until stopped"""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        while not self._stopping:
+            batch = await asyncio.to_thread(
+                self.queue.claim_batch, self.worker_id, self.batch_size
+            )
+            if batch:
+                try:
+                    await self.deliver(batch)
+                except Exception:
+                    # Leased messages become claimable again when the lease expires
+                    logger.exception("Failed to deliver SMS batch of %d messages", len(batch))
+                continue
+
+            next_due = await asyncio.to_thread(self.queue.next_due_at)
+            timeout = self.idle_poll_seconds
+            if next_due is not None:
+                timeout = min(timeout, max((next_due - datetime.utcnow()).total_seconds(), 0.0))
+            await self._sleep(timeout)
+        await self.sender.close()
+
+    async def deliver(self, batch: List[Dict]):
+        """Send a claimed batch, grouping identical messages into bulk sends"""
+        groups: Dict[str, Dict[str, List[int]]] = defaultdict(lambda: defaultdict(list))
+        for item in batch:
+            groups[item["message"]][item["phone_number"]].append(item["id"])
+
+        # All groups share the sender's workers, so a batch of many distinct
+        # messages is sent concurrently and finishes well within its lease
+        messages = {
+            message: [phone for phone, ids in recipients.items() for _ in ids]
+            for message, recipients in groups.items()
+        }
+        results = []
+        async for message, result in self.sender.stream_messages(messages):
+            message_id = groups[message][result["phone_number"]].pop()
+            results.append({**result, "id": message_id})
+
+        self.sent += sum(1 for result in results if result["status"] == "success")
+        self.failed += sum(1 for result in results if result["status"] != "success")
+        await asyncio.to_thread(self.queue.complete_batch, self.worker_id, results)
+
+    async def _sleep(self, timeout: float):
+        """Sleep until the timeout or until an earlier message is enqueued"""
+        if timeout <= 0:
+            return
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    def _on_enqueue(self, send_at: datetime):
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+class SMSQueueFactory:
+    @staticmethod
+    def create_queue() -> SMSQueue:
+        return SMSQueue(
+            lease_seconds=int(os.getenv("SMS_QUEUE_LEASE_SECONDS", "60")),
+            max_attempts=int(os.getenv("SMS_QUEUE_MAX_ATTEMPTS", "5")),
+            backoff_base_seconds=float(os.getenv("SMS_QUEUE_BACKOFF_SECONDS", "30"))
+        )
@@ -1,14 +1,26 @@
-from typing import Dict, Optional
+from typing import AsyncIterator, Dict, Optional
 import os
 import requests
-from datetime import datetime
+from datetime import datetime, timezone
 import json
+from .bulk_sms import AsyncBulkSMSSender, BulkSMSSenderFactory, PhoneNumbers
+from .sms_queue import SMSQueue, SMSQueueFactory
+from .ussd import ContentProvider, USSDMenuEngine, USSDMenuEngineFactory
 
 class SMSService:
-    def __init__(self, api_key: str, api_secret: str):
+    def __init__(self, api_key: str, api_secret: str,
+                 base_url: str = "https://api.smsprovider.com/v1",  # Replace with actual SMS provider URL
+                 bulk_sender: Optional[AsyncBulkSMSSender] = None,
+                 queue: Optional[SMSQueue] = None,
+                 ussd_engine: Optional[USSDMenuEngine] = None):
         self.api_key = api_key
         self.api_secret = api_secret
-        self.base_url = "https://api.smsprovider.com/v1"  # Replace with actual SMS provider URL
+        self.base_url = base_url
+        # Reuse connections across sends instead of a new one per request
+        self.session = requests.Session()
+        self.bulk_sender = bulk_sender or AsyncBulkSMSSender(api_key, base_url)
+        self.queue = queue
+        self.ussd_engine = ussd_engine or USSDMenuEngine()
         
     def send_sms(self, phone_number: str, message: str) -> Dict:
         """Send SMS to a phone number"""
@@ -24,10 +36,11 @@ class SMSService:
         }
         
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/sms/send",
                 headers=headers,
-                json=payload
+                json=payload,
+                timeout=10
             )
             response.raise_for_status()
             return {
@@ -45,40 +58,15 @@ class SMSService:
     def handle_ussd_request(self, session_id: str, phone_number: str, 
                           ussd_code: str, text: str) -> Dict:
         """Handle USSD requests from farmers"""
-        # Parse USSD input
-        input_text = text.split("*")[-1] if "*" in text else text
-        
-        # Process different USSD menu options
-        if input_text == "":
-            # Main menu
-            return self._generate_ussd_response(
-                "Welcome to AgroGPT\n1. Disease Diagnosis\n2. Weather Info\n3. Market Prices\n4. Farming Tips"
-            )
-        elif input_text == "1":
-            # Disease diagnosis menu
-            return self._generate_ussd_response(
-                "Disease Diagnosis\n1. Maize\n2. Beans\n3. Coffee\n4. Bananas\n5. Cassava"
-            )
-        elif input_text == "2":
-            # Weather information menu
-            return self._generate_ussd_response(
-                "Weather Information\n1. Central\n2. Eastern\n3. Northern\n4. Western"
-            )
-        elif input_text == "3":
-            # Market prices menu
-            return self._generate_ussd_response(
-                "Market Prices\n1. Maize\n2. Beans\n3. Coffee\n4. Bananas\n5. Cassava"
-            )
-        else:
-            return self._generate_ussd_response(
-                "Invalid option. Please try again."
-            )
+        message, end_session = self.ussd_engine.handle(session_id, text)
+        return self._generate_ussd_response(message, not end_session)
 
-    def _generate_ussd_response(self, message: str) -> Dict:
+    def _generate_ussd_response(self, message: str,
+                                continue_session: bool = True) -> Dict:
         """Generate USSD response format"""
         return {
             "response": message,
-            "continue_session": True
+            "continue_session": continue_session
         }
 
     def send_bulk_sms(self, phone_numbers: list, message: str) -> Dict:
@@ -98,24 +86,44 @@ class SMSService:
             "total_sent": len(results)
         }
 
+    async def send_bulk_sms_async(self, phone_numbers: PhoneNumbers,
+                                  message: str) -> Dict:
+        """Send SMS to many phone numbers concurrently without blocking the event loop"""
+        return await self.bulk_sender.send(phone_numbers, message)
+
+    def stream_bulk_sms(self, phone_numbers: PhoneNumbers,
+                        message: str) -> AsyncIterator[Dict]:
+        """Send SMS to many phone numbers, yielding each recipient's result as it completes"""
+        return self.bulk_sender.stream(phone_numbers, message)
+
+    def enqueue_sms(self, phone_number: str, message: str,
+                    idempotency_key: Optional[str] = None) -> Dict:
+        """Queue SMS for durable delivery by the queue workers"""
+        return self.schedule_sms(phone_number, message, datetime.utcnow(), idempotency_key)
+
     def schedule_sms(self, phone_number: str, message: str, 
-                    schedule_time: datetime) -> Dict:
-        """Schedule SMS for future delivery"""
-        # Implementation would depend on SMS provider's API
-        return {
-            "status": "scheduled",
-            "phone_number": phone_number,
-            "scheduled_time": schedule_time.isoformat(),
-            "message_id": "scheduled_" + datetime.now().strftime("%Y%m%d%H%M%S")
-        }
+                    schedule_time: datetime,
+                    idempotency_key: Optional[str] = None) -> Dict:
+        """Schedule SMS for future delivery (schedule_time in UTC)"""
+        if self.queue is None:
+            raise RuntimeError("SMS queue is not configured")
+        if schedule_time.tzinfo is not None:
+            schedule_time = schedule_time.astimezone(timezone.utc).replace(tzinfo=None)
+        return self.queue.enqueue(phone_number, message, schedule_time, idempotency_key)
 
 class SMSServiceFactory:
     @staticmethod
-    def create_sms_service() -> SMSService:
+    def create_sms_service(content_provider: Optional[ContentProvider] = None) -> SMSService:
         api_key = os.getenv("SMS_API_KEY")
         api_secret = os.getenv("SMS_API_SECRET")
         
         if not api_key or not api_secret:
             raise ValueError("SMS API credentials not found in environment variables")
-            
-        return SMSService(api_key, api_secret) 
\ No newline at end of file
+
+        base_url = os.getenv("SMS_API_BASE_URL", "https://api.smsprovider.com/v1")
+        bulk_sender = BulkSMSSenderFactory.create_sender(api_key, base_url)
+        return SMSService(
+            api_key, api_secret, base_url, bulk_sender,
+            SMSQueueFactory.create_queue(),
+            USSDMenuEngineFactory.create_engine(content_provider)
+        ) 
\ No newline at end of file
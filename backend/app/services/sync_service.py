@@ -0,0 +1,107 @@
+import os
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import Depends
+from sqlalchemy import BigInteger, Table, Text, cast, func, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config.database import get_async_db
+from ..models.crop_db import CropDB
+from ..models.database import ChangeLog, Crop, Disease, MarketPrice, PlantingCalendar, WeatherData
+from ..utils.pagination import decode_cursor, encode_cursor
+
+# Tables offline clients keep a copy of, by name as recorded in change_log
+SYNC_TABLES: Dict[str, Table] = {
+    model.__tablename__: model.__table__
+    for model in (CropDB, Crop, Disease, PlantingCalendar, MarketPrice, WeatherData)
+}
+# Tables whose rows are only synced to the user owning them
+USER_TABLES = {CropDB.__tablename__}
+
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = int(os.getenv("SYNC_MAX_PAGE_SIZE", "2000"))
+
+class SyncService:
+    def __init__(self, db: AsyncSession = Depends(get_async_db)):
+        self.db = db
+
+    async def changes_since(self, user_id: int, token: Optional[str],
+                            limit: int = DEFAULT_PAGE_SIZE) -> Dict:
+        """Rows created, updated or deleted since `token`, at most `limit` log entries.
+
+        Raises ValueError for a malformed token. Without a token everything
+        visible to the user is returned. Keep calling with the returned token
+        while `has_more` is true.
+        """
+        since = self._decode_token(token)
+        query = (
+            select(ChangeLog.xact_id, ChangeLog.seq, ChangeLog.table_name,
+                   ChangeLog.row_id, ChangeLog.operation)
+            .where(
+                tuple_(ChangeLog.xact_id, ChangeLog.seq) > since,
+                or_(ChangeLog.user_id.is_(None), ChangeLog.user_id == user_id)
+            )
+            .order_by(ChangeLog.xact_id, ChangeLog.seq)
+            .limit(limit + 1)
+        )
+        if self.db.bind.dialect.name == "postgresql":
+            # A seq is taken at insert but may commit after a higher one. No
+            # transaction older than the oldest one running can still add
+            # entries, so only those are served and the token never skips one.
+            query = query.where(ChangeLog.xact_id < select(
+                cast(cast(func.pg_snapshot_xmin(func.pg_current_snapshot()), Text), BigInteger)
+            ).scalar_subquery())
+
+        entries = (await self.db.execute(query)).all()
+        has_more = len(entries) > limit
+        entries = entries[:limit]
+        next_key = (entries[-1].xact_id, entries[-1].seq) if entries else since
+
+        # Only the latest operation per row matters
+        latest: Dict[Tuple[str, int], str] = {}
+        for entry in entries:
+            latest[(entry.table_name, entry.row_id)] = entry.operation
+
+        changes = {}
+        for table_name, table in SYNC_TABLES.items():
+            upserts = [row_id for (name, row_id), operation in latest.items()
+                       if name == table_name and operation == "upsert"]
+            deletes = [row_id for (name, row_id), operation in latest.items()
+                       if name == table_name and operation == "delete"]
+            if not upserts and not deletes:
+                continue
+            rows = await self._current_rows(table, upserts, user_id)
+            # Rows gone since they were logged are deleted by a later entry
+            found = {row["id"] for row in rows}
+            deletes.extend(row_id for row_id in upserts if row_id not in found)
+            changes[table_name] = {"upserted": rows, "deleted": sorted(deletes)}
+
+        return {
+            "token": encode_cursor(*next_key),
+            "has_more": has_more,
+            "changes": changes
+        }
+
+    @staticmethod
+    def _decode_token(token: Optional[str]) -> Tuple[int, int]:
+        """(xact_id, seq) of the last entry a client has seen"""
+        if not token:
+            return (0, 0)
+        try:
+            key = decode_cursor(token, 2)
+        except ValueError:
+            # Tokens from before xact_id was recorded hold only a seq; those
+            # entries all have xact_id 0
+            key = (0, *decode_cursor(token, 1))
+        if not all(isinstance(part, int) for part in key):
+            raise ValueError("Invalid sync token")
+        return key
+
+    async def _current_rows(self, table: Table, ids: List[int], user_id: int) -> List[Dict]:
+        if not ids:
+            return []
+        query = select(table).where(table.c.id.in_(ids)).order_by(table.c.id)
+        if table.name in USER_TABLES:
+            query = query.where(table.c.user_id == user_id)
+        result = await self.db.execute(query)
+        return [dict(row) for row in result.mappings()]
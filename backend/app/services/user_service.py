@@ -0,0 +1,64 @@
+from datetime import datetime
+from typing import Dict, Optional
+from sqlalchemy import select, update
+from ..config.database import AsyncSessionLocal
+from ..models.user import User
+from ..utils.security import get_password_hash, password_hasher
+
+class UserService:
+    @staticmethod
+    async def get_user_by_username(username: str) -> Optional[User]:
+        async with AsyncSessionLocal() as db:
+            return await db.scalar(select(User).where(User.username == username))
+
+    @staticmethod
+    async def authenticate_user(username: str, password: str) -> Optional[User]:
+        user = await UserService.get_user_by_username(username)
+        if not user or not user.hashed_password:
+            return None
+        valid, new_hash = await password_hasher.verify_and_update(password, user.hashed_password)
+        if not valid:
+            return None
+        if new_hash:
+            # Stored with an older, cheaper cost: upgrade while we have the password
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    update(User).where(User.id == user.id).values(hashed_password=new_hash)
+                )
+                await db.commit()
+            user.hashed_password = new_hash
+        return user
+
+    @staticmethod
+    async def create_user(username: str, email: str, password: str,
+                          full_name: Optional[str] = None,
+                          language_preference: str = "en") -> User:
+        now = datetime.utcnow()
+        user = User(
+            username=username,
+            email=email,
+            hashed_password=await get_password_hash(password),
+            full_name=full_name,
+            language_preference=language_preference,
+            created_at=now,
+            updated_at=now
+        )
+        async with AsyncSessionLocal() as db:
+            db.add(user)
+            await db.commit()
+        return user
+
+    @staticmethod
+    async def update_user(user_id: int, user_data: Dict) -> Optional[User]:
+        async with AsyncSessionLocal() as db:
+            user = await db.get(User, user_id)
+            if not user:
+                return None
+            for key, value in user_data.items():
+                if key == "password":
+                    user.hashed_password = await get_password_hash(value)
+                elif hasattr(user, key):
+                    setattr(user, key, value)
+            user.updated_at = datetime.utcnow()
+            await db.commit()
+            return user
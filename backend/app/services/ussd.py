@@ -0,0 +1,264 @@
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+BACK = "0"
+HOME = "00"
+SEPARATOR = "*"
+
+CROPS = [("maize", "Maize"), ("beans", "Beans"), ("coffee", "Coffee"),
+         ("bananas", "Bananas"), ("cassava", "Cassava")]
+REGIONS = [("central", "Central"), ("eastern", "Eastern"),
+           ("northern", "Northern"), ("western", "Western")]
+LANGUAGES = [("en", "English"), ("lg", "Luganda"), ("nyn", "Runyankole"),
+             ("ach", "Acholi")]
+
+# Declarative menu definition. A node either lists `options` (a sub-menu) or
+# is a leaf that ends the session. Leaves with a `content` key are filled in
+# by the engine's content provider, falling back to their `text`. Leaves with
+# a `language` key switch the session language and return to the main menu.
+MENU = {
+    "title": "Welcome to AgroGPT",
+    "options": [
+        {
+            "label": "Disease Diagnosis",
+            "options": [
+                {
+                    "label": name,
+                    "text": f"To diagnose {name} diseases, send a photo of the affected "
+                            "plant through the AgroGPT app or describe the symptoms by SMS."
+                }
+                for _, name in CROPS
+            ]
+        },
+        {
+            "label": "Weather Info",
+            "title": "Weather Information",
+            "options": [
+                {
+                    "label": name,
+                    "content": ("weather", region),
+                    "text": f"The weather forecast for {name} is not available right now."
+                }
+                for region, name in REGIONS
+            ]
+        },
+        {
+            "label": "Market Prices",
+            "options": [
+                {
+                    "label": crop_name,
+                    "title": f"{crop_name} Prices - Select Region",
+                    "options": [
+                        {
+                            "label": region_name,
+                            "content": ("market", crop, region),
+                            "text": f"{crop_name} prices for {region_name} are not available right now."
+                        }
+                        for region, region_name in REGIONS
+                    ]
+                }
+                for crop, crop_name in CROPS
+            ]
+        },
+        {
+            "label": "Farming Tips",
+            "text": "Plant at the start of the rains, use certified seed and "
+                    "rotate crops each season to reduce pests and diseases."
+        },
+        {
+            "label": "Language",
+            "title": "Select Language",
+            "options": [
+                {"label": name, "language": code, "text": f"Language set to {name}"}
+                for code, name in LANGUAGES
+            ]
+        }
+    ]
+}
+
+class CompiledNode(NamedTuple):
+    text: str
+    end: bool
+    content: Optional[Tuple[str, ...]]
+    language: Optional[str] = None
+
+def compile_menu(menu: Dict) -> Dict[str, CompiledNode]:
+    """Flatten a declarative menu into a table keyed by `*`-joined option path.
+
+    Menu screens are rendered once here, so serving a hop is one dict lookup.
+    """
+    table: Dict[str, CompiledNode] = {}
+
+    def visit(node: Dict, path: str):
+        options = node.get("options")
+        if options:
+            lines = [node.get("title", node.get("label", ""))]
+            lines += [f"{i}. {option['label']}" for i, option in enumerate(options, 1)]
+            if path:
+                lines.append(f"{BACK}. Back")
+            table[path] = CompiledNode("\n".join(lines), False, None)
+            for i, option in enumerate(options, 1):
+                visit(option, f"{path}{SEPARATOR}{i}" if path else str(i))
+        elif "language" in node:
+            table[path] = CompiledNode(node["text"], False, None, node["language"])
+        else:
+            table[path] = CompiledNode(node["text"], True, node.get("content"))
+
+    visit(menu, "")
+    return table
+
+class USSDSession(NamedTuple):
+    text: str
+    path: str
+    language: str = "en"
+
+class InMemorySessionStore:
+    """In-process USSD session store with TTL eviction.
+
+    Entries are kept in last-touched order, so expired sessions are always at
+    the front and eviction is amortized O(1) per request.
+    """
+
+    def __init__(self, ttl_seconds: float = 180.0, max_sessions: int = 100000):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, Tuple[float, USSDSession]]" = OrderedDict()
+
+    def get(self, session_id: str) -> Optional[USSDSession]:
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return None
+        expires_at, session = entry
+        if expires_at < time.monotonic():
+            del self._sessions[session_id]
+            return None
+        return session
+
+    def set(self, session_id: str, session: USSDSession):
+        now = time.monotonic()
+        self._sessions[session_id] = (now + self.ttl_seconds, session)
+        self._sessions.move_to_end(session_id)
+        self._evict(now)
+
+    def delete(self, session_id: str):
+        self._sessions.pop(session_id, None)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _evict(self, now: float):
+        while self._sessions:
+            session_id, (expires_at, _) = next(iter(self._sessions.items()))
+            if expires_at >= now and len(self._sessions) <= self.max_sessions:
+                break
+            del self._sessions[session_id]
+
+class RedisSessionStore:
+    """USSD session store shared between API workers through Redis.
+
+    Adds a network round trip per hop, so only use it when sessions must
+    survive requests landing on different processes.
+    """
+
+    def __init__(self, redis_url: str, ttl_seconds: int = 180, prefix: str = "ussd:session:"):
+        import redis
+
+        self.client = redis.Redis.from_url(redis_url)
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    def get(self, session_id: str) -> Optional[USSDSession]:
+        value = self.client.get(self.prefix + session_id)
+        return USSDSession(*json.loads(value)) if value else None
+
+    def set(self, session_id: str, session: USSDSession):
+        self.client.setex(self.prefix + session_id, self.ttl_seconds, json.dumps(list(session)))
+
+    def delete(self, session_id: str):
+        self.client.delete(self.prefix + session_id)
+
+ContentProvider = Callable[[Tuple[str, ...], str], Optional[str]]
+
+class USSDMenuEngine:
+    """Resolves USSD hops against a compiled menu table and per-session state.
+
+    Gateways send the full input history in `text` ("1*3*2"). The session
+    remembers the last text seen and the menu path it resolved to, so each
+    hop only applies the newly entered segment, and "0" (back) and "00"
+    (main menu) navigate relative to where the caller actually is.
+    """
+
+    def __init__(self, menu: Dict = MENU, session_store=None,
+                 content_provider: Optional[ContentProvider] = None):
+        self.table = compile_menu(menu)
+        self.sessions = session_store if session_store is not None else InMemorySessionStore()
+        self.content_provider = content_provider
+
+    def handle(self, session_id: str, text: str,
+               language: Optional[str] = None) -> Tuple[str, bool]:
+        """Resolve one hop, returning the screen text and whether the session ends"""
+        text = text.strip()
+        session = self.sessions.get(session_id)
+        if language is None:
+            language = session.language if session is not None else "en"
+        if session is not None and text.startswith(session.text + SEPARATOR) and session.text:
+            path = session.path
+            segments = text[len(session.text) + 1:].split(SEPARATOR)
+        elif session is not None and text == session.text:
+            path, segments = session.path, []
+        else:
+            path = ""
+            segments = text.split(SEPARATOR) if text else []
+
+        invalid = False
+        for segment in segments:
+            path, invalid = self._step(path, segment)
+
+        node = self.table[path]
+        if node.end:
+            self.sessions.delete(session_id)
+            return self._render_leaf(node, language), True
+
+        if node.language is not None:
+            language = node.language
+            self.sessions.set(session_id, USSDSession(text, "", language))
+            return node.text + "\n" + self.table[""].text, False
+
+        self.sessions.set(session_id, USSDSession(text, path, language))
+        if invalid:
+            return "Invalid option. Please try again.\n" + node.text, False
+        return node.text, False
+
+    def _step(self, path: str, segment: str) -> Tuple[str, bool]:
+        """Apply one input segment to the current path"""
+        segment = segment.strip()
+        if segment == HOME:
+            return "", False
+        if segment == BACK:
+            return path.rpartition(SEPARATOR)[0] if SEPARATOR in path else "", False
+        child = f"{path}{SEPARATOR}{segment}" if path else segment
+        if child in self.table:
+            return child, False
+        return path, True
+
+    def _render_leaf(self, node: CompiledNode, language: str) -> str:
+        if node.content is not None and self.content_provider is not None:
+            content = self.content_provider(node.content, language)
+            if content:
+                return content
+        return node.text
+
+class USSDMenuEngineFactory:
+    @staticmethod
+    def create_engine(content_provider: Optional[ContentProvider] = None) -> USSDMenuEngine:
+        ttl = int(os.getenv("USSD_SESSION_TTL_SECONDS", "180"))
+        if os.getenv("USSD_SESSION_BACKEND", "memory") == "redis":
+            store = RedisSessionStore(os.getenv("REDIS_URL", "redis://localhost:6379/0"), ttl)
+        else:
+            store = InMemorySessionStore(
+                ttl, int(os.getenv("USSD_MAX_SESSIONS", "100000"))
+            )
+        return USSDMenuEngine(MENU, store, content_provider)
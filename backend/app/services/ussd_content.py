@@ -0,0 +1,155 @@
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from ..ml.weather_predictor import WeatherPredictor
+from ..ml.market_analyzer import MarketAnalyzer
+from ..utils.translator import Translator
+from .market_snapshot_service import MarketSnapshotService
+
+logger = logging.getLogger(__name__)
+
+USSD_MAX_CHARS = 182
+SMS_MAX_CHARS = 160
+
+def truncate(text: str, limit: int) -> str:
+    """Fit text into a screen, cutting on a line or word boundary when possible"""
+    if len(text) <= limit:
+        return text
+    cut = text[:limit - 3]
+    boundary = max(cut.rfind("\n"), cut.rfind(" "))
+    if boundary > limit // 2:
+        cut = cut[:boundary]
+    return cut.rstrip() + "..."
+
+class USSDContentRenderer:
+    """Pre-renders the final USSD and SMS texts behind the data menus.
+
+    Every (kind, *args, language) screen is built ahead of time into a flat
+    table, so a USSD hop never runs model inference or DataFrame scans under
+    the telco deadline. Market screens are re-rendered from the market
+    snapshots whenever prices are ingested; weather screens on a timer.
+    """
+
+    def __init__(self, weather_predictor: WeatherPredictor,
+                 market_analyzer: MarketAnalyzer,
+                 market_snapshots: MarketSnapshotService,
+                 translator: Translator, refresh_seconds: int = 3600):
+        self.weather_predictor = weather_predictor
+        self.market_analyzer = market_analyzer
+        self.market_snapshots = market_snapshots
+        self.translator = translator
+        self.refresh_seconds = refresh_seconds
+        self.table: Dict[Tuple[str, ...], Dict[str, str]] = {}
+        self.last_refreshed: Optional[datetime] = None
+        # Registered after the snapshot service's own listener, so the
+        # snapshots read here are already the refreshed ones
+        market_analyzer.add_ingest_listener(self.refresh_market)
+
+    def lookup(self, content_key: Tuple[str, ...], language: str,
+               channel: str = "ussd") -> Optional[str]:
+        """Get a pre-rendered screen; channel is "ussd" or "sms" """
+        screens = self.table.get((*content_key, language))
+        return screens.get(channel) if screens else None
+
+    def rebuild(self):
+        """Render every weather and market screen in every language"""
+        table = {}
+        for region in self.weather_predictor.regions:
+            table.update(self._render_weather(region))
+        for crop in self.market_analyzer.crops:
+            for region in self.market_analyzer.regions:
+                table.update(self._render_market(crop, region))
+        # A USSD hop mid-rebuild still finds every screen of the previous table
+        self.table = table
+        self.last_refreshed = datetime.now()
+
+    def refresh_market(self, crop: str, region: str):
+        """Re-render the market screens of one crop and region"""
+        self.table.update(self._render_market(crop, region))
+
+    async def run_periodic(self):
+        """Rebuild all screens every `refresh_seconds`, off the event loop"""
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            try:
+                await asyncio.to_thread(self.rebuild)
+            except Exception:
+                logger.exception("Failed to refresh USSD content")
+
+    def _render_weather(self, region: str) -> Dict[Tuple[str, ...], Dict[str, str]]:
+        try:
+            forecast = self.weather_predictor.get_weekly_forecast(region)
+        except Exception:
+            logger.exception("Weather forecast unavailable for %s", region)
+            return {}
+
+        screens = {}
+        for language in self.translator.supported_languages:
+            header = f"{self._t('Weather', language)} - {self._t(region.title(), language)}"
+            lines = [
+                f"{datetime.strptime(day['date'], '%Y-%m-%d').strftime('%a %d')}: "
+                f"{day['temperature']:.0f}C {day['rainfall']:.0f}mm {day['humidity']:.0f}%"
+                for day in forecast
+            ]
+            ussd = "\n".join([header] + lines)
+            sms = f"{header}: " + "; ".join(lines)
+            screens[("weather", region, language)] = {
+                "ussd": truncate(ussd, USSD_MAX_CHARS),
+                "sms": truncate(sms, SMS_MAX_CHARS)
+            }
+        return screens
+
+    def _render_market(self, crop: str, region: str) -> Dict[Tuple[str, ...], Dict[str, str]]:
+        screens = {}
+        for language in self.translator.supported_languages:
+            # Runs in a rebuild thread: read what is there, the snapshot
+            # service schedules its own refreshes
+            snapshot = self.market_snapshots.peek(crop, region, language)
+            if snapshot is None:
+                continue
+            insights = snapshot.payload["insights"]
+            price_trend = insights.get("price_trend", {})
+            price = price_trend.get("current_price")
+            if price is None:
+                continue
+
+            unit = next((p.get("unit") for p in insights.get("current_prices", []) if p.get("unit")), "kg")
+            if "/" not in unit:
+                # Market data stores "UGX/kg"; a bare unit gets the currency
+                unit = f"UGX/{unit}"
+            title = f"{self._t(self.market_analyzer.crops[crop], language)} - {self._t(region.title(), language)}"
+            price_text = f"{price:,.0f} {unit}"
+            trend = self._t(price_trend.get("trend", ""), language)
+            recommendation = insights.get("recommendation", "")
+            ussd = "\n".join([
+                title,
+                f"{self._t('Price', language)}: {price_text}",
+                f"{self._t('Trend', language)}: {trend}",
+                recommendation
+            ])
+            sms = f"{title}: {price_text}, {trend}. {recommendation}"
+            screens[("market", crop, region, language)] = {
+                "ussd": truncate(ussd, USSD_MAX_CHARS),
+                "sms": truncate(sms, SMS_MAX_CHARS)
+            }
+        return screens
+
+    def _t(self, text: str, language: str) -> str:
+        return self.translator.translate(text, language)
+
+class USSDContentRendererFactory:
+    @staticmethod
+    def create_renderer(weather_predictor: WeatherPredictor,
+                        market_analyzer: MarketAnalyzer,
+                        market_snapshots: MarketSnapshotService,
+                        translator: Translator) -> USSDContentRenderer:
+        refresh_seconds = int(os.getenv("USSD_CONTENT_REFRESH_SECONDS", "3600"))
+        renderer = USSDContentRenderer(
+            weather_predictor, market_analyzer, market_snapshots,
+            translator, refresh_seconds
+        )
+        renderer.rebuild()
+        return renderer
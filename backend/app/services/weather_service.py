@@ -1,14 +1,43 @@
+import os
 import httpx
 from typing import Dict, List
 from ..utils.config import get_settings
+from ..utils.metrics import timed
 
 settings = get_settings()
 
+# What the mobile app shows, out of ~30 day and ~35 hourly fields upstream
+COMPACT_DAY_FIELDS = (
+    "maxtemp_c", "mintemp_c", "totalprecip_mm", "daily_chance_of_rain",
+    "avghumidity", "maxwind_kph", "uv"
+)
+COMPACT_CURRENT_FIELDS = ("temp_c", "humidity", "precip_mm", "wind_kph", "uv", "last_updated")
+
+def compact_forecast(forecast: List[Dict]) -> List[Dict]:
+    """Daily summary of a forecast, without the hourly breakdown and astronomy"""
+    days = []
+    for forecast_day in forecast:
+        day = forecast_day.get("day", {})
+        compact = {"date": forecast_day.get("date")}
+        compact.update({field: day.get(field) for field in COMPACT_DAY_FIELDS})
+        compact["condition"] = day.get("condition", {}).get("text")
+        days.append(compact)
+    return days
+
+def compact_current(weather: Dict) -> Dict:
+    """Current conditions without air quality detail and duplicate imperial units"""
+    current = weather.get("current", {})
+    compact = {"location": weather.get("location", {}).get("name")}
+    compact.update({field: current.get(field) for field in COMPACT_CURRENT_FIELDS})
+    compact["condition"] = current.get("condition", {}).get("text")
+    return compact
+
 class WeatherService:
     WEATHER_API_KEY = settings.WEATHER_API_KEY
-    WEATHER_API_BASE_URL = "https://api.weatherapi.com/v1"
+    WEATHER_API_BASE_URL = os.getenv("WEATHER_API_BASE_URL", "https://api.weatherapi.com/v1")
 
     @staticmethod
+    @timed("weather_api")
     async def get_current_weather(location: str) -> Dict:
         """Get current weather data for a location"""
         async with httpx.AsyncClient() as client:
@@ -24,6 +53,7 @@ class WeatherService:
             return response.json()
 
     @staticmethod
+    @timed("weather_api")
     async def get_forecast(location: str, days: int = 7) -> List[Dict]:
         """Get weather forecast for a location"""
         async with httpx.AsyncClient() as client:
@@ -40,6 +70,7 @@ class WeatherService:
             return response.json()["forecast"]["forecastday"]
 
     @staticmethod
+    @timed("weather_api")
     async def get_alerts(location: str) -> List[Dict]:
         """Get weather alerts for a location"""
         async with httpx.AsyncClient() as client:
@@ -0,0 +1,202 @@
+import gzip
+from contextvars import ContextVar
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs
+
+import msgpack
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# Media types worth compressing; images and archives are already compressed
+COMPRESSIBLE_TYPES = ("application/json", MSGPACK_MEDIA_TYPE, "application/x-ndjson", "text/")
+
+# Field tree parsed from `fields=`: key -> subtree, or None to keep everything
+FieldTree = Dict[str, Optional[dict]]
+
+# (client accepts MessagePack, requested fields) for the current request
+_negotiation: ContextVar[Optional[Tuple[bool, Optional[FieldTree]]]] = ContextVar(
+    "response_negotiation", default=None
+)
+
+def current_negotiation() -> Tuple[bool, Optional[FieldTree]]:
+    """(client prefers MessagePack, requested fields) for the request being served"""
+    return _negotiation.get() or (False, None)
+
+def parse_fields(value: Optional[str]) -> Optional[FieldTree]:
+    """Parse `fields=a,b.c` into a tree of the paths to keep"""
+    if not value:
+        return None
+    tree: FieldTree = {}
+    for path in value.split(","):
+        keys = [key.strip() for key in path.split(".") if key.strip()]
+        node = tree
+        for position, key in enumerate(keys):
+            last = position == len(keys) - 1
+            if last:
+                node[key] = None
+            elif node.get(key, {}) is None:
+                break  # An ancestor is already kept whole
+            else:
+                node = node.setdefault(key, {})
+    return tree or None
+
+def select_fields(data: Any, tree: Optional[FieldTree]) -> Any:
+    """Keep only the paths in `tree`; lists are traversed transparently"""
+    if tree is None:
+        return data
+    if isinstance(data, list):
+        return [select_fields(item, tree) for item in data]
+    if isinstance(data, dict):
+        return {key: select_fields(data[key], subtree) for key, subtree in tree.items() if key in data}
+    return data
+
+def _accepted(header: str) -> Dict[str, float]:
+    """Media types or codings of an Accept/Accept-Encoding header with their q"""
+    accepted = {}
+    for part in header.split(","):
+        name, *params = [piece.strip() for piece in part.split(";")]
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        if name:
+            accepted[name.lower()] = quality
+    return accepted
+
+def accepts_msgpack(accept: str) -> bool:
+    """Whether MessagePack is asked for and preferred over JSON"""
+    accepted = _accepted(accept)
+    msgpack_quality = max(accepted.get(MSGPACK_MEDIA_TYPE, 0.0), accepted.get("application/x-msgpack", 0.0))
+    return msgpack_quality > 0 and msgpack_quality >= accepted.get("application/json", 0.0)
+
+def encode_msgpack(content: Any) -> bytes:
+    return msgpack.packb(content, use_bin_type=True)
+
+def add_vary(headers: MutableHeaders, name: str):
+    """Add a header name to Vary unless it is already listed"""
+    listed = [value.strip().lower() for value in headers.get("vary", "").split(",")]
+    if name.lower() not in listed:
+        headers.add_vary_header(name)
+
+def choose_coding(accept_encoding: str) -> Optional[str]:
+    """Best supported content coding: brotli when available, else gzip"""
+    accepted = _accepted(accept_encoding)
+    for coding in ("br", "gzip"):
+        quality = accepted.get(coding, accepted.get("*", 0.0))
+        if quality > 0 and (coding != "br" or _brotli() is not None):
+            return coding
+    return None
+
+def _brotli():
+    # Optional: without the brotli package clients simply get gzip
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+def compress(body: bytes, coding: str, level: Optional[int] = None) -> bytes:
+    if coding == "br":
+        # Quality 5 compresses better than gzip -9 at a fraction of brotli's max cost
+        return _brotli().compress(body, quality=5 if level is None else level)
+    return gzip.compress(body, compresslevel=6 if level is None else level, mtime=0)
+
+def weaken_etag(headers: MutableHeaders):
+    """Mark a strong ETag weak: same content, but encoded to different bytes"""
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = "W/" + etag
+
+class NegotiatedResponse(JSONResponse):
+    """Default response class: applies `fields=` and encodes as JSON or MessagePack.
+
+    The choice is made by ResponseEncodingMiddleware from the request; without
+    the middleware this behaves exactly like JSONResponse.
+    """
+
+    def render(self, content: Any) -> bytes:
+        negotiation = _negotiation.get()
+        if negotiation is None:
+            return super().render(content)
+        use_msgpack, fields = negotiation
+        content = select_fields(content, fields)
+        if use_msgpack:
+            self.media_type = MSGPACK_MEDIA_TYPE
+            return encode_msgpack(content)
+        return super().render(content)
+
+class ResponseEncodingMiddleware:
+    """Content negotiation and compression for slow mobile links.
+
+    Records the client's MessagePack preference and `fields=` selection for
+    NegotiatedResponse, then compresses complete bodies of at least
+    `minimum_size` bytes with brotli or gzip, weakening their ETags; 304s to
+    clients that accept compression get the weakened ETag too, whatever the
+    size. Streamed responses pass through untouched so NDJSON lines are still
+    delivered as they are produced.
+    """
+
+    def __init__(self, app, minimum_size: int = 512):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"]}
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        fields = parse_fields(",".join(query.get("fields", [])))
+        token = _negotiation.set((accepts_msgpack(headers.get("accept", "")), fields))
+        coding = choose_coding(headers.get("accept-encoding", ""))
+
+        start_message: Optional[dict] = None
+        passthrough = False
+
+        async def send_encoded(message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            response_headers = MutableHeaders(raw=list(start_message.get("headers", [])))
+            body = message.get("body", b"")
+            if message.get("more_body", False):
+                # Streaming: headers must go out now, uncompressed
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            media_type = response_headers.get("content-type", "")
+            if media_type.startswith(("application/json", MSGPACK_MEDIA_TYPE)):
+                add_vary(response_headers, "Accept")
+            if (coding and len(body) >= self.minimum_size
+                    and "content-encoding" not in response_headers
+                    and media_type.startswith(COMPRESSIBLE_TYPES)):
+                body = compress(body, coding)
+                response_headers["Content-Encoding"] = coding
+                response_headers["Content-Length"] = str(len(body))
+                add_vary(response_headers, "Accept-Encoding")
+                weaken_etag(response_headers)
+            elif coding and start_message["status"] == 304:
+                # Revalidation of a representation this client would get
+                # compressed: send the ETag it holds, as the 200 would have
+                add_vary(response_headers, "Accept-Encoding")
+                weaken_etag(response_headers)
+            await send({**start_message, "headers": response_headers.raw})
+            await send({**message, "body": body})
+
+        try:
+            await self.app(scope, receive, send_encoded)
+        finally:
+            _negotiation.reset(token)
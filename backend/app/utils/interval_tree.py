@@ -0,0 +1,77 @@
+from typing import Generic, Iterable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+Interval = Tuple[int, int, T]
+
+class _Node(Generic[T]):
+    __slots__ = ("center", "by_start", "by_end", "left", "right")
+
+    def __init__(self, center: int, overlapping: List[Interval]):
+        self.center = center
+        # Intervals containing `center`, sorted for early exit from either side
+        self.by_start = sorted(overlapping, key=lambda interval: interval[0])
+        self.by_end = sorted(overlapping, key=lambda interval: interval[1], reverse=True)
+        self.left: Optional["_Node[T]"] = None
+        self.right: Optional["_Node[T]"] = None
+
+class IntervalTree(Generic[T]):
+    """Static centered interval tree over closed integer intervals.
+
+    Each node keeps the intervals that contain its center point; the rest
+    go left (entirely below) or right (entirely above). Depth is O(log n)
+    and an overlap query reports k matches in O(log n + k).
+    """
+
+    def __init__(self, intervals: Iterable[Interval]):
+        intervals = [interval for interval in intervals if interval[0] <= interval[1]]
+        self.size = len(intervals)
+        self.root = self._build(intervals)
+
+    @classmethod
+    def _build(cls, intervals: List[Interval]) -> Optional[_Node[T]]:
+        if not intervals:
+            return None
+        endpoints = sorted(point for start, end, _ in intervals for point in (start, end))
+        center = endpoints[len(endpoints) // 2]
+        left, here, right = [], [], []
+        for interval in intervals:
+            if interval[1] < center:
+                left.append(interval)
+            elif interval[0] > center:
+                right.append(interval)
+            else:
+                here.append(interval)
+        node = _Node(center, here)
+        node.left = cls._build(left)
+        node.right = cls._build(right)
+        return node
+
+    def overlapping(self, low: int, high: int) -> List[T]:
+        """Values of all intervals intersecting [low, high]"""
+        found: List[T] = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            if high < node.center:
+                for start, _, value in node.by_start:
+                    if start > high:
+                        break
+                    found.append(value)
+                stack.append(node.left)
+            elif low > node.center:
+                for _, end, value in node.by_end:
+                    if end < low:
+                        break
+                    found.append(value)
+                stack.append(node.right)
+            else:
+                found.extend(value for _, _, value in node.by_start)
+                stack.append(node.left)
+                stack.append(node.right)
+        return found
+
+    def __len__(self) -> int:
+        return self.size
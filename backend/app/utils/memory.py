@@ -0,0 +1,44 @@
+import os
+from pathlib import Path
+from typing import Dict, List, Union
+
+# smaps_rollup fields, in kB, summed over every mapping of the process
+FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty")
+
+def read_smaps_rollup(pid: Union[int, str] = "self") -> Dict[str, int]:
+    """Memory counters of a process in bytes (Linux 4.14+)"""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            name, _, rest = line.partition(":")
+            if name in FIELDS:
+                values[name] = int(rest.split()[0]) * 1024
+    return values
+
+def memory_usage(pid: Union[int, str] = "self") -> Dict[str, int]:
+    """Unique (private) vs shared resident memory of a process.
+
+    `unique` is what the process would free by exiting; `shared` pages are
+    also mapped by another process, e.g. inherited from a preloading master
+    and not yet written to. `pss` splits shared pages evenly between their
+    users, so summing it over all workers gives the real total.
+    """
+    try:
+        values = read_smaps_rollup(pid)
+    except OSError:
+        return {"pid": os.getpid() if pid == "self" else int(pid), "available": False}
+    return {
+        "pid": os.getpid() if pid == "self" else int(pid),
+        "available": True,
+        "rss": values.get("Rss", 0),
+        "pss": values.get("Pss", 0),
+        "unique": values.get("Private_Clean", 0) + values.get("Private_Dirty", 0),
+        "shared": values.get("Shared_Clean", 0) + values.get("Shared_Dirty", 0)
+    }
+
+def child_pids(pid: int) -> List[int]:
+    """Direct children of a process, e.g. the workers of a gunicorn master"""
+    children = []
+    for task in Path(f"/proc/{pid}/task").iterdir():
+        children.extend(int(child) for child in (task / "children").read_text().split())
+    return sorted(children)
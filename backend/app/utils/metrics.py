@@ -0,0 +1,195 @@
+import functools
+import inspect
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Upper bounds in seconds, spanning a cache hit to a slow model or upstream call
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Seconds spent per stage in the current request, when a request is being timed
+_request_stages: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_stages", default=None)
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense, one series per label set"""
+
+    def __init__(self, name: str, description: str, label_names: Sequence[str],
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (last is +Inf), sum]
+        self._series: Dict[Tuple[str, ...], List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = [(labels, list(counts), total) for labels, (counts, total) in self._series.items()]
+        for labels, counts, total in sorted(series):
+            label_text = ",".join(
+                f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, labels)
+            )
+            prefix = label_text + "," if label_text else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{self.name}_bucket{{{prefix}le="{le}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {total}")
+            lines.append(f"{self.name}_count{{{label_text}}} {cumulative}")
+        return lines
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+class _StageTimer:
+    __slots__ = ("registry", "stage", "started")
+
+    def __init__(self, registry: "MetricsRegistry", stage: str):
+        self.registry = registry
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.registry.record_stage(self.stage, time.perf_counter() - self.started)
+        return False
+
+class MetricsRegistry:
+    """Process-wide latency histograms and per-request stage breakdowns.
+
+    When disabled, `timer()` hands out a shared no-op context manager and
+    `timed` leaves functions undecorated, so instrumented code pays nothing.
+    """
+
+    def __init__(self, enabled: bool = True, server_timing: bool = False):
+        self.enabled = enabled
+        self.server_timing = server_timing
+        self.stages = Histogram(
+            "agrogpt_stage_duration_seconds", "Time spent in an instrumented stage", ("stage",)
+        )
+        self.requests = Histogram(
+            "agrogpt_request_duration_seconds", "HTTP request latency",
+            ("method", "handler", "status")
+        )
+
+    def timer(self, stage: str):
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self, stage)
+
+    def record_stage(self, stage: str, seconds: float):
+        self.stages.observe(seconds, stage)
+        stages = _request_stages.get()
+        if stages is not None:
+            stages[stage] = stages.get(stage, 0.0) + seconds
+
+    def timed(self, stage: str):
+        """Decorator timing every call of a sync or async function as `stage`"""
+        def decorate(func):
+            if not self.enabled:
+                return func
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with _StageTimer(self, stage):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with _StageTimer(self, stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        return "\n".join(self.stages.render() + self.requests.render()) + "\n"
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency and each request's stages.
+
+    With server timing enabled the stage breakdown is also returned to the
+    client as a `Server-Timing` header, e.g. `auth;dur=0.4, total;dur=12.1`.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.registry.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        stages: Dict[str, float] = {}
+        token = _request_stages.set(stages)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.registry.server_timing:
+                    entries = [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in stages.items()]
+                    entries.append(f"total;dur={(time.perf_counter() - started) * 1000:.1f}")
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", ", ".join(entries).encode("latin-1")))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_stages.reset(token)
+            # The router stores the matched endpoint in the scope; unmatched
+            # paths share one label so scanners cannot blow up the series count
+            endpoint = scope.get("endpoint")
+            handler = getattr(endpoint, "__name__", "unmatched")
+            self.registry.requests.observe(
+                time.perf_counter() - started, scope["method"], handler, str(status_code)
+            )
+
+class MetricsRegistryFactory:
+    @staticmethod
+    def create_registry() -> MetricsRegistry:
+        enabled = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+        server_timing = os.getenv("METRICS_SERVER_TIMING", "false").lower() == "true"
+        return MetricsRegistry(enabled, server_timing)
+
+metrics = MetricsRegistryFactory.create_registry()
+timed = metrics.timed
+
+def timer(stage: str):
+    """Context manager timing the enclosed block as `stage`"""
+    return metrics.timer(stage)
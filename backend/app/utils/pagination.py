@@ -0,0 +1,25 @@
+import base64
+import json
+from typing import Optional, Tuple
+
+def encode_cursor(*key) -> str:
+    """Opaque cursor for the sort key of the last row of a page"""
+    raw = json.dumps(list(key), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: Optional[str], size: int) -> Optional[Tuple]:
+    """Sort key from a cursor; raises ValueError if it is malformed"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(key, list) or len(key) != size:
+        raise ValueError("Invalid cursor")
+    return tuple(key)
+
+def next_link(url, cursor: str) -> str:
+    """RFC 8288 Link header value pointing at the next page"""
+    return f'<{url.include_query_params(cursor=cursor)}>; rel="next"'
@@ -0,0 +1,134 @@
+import hashlib
+import json
+from typing import Any, Callable, Dict, Iterable, List
+
+from .translation_engine import LRUCache
+
+# Path syntax: dotted keys, "*" for every key of a dict and "[]" for every
+# item of a list, e.g. "price_trend.trend" or "current_prices[].unit". When a
+# path ends on a container, every string nested inside it is translated.
+WILDCARD = "*"
+LIST_ITEMS = "[]"
+
+Translate = Callable[[str], str]
+Walker = Callable[[Any, Translate], Any]
+
+class PayloadSchema:
+    """The translatable paths of one response type, compiled into a walker.
+
+    Compilation happens once per schema; walking a payload then only visits
+    the declared paths and copies just the containers whose contents change.
+    """
+
+    def __init__(self, name: str, paths: Iterable[str]):
+        self.name = name
+        self.paths = list(paths)
+        self.walker = _compile(_path_tree(self.paths))
+
+    def __repr__(self):
+        return f"<PayloadSchema {self.name}>"
+
+class PayloadTranslator:
+    """Translates payloads along a schema, caching by (schema, content, language).
+
+    Cached results are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, translate: Callable[[str, str], str], cache_size: int = 1024):
+        self._translate = translate
+        self.cache = LRUCache(cache_size)
+
+    def translate(self, payload: Any, schema: PayloadSchema, target_lang: str) -> Any:
+        key = (schema.name, target_lang, content_hash(payload))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        translated = schema.walker(payload, lambda text: self._translate(text, target_lang))
+        self.cache.set(key, translated)
+        return translated
+
+def content_hash(payload: Any) -> str:
+    """Digest of a JSON-like payload, independent of dict key order"""
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).hexdigest()
+
+def _split(path: str) -> List[str]:
+    """Split "a.b[].c" into ["a", "b", "[]", "c"]"""
+    segments = []
+    for part in path.split("."):
+        depth = 0
+        while part.endswith(LIST_ITEMS):
+            part = part[:-len(LIST_ITEMS)]
+            depth += 1
+        if part:
+            segments.append(part)
+        segments.extend([LIST_ITEMS] * depth)
+    return segments
+
+def _path_tree(paths: Iterable[str]) -> Dict:
+    """Merge paths into a nested dict of segments; None marks a terminal path"""
+    tree: Dict = {}
+    for path in paths:
+        *parents, last = _split(path)
+        node = tree
+        for segment in parents:
+            if segment in node and node[segment] is None:
+                # A shorter path already translates everything below here
+                break
+            node = node.setdefault(segment, {})
+        else:
+            node[last] = None
+    return tree
+
+def _translate_all(value: Any, translate: Translate) -> Any:
+    """Translate every string inside a value, copying only what changes"""
+    if isinstance(value, str):
+        return translate(value)
+    if isinstance(value, dict):
+        changed = None
+        for key, item in value.items():
+            new = _translate_all(item, translate)
+            if new is not item:
+                if changed is None:
+                    changed = dict(value)
+                changed[key] = new
+        return changed if changed is not None else value
+    if isinstance(value, list):
+        items = [_translate_all(item, translate) for item in value]
+        if any(new is not old for new, old in zip(items, value)):
+            return items
+        return value
+    return value
+
+def _compile(tree: Dict) -> Walker:
+    """Turn a path tree into a function that walks only those paths"""
+    children = {
+        segment: (_translate_all if subtree is None else _compile(subtree))
+        for segment, subtree in tree.items()
+    }
+    item_walker = children.pop(LIST_ITEMS, None)
+    wildcard_walker = children.pop(WILDCARD, None)
+    key_walkers = list(children.items())
+
+    def walk(value: Any, translate: Translate) -> Any:
+        if isinstance(value, dict):
+            changed = None
+            if wildcard_walker is not None:
+                targets = [(key, wildcard_walker) for key in value]
+            else:
+                targets = [(key, walker) for key, walker in key_walkers if key in value]
+            for key, walker in targets:
+                item = value[key]
+                new = walker(item, translate)
+                if new is not item:
+                    if changed is None:
+                        changed = dict(value)
+                    changed[key] = new
+            return changed if changed is not None else value
+        if isinstance(value, list) and item_walker is not None:
+            items = [item_walker(item, translate) for item in value]
+            if any(new is not old for new, old in zip(items, value)):
+                return items
+        return value
+
+    return walk
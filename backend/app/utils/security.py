@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Dict, Optional, Tuple
+
+from passlib.context import CryptContext
+
+logger = logging.getLogger(__name__)
+
+# Never calibrate below this: it is the lowest cost still considered safe
+MIN_BCRYPT_ROUNDS = 10
+MAX_BCRYPT_ROUNDS = 16
+
+class HasherBusy(Exception):
+    """Too many password hashes are already waiting for a worker"""
+
+class TooManyAttempts(Exception):
+    """A client has too many logins in flight"""
+
+def make_context(rounds: int) -> CryptContext:
+    # min_rounds makes needs_update() flag hashes made with a lower cost, so
+    # they are upgraded on the next login; stronger hashes are left alone
+    return CryptContext(schemes=["bcrypt"], deprecated="auto",
+                        bcrypt__default_rounds=rounds, bcrypt__min_rounds=rounds)
+
+def calibrate_rounds(target_ms: float, min_rounds: int = MIN_BCRYPT_ROUNDS,
+                     max_rounds: int = MAX_BCRYPT_ROUNDS) -> int:
+    """Highest bcrypt cost whose hash takes no longer than `target_ms` here"""
+    sample = make_context(min_rounds).hash
+    started = time.perf_counter()
+    sample("calibration")
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    rounds = min_rounds
+    # Each extra round doubles the work
+    while rounds < max_rounds and elapsed_ms * 2 <= target_ms:
+        elapsed_ms *= 2
+        rounds += 1
+    return rounds
+
+class PasswordHasher:
+    """bcrypt hashing and verification off the event loop.
+
+    Work runs on a small dedicated thread pool (bcrypt releases the GIL), so
+    at most `workers` cores are spent on passwords and other requests keep
+    being served during a burst of logins. Callers beyond `max_pending`
+    waiting for a worker are refused with HasherBusy rather than queued.
+    """
+
+    def __init__(self, rounds: int = 12, workers: int = 2, max_pending: int = 64,
+                 target_ms: Optional[float] = None):
+        self.rounds = rounds
+        self.target_ms = target_ms
+        self.context = make_context(rounds)
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password")
+        self._pending = 0
+
+    def calibrate(self) -> int:
+        """Pick the cost from `target_ms`, if one was configured"""
+        if self.target_ms:
+            self.rounds = calibrate_rounds(self.target_ms)
+            self.context = make_context(self.rounds)
+            logger.info("Password hashing calibrated to %d bcrypt rounds (target %.0fms)",
+                        self.rounds, self.target_ms)
+        return self.rounds
+
+    async def _run(self, func, *args):
+        if self._pending >= self.max_pending:
+            raise HasherBusy()
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(self.context.verify, password, hashed_password)
+
+    async def verify_and_update(self, password: str,
+                                hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Verify, and return a new hash when the stored one uses a lower cost"""
+        return await self._run(self.context.verify_and_update, password, hashed_password)
+
+class ConcurrencyLimiter:
+    """Caps the requests one key (e.g. a client IP) may have in flight at once"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._active: Dict[str, int] = defaultdict(int)
+
+    @asynccontextmanager
+    async def acquire(self, key: str):
+        if self.limit and self._active[key] >= self.limit:
+            raise TooManyAttempts()
+        self._active[key] += 1
+        try:
+            yield
+        finally:
+            self._active[key] -= 1
+            if not self._active[key]:
+                del self._active[key]
+
+class PasswordHasherFactory:
+    @staticmethod
+    def create_hasher() -> PasswordHasher:
+        rounds = int(os.getenv("PASSWORD_HASH_ROUNDS", "12"))
+        target_ms = os.getenv("PASSWORD_HASH_TARGET_MS")
+        workers = int(os.getenv("PASSWORD_HASH_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+        max_pending = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+        return PasswordHasher(rounds, workers, max_pending, float(target_ms) if target_ms else None)
+
+password_hasher = PasswordHasherFactory.create_hasher()
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.verify(plain_password, hashed_password)
+
+async def get_password_hash(password: str) -> str:
+    return await password_hasher.hash(password)
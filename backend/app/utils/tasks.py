@@ -0,0 +1,33 @@
+import asyncio
+import logging
+from typing import Coroutine, Set
+
+logger = logging.getLogger(__name__)
+
+class ServiceTasks:
+    """Long-running background loops started with the app.
+
+    The event loop only keeps weak references to tasks, so they are held
+    here until they finish, and cancelled together on shutdown.
+    """
+
+    def __init__(self):
+        self._tasks: Set[asyncio.Task] = set()
+
+    def start(self, coro: Coroutine) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._done)
+        return task
+
+    def _done(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Background task %s stopped", task.get_name(), exc_info=task.exception())
+
+    async def cancel_all(self):
+        """Cancel every running task and wait for them to unwind"""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,127 @@
+import hashlib
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+# Binary catalog layout (all integers little-endian):
+#   header   magic "AGTC", format version u16, reserved u16, entry count u32,
+#            catalog version u64 (content hash, changes whenever entries do)
+#   index    count x (key offset u32, key length u32, value offset u32,
+#            value length u32), sorted by UTF-8 key bytes
+#   strings  UTF-8 keys and values, offsets relative to the start of the table
+MAGIC = b"AGTC"
+FORMAT_VERSION = 1
+CATALOG_SUFFIX = ".agtc"
+HEADER = struct.Struct("<4sHHIQ")
+ENTRY = struct.Struct("<IIII")
+
+def catalog_version(catalog: Dict[str, str]) -> int:
+    """Content hash of a catalog, stored in the header of its binary form"""
+    digest = hashlib.blake2b(digest_size=8)
+    for key in sorted(catalog):
+        digest.update(key.encode("utf-8") + b"\0" + catalog[key].encode("utf-8") + b"\0")
+    return int.from_bytes(digest.digest(), "little")
+
+def write_catalog(path: Path, catalog: Dict[str, str]) -> int:
+    """Compile a catalog to `path` atomically; returns its version.
+
+    The file is written next to the target and renamed over it, so processes
+    that still map the previous file keep reading a consistent copy.
+    """
+    entries = sorted((key.encode("utf-8"), value.encode("utf-8")) for key, value in catalog.items())
+    strings = bytearray()
+    index = bytearray()
+    for key, value in entries:
+        key_offset = len(strings)
+        strings += key
+        value_offset = len(strings)
+        strings += value
+        index += ENTRY.pack(key_offset, len(key), value_offset, len(value))
+
+    version = catalog_version(catalog)
+    path = Path(path)
+    temporary = path.with_name(path.name + ".tmp")
+    with open(temporary, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(entries), version))
+        f.write(index)
+        f.write(strings)
+    os.replace(temporary, path)
+    return version
+
+class MappedCatalog(Mapping):
+    """Read-only view of a binary catalog backed by a shared memory map.
+
+    Opening costs O(1) whatever the catalog size, and every worker mapping
+    the same file shares its pages through the OS page cache. Lookups binary
+    search the sorted index, comparing raw UTF-8 bytes in place.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b""
+        if len(self._map) < HEADER.size:
+            raise ValueError(f"Truncated translation catalog: {self.path}")
+        magic, format_version, _, self._count, self.version = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or format_version != FORMAT_VERSION:
+            raise ValueError(f"Not a version {FORMAT_VERSION} translation catalog: {self.path}")
+        self._strings = HEADER.size + self._count * ENTRY.size
+        # Identifies the file on disk, for cheap change detection
+        self.stat_key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _entry(self, position: int) -> Tuple[int, int, int, int]:
+        return ENTRY.unpack_from(self._map, HEADER.size + position * ENTRY.size)
+
+    def _bytes(self, offset: int, length: int) -> bytes:
+        start = self._strings + offset
+        return self._map[start:start + length]
+
+    def _find(self, key: bytes) -> Optional[int]:
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            key_offset, key_length, _, _ = self._entry(middle)
+            candidate = self._bytes(key_offset, key_length)
+            if candidate < key:
+                low = middle + 1
+            elif candidate > key:
+                high = middle
+            else:
+                return middle
+        return None
+
+    def __getitem__(self, key: str) -> str:
+        position = self._find(key.encode("utf-8")) if isinstance(key, str) else None
+        if position is None:
+            raise KeyError(key)
+        _, _, value_offset, value_length = self._entry(position)
+        return self._bytes(value_offset, value_length).decode("utf-8")
+
+    def __contains__(self, key) -> bool:
+        return isinstance(key, str) and self._find(key.encode("utf-8")) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for position in range(self._count):
+            key_offset, key_length, _, _ = self._entry(position)
+            yield self._bytes(key_offset, key_length).decode("utf-8")
+
+    def items(self) -> Iterator[Tuple[str, str]]:
+        for position in range(self._count):
+            key_offset, key_length, value_offset, value_length = self._entry(position)
+            yield (self._bytes(key_offset, key_length).decode("utf-8"),
+                   self._bytes(value_offset, value_length).decode("utf-8"))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def changed_on_disk(self) -> bool:
+        """Whether the catalog file has been replaced since it was mapped"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size) != self.stat_key
@@ -0,0 +1,177 @@
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Mapping, Optional, Tuple
+
+# Text is segmented into numbers, words and single punctuation marks;
+# whitespace between tokens is preserved verbatim in the output
+TOKEN_RE = re.compile(r"\d+(?:[.,]\d+)*|\w+|[^\w\s]")
+# Catalog keys may additionally contain "{name}" placeholders
+KEY_TOKEN_RE = re.compile(r"\{\w+\}|\d+(?:[.,]\d+)*|\w+|[^\w\s]")
+PLACEHOLDER_RE = re.compile(r"^\{(\w+)\}$")
+
+_PLACEHOLDER = object()
+_END = object()
+
+class LRUCache:
+    """Small bounded least-recently-used cache, safe to share between threads"""
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, object]" = OrderedDict()
+        # Translations also run in asyncio.to_thread workers, and reordering
+        # an OrderedDict is not atomic
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+class PhraseTrie:
+    """Token-level trie over one language catalog.
+
+    Keys are split into tokens; a "{name}" placeholder becomes a wildcard edge
+    matching exactly one word or number. Matching from a position walks at
+    most as many tokens as the longest catalog phrase, so segmenting a text
+    costs O(length of text x longest phrase), i.e. linear in the input.
+    """
+
+    def __init__(self, catalog: Mapping[str, str]):
+        self.root: Dict = {}
+        self.max_phrase_tokens = 0
+        for key, translation in catalog.items():
+            self.add(key, translation)
+
+    def add(self, key: str, translation: str):
+        tokens = KEY_TOKEN_RE.findall(key)
+        if not tokens:
+            return
+        node = self.root
+        names = []
+        for token in tokens:
+            placeholder = PLACEHOLDER_RE.match(token)
+            if placeholder:
+                names.append(placeholder.group(1))
+                node = node.setdefault(_PLACEHOLDER, {})
+            else:
+                node = node.setdefault(token.casefold(), {})
+        node[_END] = (translation, tuple(names))
+        self.max_phrase_tokens = max(self.max_phrase_tokens, len(tokens))
+
+    def longest_match(self, tokens: List[str], start: int
+                      ) -> Optional[Tuple[int, str, Tuple[str, ...], List[str]]]:
+        """Longest phrase starting at `start`: (end, translation, names, captures)"""
+        best = None
+        # Depth-first over (node, position, captured placeholder values);
+        # literal edges are pushed last so they are explored first
+        stack = [(self.root, start, ())]
+        while stack:
+            node, position, captures = stack.pop()
+            if _END in node and (best is None or position > best[0]):
+                translation, names = node[_END]
+                best = (position, translation, names, list(captures))
+            if position == len(tokens):
+                continue
+            token = tokens[position]
+            wildcard = node.get(_PLACEHOLDER)
+            if wildcard is not None and (token[0].isalnum() or token[0] == "_"):
+                stack.append((wildcard, position + 1, captures + (token,)))
+            child = node.get(token.casefold())
+            if child is not None:
+                stack.append((child, position + 1, captures))
+        if best is None or best[0] == start:
+            return None
+        return best
+
+class TranslationEngine:
+    """Phrase-level translation over compiled catalogs.
+
+    Whole-string catalog hits are served directly. Anything else is
+    segmented left to right into the longest known phrases (including
+    placeholder templates such as "{price} UGX"); unknown tokens pass
+    through unchanged. Recent results are kept in a bounded LRU. Tries are
+    compiled on first use unless `compile()` builds them up front.
+    """
+
+    def __init__(self, catalogs: Dict[str, Mapping[str, str]], cache_size: int = 4096):
+        self.catalogs = catalogs
+        self.tries: Dict[str, PhraseTrie] = {}
+        self.cache = LRUCache(cache_size)
+
+    def compile(self):
+        """Build the tries of every catalog now instead of on first use"""
+        for language, catalog in self.catalogs.items():
+            if catalog and language not in self.tries:
+                self.tries[language] = PhraseTrie(catalog)
+
+    def trie(self, language: str) -> PhraseTrie:
+        trie = self.tries.get(language)
+        if trie is None:
+            trie = self.tries[language] = PhraseTrie(self.catalogs[language])
+        return trie
+
+    def translate(self, text: str, target_lang: str) -> str:
+        """Translate text into target_lang using the compiled catalog"""
+        catalog = self.catalogs.get(target_lang)
+        if not catalog or not text:
+            return text
+        exact = catalog.get(text)
+        if exact is not None:
+            return exact
+
+        key = (target_lang, text)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        translated = self._segment(text, self.trie(target_lang))
+        self.cache.set(key, translated)
+        return translated
+
+    @staticmethod
+    def _segment(text: str, trie: PhraseTrie) -> str:
+        matches = list(TOKEN_RE.finditer(text))
+        tokens = [match.group() for match in matches]
+        pieces = []
+        cursor = 0
+        i = 0
+        while i < len(tokens):
+            found = trie.longest_match(tokens, i)
+            if found is None:
+                i += 1
+                continue
+            end, translation, names, captures = found
+            for name, value in zip(names, captures):
+                translation = translation.replace("{" + name + "}", value)
+            if tokens[i][0].isupper() and translation[:1].islower():
+                translation = translation[0].upper() + translation[1:]
+            pieces.append(text[cursor:matches[i].start()])
+            pieces.append(translation)
+            cursor = matches[end - 1].end()
+            i = end
+        pieces.append(text[cursor:])
+        return "".join(pieces)
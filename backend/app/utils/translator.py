@@ -1,26 +1,58 @@
 from typing import Dict, Optional
 import json
+import logging
 import os
+import time
 from pathlib import Path
+from .payload_translator import PayloadSchema, PayloadTranslator
+from .translation_catalog import CATALOG_SUFFIX, MappedCatalog
+from .metrics import timed
+from .translation_engine import TranslationEngine
+
+logger = logging.getLogger(__name__)
+
+# Translatable paths of each response type (see payload_translator for syntax)
+DISEASE_INFO_SCHEMA = PayloadSchema("disease_info", ["*"])
+WEATHER_FORECAST_SCHEMA = PayloadSchema("weather_forecast", ["description", "unit"])
+MARKET_INSIGHTS_SCHEMA = PayloadSchema("market_insights", [
+    "recommendation",
+    "trend",
+    "price_trend.trend",
+    "current_prices[].unit"
+])
 
 class Translator:
-    def __init__(self, translations_path: str):
-        self.translations = self._load_translations(translations_path)
+    def __init__(self, translations_path: str, cache_size: int = 4096,
+                 payload_cache_size: int = 1024, reload_interval: float = 30.0):
         self.supported_languages = {
             "en": "English",
             "lg": "Luganda",
             "nyn": "Runyankole",
             "ach": "Acholi"
         }
+        self.translations_path = Path(translations_path)
+        self.cache_size = cache_size
+        self.reload_interval = reload_interval
+        self._last_reload_check = time.monotonic()
+        self.translations = self._load_translations(translations_path)
+        self.engine = TranslationEngine(self.translations, cache_size)
+        # Built at import, i.e. in the gunicorn master with preload_app, so
+        # the workers share one copy of the tries instead of each decoding
+        # the mapped catalogs into its own
+        self.engine.compile()
+        self.payload_translator = PayloadTranslator(self.translate, payload_cache_size)
 
     def _load_translations(self, translations_path: str) -> Dict:
-        """Load translation files"""
+        """Load translation files, preferring compiled binary catalogs"""
         translations = {}
         path = Path(translations_path)
         
         for lang in self.supported_languages.keys():
+            binary_path = path / f"{lang}{CATALOG_SUFFIX}"
             file_path = path / f"{lang}.json"
-            if file_path.exists():
+            if binary_path.exists():
+                translations[lang] = MappedCatalog(binary_path)
+            elif file_path.exists():
                 with open(file_path, 'r', encoding='utf-8') as f:
                     translations[lang] = json.load(f)
             else:
@@ -28,6 +60,44 @@ class Translator:
                 
         return translations
 
+    def reload_if_changed(self) -> bool:
+        """Swap in binary catalogs whose version changed on disk"""
+        self._last_reload_check = time.monotonic()
+        translations = dict(self.translations)
+        changed = False
+        for lang, current in self.translations.items():
+            binary_path = self.translations_path / f"{lang}{CATALOG_SUFFIX}"
+            if isinstance(current, MappedCatalog):
+                if not current.changed_on_disk():
+                    continue
+            elif not binary_path.exists():
+                continue
+            try:
+                catalog = MappedCatalog(binary_path)
+            except (OSError, ValueError):
+                logger.exception("Keeping previous %s catalog", lang)
+                continue
+            translations[lang] = catalog
+            if not isinstance(current, MappedCatalog) or catalog.version != current.version:
+                changed = True
+
+        if changed:
+            # New engine (compiled tries, empty cache) swapped in as a whole;
+            # after a hot reload each worker holds its own tries again
+            engine = TranslationEngine(translations, self.cache_size)
+            engine.compile()
+            self.translations = translations
+            self.engine = engine
+            self.payload_translator.cache.clear()
+        else:
+            # Same content re-written: track the new files, keep compiled state
+            self.translations.update(translations)
+        return changed
+
+    def _maybe_reload(self):
+        if self.reload_interval and time.monotonic() - self._last_reload_check >= self.reload_interval:
+            self.reload_if_changed()
+
     def translate(self, text: str, target_lang: str, 
                  source_lang: str = "en") -> str:
         """Translate text to target language"""
@@ -36,60 +106,36 @@ class Translator:
             
         if target_lang == source_lang:
             return text
+
+        self._maybe_reload()
             
-        # Simple word-for-word translation
-        # In a real implementation, this would use a proper translation API
-        translation = self.translations[target_lang].get(text, text)
-        return translation
+        # Exact catalog hits first, then longest-phrase segmentation
+        return self.engine.translate(text, target_lang)
+
+    @timed("translation")
+    def translate_payload(self, payload, schema: PayloadSchema, target_lang: str):
+        """Translate the schema's paths of a payload to target language"""
+        if target_lang not in self.supported_languages:
+            raise ValueError(f"Unsupported language: {target_lang}")
+        if target_lang == "en":
+            return payload
+        self._maybe_reload()
+        return self.payload_translator.translate(payload, schema, target_lang)
 
     def translate_disease_info(self, disease_info: Dict, 
                              target_lang: str) -> Dict:
         """Translate disease information to target language"""
-        translated_info = {}
-        for key, value in disease_info.items():
-            if isinstance(value, str):
-                translated_info[key] = self.translate(value, target_lang)
-            else:
-                translated_info[key] = value
-        return translated_info
+        return self.translate_payload(disease_info, DISEASE_INFO_SCHEMA, target_lang)
 
     def translate_weather_forecast(self, forecast: Dict, 
                                  target_lang: str) -> Dict:
         """Translate weather forecast to target language"""
-        translated_forecast = forecast.copy()
-        
-        # Translate weather descriptions and units
-        if "description" in forecast:
-            translated_forecast["description"] = self.translate(
-                forecast["description"], target_lang
-            )
-            
-        # Translate units
-        if "unit" in forecast:
-            translated_forecast["unit"] = self.translate(
-                forecast["unit"], target_lang
-            )
-            
-        return translated_forecast
+        return self.translate_payload(forecast, WEATHER_FORECAST_SCHEMA, target_lang)
 
     def translate_market_insights(self, insights: Dict, 
                                 target_lang: str) -> Dict:
         """Translate market insights to target language"""
-        translated_insights = insights.copy()
-        
-        # Translate recommendations and descriptions
-        if "recommendation" in insights:
-            translated_insights["recommendation"] = self.translate(
-                insights["recommendation"], target_lang
-            )
-            
-        # Translate price trend description
-        if "trend" in insights:
-            translated_insights["trend"] = self.translate(
-                insights["trend"], target_lang
-            )
-            
-        return translated_insights
+        return self.translate_payload(insights, MARKET_INSIGHTS_SCHEMA, target_lang)
 
 class TranslatorFactory:
     @staticmethod
@@ -98,4 +144,7 @@ class TranslatorFactory:
             "TRANSLATIONS_PATH", 
             "./app/translations"
         )
-        return Translator(translations_path) 
\ No newline at end of file
+        cache_size = int(os.getenv("TRANSLATION_CACHE_SIZE", "4096"))
+        payload_cache_size = int(os.getenv("TRANSLATION_PAYLOAD_CACHE_SIZE", "1024"))
+        reload_interval = float(os.getenv("TRANSLATION_RELOAD_INTERVAL_SECONDS", "30"))
+        return Translator(translations_path, cache_size, payload_cache_size, reload_interval) 
\ No newline at end of file
@@ -0,0 +1,52 @@
+"""Preload-and-fork serving: gunicorn -c gunicorn.conf.py
+
+The master builds the app once, which loads the disease classifier,
+weather model and market data, then forks the workers. The workers start
+out sharing all of those pages with the master and each other; a page is
+only copied when a worker writes to it.
+
+CPython writes to an object whenever the cyclic garbage collector visits
+it, so the collector is kept off while the app loads and everything loaded
+is then frozen into a generation it never scans. Reference count updates
+still dirty the pages of objects the workers touch, but large buffers such
+as model weights and DataFrame columns live outside the objects and stay
+shared.
+"""
+import gc
+import logging
+import os
+
+from app.utils.memory import memory_usage
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1)))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+wsgi_app = "app.main:create_app()"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+
+logger = logging.getLogger("gunicorn.error")
+
+# Off until the workers fork, so loading the app cannot trigger collections
+gc.disable()
+
+def when_ready(server):
+    # The app is preloaded by now: collect once, then freeze what is left
+    gc.collect()
+    gc.freeze()
+    usage = memory_usage()
+    logger.info("Master %s preloaded the app: %.1f MiB resident, %d objects frozen",
+                usage["pid"], usage.get("rss", 0) / 2 ** 20, gc.get_freeze_count())
+
+def post_fork(server, worker):
+    gc.enable()
+    # Never share database connections opened in the master with the workers
+    from app.config.database import async_engine, engine
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
+
+def worker_exit(server, worker):
+    usage = memory_usage()
+    if usage["available"]:
+        logger.info("Worker %s exiting: %.1f MiB unique, %.1f MiB shared",
+                    usage["pid"], usage["unique"] / 2 ** 20, usage["shared"] / 2 ** 20)
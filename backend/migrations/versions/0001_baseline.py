@@ -0,0 +1,184 @@
+"""Baseline schema
+
+Creates every table that existed before migrations were introduced. The
+users table carries the columns of both user models (reference profile
+and account), which map the same rows.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+user_type = sa.Enum("FARMER", "EXTENSION_OFFICER", "RESEARCHER", "POLICYMAKER", name="usertype")
+language = sa.Enum("ENGLISH", "LUGANDA", "RUNYANKOLE", "ACHOLI", name="language")
+message_status = sa.Enum("PENDING", "SENDING", "SENT", "DEAD", name="messagestatus")
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("username", sa.String()),
+        sa.Column("email", sa.String()),
+        sa.Column("hashed_password", sa.String()),
+        sa.Column("full_name", sa.String()),
+        sa.Column("language_preference", sa.String()),
+        sa.Column("user_type", user_type),
+        sa.Column("language", language),
+        sa.Column("region", sa.String()),
+        sa.Column("phone_number", sa.String()),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    op.create_index("ix_users_region", "users", ["region"])
+
+    op.create_table(
+        "crops",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String()),
+        sa.Column("scientific_name", sa.String()),
+        sa.Column("description", sa.String()),
+        sa.Column("optimal_conditions", sa.String()),
+        sa.Column("common_diseases", sa.String()),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_crops_id", "crops", ["id"])
+    op.create_index("ix_crops_name", "crops", ["name"], unique=True)
+
+    op.create_table(
+        "diseases",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String()),
+        sa.Column("crop_id", sa.Integer(), sa.ForeignKey("crops.id")),
+        sa.Column("description", sa.String()),
+        sa.Column("symptoms", sa.String()),
+        sa.Column("treatment", sa.String()),
+        sa.Column("prevention", sa.String()),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_diseases_id", "diseases", ["id"])
+    op.create_index("ix_diseases_name", "diseases", ["name"])
+
+    op.create_table(
+        "market_prices",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("crop_id", sa.Integer(), sa.ForeignKey("crops.id")),
+        sa.Column("region", sa.String()),
+        sa.Column("price", sa.Float()),
+        sa.Column("unit", sa.String()),
+        sa.Column("date", sa.DateTime()),
+        sa.Column("source", sa.String()),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_market_prices_id", "market_prices", ["id"])
+
+    op.create_table(
+        "weather_data",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("region", sa.String()),
+        sa.Column("temperature", sa.Float()),
+        sa.Column("humidity", sa.Float()),
+        sa.Column("rainfall", sa.Float()),
+        sa.Column("wind_speed", sa.Float()),
+        sa.Column("date", sa.DateTime()),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_weather_data_id", "weather_data", ["id"])
+    op.create_index("ix_weather_data_region", "weather_data", ["region"])
+
+    op.create_table(
+        "planting_calendars",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("crop_id", sa.Integer(), sa.ForeignKey("crops.id")),
+        sa.Column("region", sa.String()),
+        sa.Column("planting_start", sa.DateTime()),
+        sa.Column("planting_end", sa.DateTime()),
+        sa.Column("harvesting_start", sa.DateTime()),
+        sa.Column("harvesting_end", sa.DateTime()),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_planting_calendars_id", "planting_calendars", ["id"])
+
+    op.create_table(
+        "outbound_messages",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("idempotency_key", sa.String(), nullable=True),
+        sa.Column("phone_number", sa.String(), nullable=False),
+        sa.Column("message", sa.String(), nullable=False),
+        sa.Column("status", message_status, nullable=False),
+        sa.Column("send_at", sa.DateTime(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("max_attempts", sa.Integer(), nullable=False),
+        sa.Column("last_error", sa.String()),
+        sa.Column("provider_message_id", sa.String()),
+        sa.Column("locked_by", sa.String()),
+        sa.Column("locked_until", sa.DateTime()),
+        sa.Column("sent_at", sa.DateTime()),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+    op.create_index("ix_outbound_messages_id", "outbound_messages", ["id"])
+    op.create_index("ix_outbound_messages_idempotency_key", "outbound_messages",
+                    ["idempotency_key"], unique=True)
+    op.create_index("ix_outbound_messages_status_send_at", "outbound_messages",
+                    ["status", "send_at"])
+
+    op.create_table(
+        "alert_deliveries",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("alert_key", sa.String(), nullable=False),
+        sa.Column("phone_number", sa.String(), nullable=False),
+        sa.Column("delivered_at", sa.DateTime()),
+        sa.UniqueConstraint("alert_key", "phone_number", name="uq_alert_deliveries_alert_phone"),
+    )
+    op.create_index("ix_alert_deliveries_id", "alert_deliveries", ["id"])
+
+    op.create_table(
+        "farms",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+        sa.Column("name", sa.String()),
+        sa.Column("location", sa.String()),
+        sa.Column("size_hectares", sa.Float()),
+        sa.Column("main_crops", sa.String()),
+        sa.Column("soil_type", sa.String()),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+    op.create_index("ix_farms_id", "farms", ["id"])
+    op.create_index("ix_farms_user_id", "farms", ["user_id"])
+
+    op.create_table(
+        "user_crops",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("variety", sa.String(), nullable=False),
+        sa.Column("planting_date", sa.DateTime(), nullable=False),
+        sa.Column("expected_harvest_date", sa.DateTime(), nullable=False),
+        sa.Column("field_location", sa.String(), nullable=False),
+        sa.Column("area_size", sa.Float(), nullable=False),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+    op.create_index("ix_user_crops_id", "user_crops", ["id"])
+    op.create_index("ix_user_crops_user_id_id", "user_crops", ["user_id", "id"])
+
+def downgrade():
+    for table in ("user_crops", "farms", "alert_deliveries", "outbound_messages",
+                  "planting_calendars", "weather_data", "market_prices", "diseases",
+                  "crops", "users"):
+        op.drop_table(table)
+    bind = op.get_bind()
+    for enum in (message_status, language, user_type):
+        enum.drop(bind, checkfirst=True)
@@ -0,0 +1,49 @@
+"""Normalized farm_crops table, backfilled from farms.main_crops
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+def _crop_names(main_crops):
+    names = (crop.strip().lower() for crop in (main_crops or "").split(","))
+    return list(dict.fromkeys(name for name in names if name))
+
+def upgrade():
+    farm_crops = op.create_table(
+        "farm_crops",
+        sa.Column("farm_id", sa.Integer(), sa.ForeignKey("farms.id", ondelete="CASCADE"),
+                  primary_key=True),
+        sa.Column("crop_name", sa.String(), primary_key=True),
+    )
+    op.create_index("ix_farm_crops_crop_name_farm_id", "farm_crops", ["crop_name", "farm_id"])
+
+    if op.get_context().as_sql:
+        # Offline SQL generation cannot read rows; run
+        # scripts/backfill_farm_crops.py after applying the emitted SQL
+        return
+
+    bind = op.get_bind()
+    farms = sa.table("farms", sa.column("id", sa.Integer), sa.column("main_crops", sa.String))
+    rows = bind.execute(sa.select(farms.c.id, farms.c.main_crops).where(farms.c.main_crops.isnot(None)))
+    pending = []
+    for farm_id, main_crops in rows.fetchall():
+        pending.extend({"farm_id": farm_id, "crop_name": name} for name in _crop_names(main_crops))
+        if len(pending) >= BATCH_SIZE:
+            op.bulk_insert(farm_crops, pending)
+            pending = []
+    if pending:
+        op.bulk_insert(farm_crops, pending)
+
+def downgrade():
+    op.drop_index("ix_farm_crops_crop_name_farm_id", table_name="farm_crops")
+    op.drop_table("farm_crops")
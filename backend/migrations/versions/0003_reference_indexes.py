@@ -0,0 +1,30 @@
+"""Composite indexes for the reference-data access patterns
+
+Market prices are filtered by crop and region and then ranged or sorted by
+date; calendars are read per crop and region; diseases per crop by name.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_market_prices_crop_id_region_date", "market_prices", ["crop_id", "region", "date"]),
+    ("ix_market_prices_region_date", "market_prices", ["region", "date"]),
+    ("ix_planting_calendars_crop_id_region", "planting_calendars", ["crop_id", "region"]),
+    ("ix_diseases_crop_id_name", "diseases", ["crop_id", "name"]),
+]
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
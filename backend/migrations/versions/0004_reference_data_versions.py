@@ -0,0 +1,74 @@
+"""Version counter for the cached reference tables
+
+Triggers bump reference_data_versions.version whenever crops, diseases or
+planting_calendars change, so every API process can tell with a one-row
+query that its in-memory reference snapshot is stale.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+VERSION_NAME = "reference"
+TABLES = ("crops", "diseases", "planting_calendars")
+EVENTS = ("INSERT", "UPDATE", "DELETE")
+
+def upgrade():
+    versions = op.create_table(
+        "reference_data_versions",
+        sa.Column("name", sa.String(), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+    op.bulk_insert(versions, [{"name": VERSION_NAME, "version": 1}])
+
+    dialect = op.get_context().dialect.name
+    if dialect == "postgresql":
+        op.execute(f"""
+            CREATE FUNCTION bump_reference_data_version() RETURNS trigger AS $$
+            BEGIN
+                UPDATE reference_data_versions
+                SET version = version + 1, updated_at = now()
+                WHERE name = '{VERSION_NAME}';
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+        for table in TABLES:
+            op.execute(f"""
+                CREATE TRIGGER {table}_bump_reference_version
+                AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+                FOR EACH STATEMENT EXECUTE FUNCTION bump_reference_data_version()
+            """)
+    elif dialect == "sqlite":
+        for table in TABLES:
+            for event in EVENTS:
+                op.execute(f"""
+                    CREATE TRIGGER {table}_{event.lower()}_bump_reference_version
+                    AFTER {event} ON {table}
+                    BEGIN
+                        UPDATE reference_data_versions
+                        SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+                        WHERE name = '{VERSION_NAME}';
+                    END
+                """)
+    # Other databases: writers call ReferenceDataCache.bump_version()
+
+def downgrade():
+    dialect = op.get_context().dialect.name
+    if dialect == "postgresql":
+        for table in TABLES:
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_bump_reference_version ON {table}")
+        op.execute("DROP FUNCTION IF EXISTS bump_reference_data_version()")
+    elif dialect == "sqlite":
+        for table in TABLES:
+            for event in EVENTS:
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_{event.lower()}_bump_reference_version")
+    op.drop_table("reference_data_versions")
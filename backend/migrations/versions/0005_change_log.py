@@ -0,0 +1,100 @@
+"""Change log for delta sync of offline clients
+
+Row-level triggers append one entry per insert, update or delete of the
+synced tables, so every writer (ORM, bulk statements, scripts) is covered.
+Existing rows are backfilled as upserts, so a client without a token
+downloads everything through the same path.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+# Synced tables; user_crops rows belong to a user, the rest are shared
+TABLES = ("user_crops", "crops", "diseases", "planting_calendars", "market_prices", "weather_data")
+USER_TABLES = ("user_crops",)
+EVENTS = ("INSERT", "UPDATE", "DELETE")
+
+def upgrade():
+    op.create_table(
+        "change_log",
+        sa.Column("seq", sa.BigInteger().with_variant(sa.Integer(), "sqlite"),
+                  primary_key=True, autoincrement=True),
+        sa.Column("table_name", sa.String(), nullable=False),
+        sa.Column("row_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer()),
+        sa.Column("operation", sa.String(), nullable=False),
+        sa.Column("changed_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_change_log_changed_at", "change_log", ["changed_at"])
+
+    dialect = op.get_context().dialect.name
+    now = "(now() AT TIME ZONE 'utc')" if dialect == "postgresql" else "CURRENT_TIMESTAMP"
+    for table in TABLES:
+        user_id = "user_id" if table in USER_TABLES else "NULL"
+        op.execute(f"""
+            INSERT INTO change_log (table_name, row_id, user_id, operation, changed_at)
+            SELECT '{table}', id, {user_id}, 'upsert', {now} FROM {table} ORDER BY id
+        """)
+
+    if dialect == "postgresql":
+        op.execute("""
+            CREATE FUNCTION log_row_change() RETURNS trigger AS $$
+            DECLARE
+                changed jsonb;
+            BEGIN
+                IF TG_OP = 'DELETE' THEN
+                    changed := to_jsonb(OLD);
+                ELSE
+                    changed := to_jsonb(NEW);
+                END IF;
+                -- user_id is NULL for tables without that column
+                INSERT INTO change_log (table_name, row_id, user_id, operation, changed_at)
+                VALUES (TG_TABLE_NAME, (changed->>'id')::integer, (changed->>'user_id')::integer,
+                        CASE WHEN TG_OP = 'DELETE' THEN 'delete' ELSE 'upsert' END,
+                        now() AT TIME ZONE 'utc');
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+        for table in TABLES:
+            op.execute(f"""
+                CREATE TRIGGER {table}_log_change
+                AFTER INSERT OR UPDATE OR DELETE ON {table}
+                FOR EACH ROW EXECUTE FUNCTION log_row_change()
+            """)
+    elif dialect == "sqlite":
+        for table in TABLES:
+            for event in EVENTS:
+                row = "OLD" if event == "DELETE" else "NEW"
+                user_id = f"{row}.user_id" if table in USER_TABLES else "NULL"
+                operation = "delete" if event == "DELETE" else "upsert"
+                op.execute(f"""
+                    CREATE TRIGGER {table}_{event.lower()}_log_change
+                    AFTER {event} ON {table}
+                    BEGIN
+                        INSERT INTO change_log (table_name, row_id, user_id, operation, changed_at)
+                        VALUES ('{table}', {row}.id, {user_id}, '{operation}', CURRENT_TIMESTAMP);
+                    END
+                """)
+    # Other databases have no triggers: delta sync sees only the backfill
+
+def downgrade():
+    dialect = op.get_context().dialect.name
+    if dialect == "postgresql":
+        for table in TABLES:
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_log_change ON {table}")
+        op.execute("DROP FUNCTION IF EXISTS log_row_change()")
+    elif dialect == "sqlite":
+        for table in TABLES:
+            for event in EVENTS:
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_{event.lower()}_log_change")
+    op.drop_index("ix_change_log_changed_at", table_name="change_log")
+    op.drop_table("change_log")
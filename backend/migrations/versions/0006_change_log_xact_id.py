@@ -0,0 +1,64 @@
+"""Order the change log by writing transaction for delta sync
+
+Sequence numbers are assigned at insert, not at commit, so on Postgres a
+long transaction can commit a lower seq after a shorter one committed a
+higher seq. Each entry now records the id of the transaction that wrote
+it; sync only serves entries of transactions older than every one still
+running, which can no longer gain entries, in (xact_id, seq) order.
+SQLite serializes writers, so its entries keep xact_id 0 and seq order.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+"""
+from typing import Optional
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+def log_row_change(changed_at: str, xact_id: Optional[str] = None) -> str:
+    """Trigger function of migration 0005, optionally also recording the transaction"""
+    columns = "table_name, row_id, user_id, operation, changed_at"
+    values = changed_at
+    if xact_id:
+        columns += ", xact_id"
+        values += f", {xact_id}"
+    return f"""
+        CREATE OR REPLACE FUNCTION log_row_change() RETURNS trigger AS $$
+        DECLARE
+            changed jsonb;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                changed := to_jsonb(OLD);
+            ELSE
+                changed := to_jsonb(NEW);
+            END IF;
+            -- user_id is NULL for tables without that column
+            INSERT INTO change_log ({columns})
+            VALUES (TG_TABLE_NAME, (changed->>'id')::integer, (changed->>'user_id')::integer,
+                    CASE WHEN TG_OP = 'DELETE' THEN 'delete' ELSE 'upsert' END,
+                    {values});
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """
+
+def upgrade():
+    # Entries written so far keep their seq order, ahead of all new ones
+    op.add_column("change_log", sa.Column("xact_id", sa.BigInteger(), nullable=False, server_default="0"))
+    op.create_index("ix_change_log_xact_id_seq", "change_log", ["xact_id", "seq"])
+    if op.get_context().dialect.name == "postgresql":
+        # clock_timestamp(): the time of the change, not of its transaction's start
+        op.execute(log_row_change("clock_timestamp() AT TIME ZONE 'utc'",
+                                  "pg_current_xact_id()::text::bigint"))
+
+def downgrade():
+    if op.get_context().dialect.name == "postgresql":
+        op.execute(log_row_change("now() AT TIME ZONE 'utc'"))
+    op.drop_index("ix_change_log_xact_id_seq", table_name="change_log")
+    op.drop_column("change_log", "xact_id")
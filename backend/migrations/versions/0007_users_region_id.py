@@ -0,0 +1,21 @@
+"""Index for paging through a region's users by id
+
+Alert broadcasts read recipients in keyset pages (region = ? AND id > ?
+ORDER BY id LIMIT n); with this index each page is a single range scan.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_index("ix_users_region_id", "users", ["region", "id"])
+
+def downgrade():
+    op.drop_index("ix_users_region_id", table_name="users")
@@ -0,0 +1,8 @@
+import os
+import tempfile
+
+# The database engines are created at import time from these settings, so
+# they are set before any test imports the app
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db")
+for name in ("REDIS_URL", "SECRET_KEY", "WEATHER_API_KEY", "SMS_API_KEY", "SMS_SENDER_ID"):
+    os.environ.setdefault(name, "test")
@@ -0,0 +1,66 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event, insert
+
+from app.config.database import AsyncSessionLocal, Base, SessionLocal, async_engine, engine
+from app.models.farm import Farm, FarmCrop, FarmResponse
+from app.models.user import User
+from app.services.farm_service import FarmService
+
+FARMS = 50
+CROPS = ["maize", "beans", "cassava", "coffee"]
+
+@pytest.fixture(scope="module", autouse=True)
+def farms():
+    Base.metadata.create_all(engine)
+    now = datetime.utcnow()
+    with SessionLocal() as db:
+        db.execute(insert(User), [{"username": "farmer", "email": "farmer@example.com"}])
+        db.execute(insert(Farm), [
+            {"user_id": 1, "name": f"Farm {i}", "location": "Eastern", "size_hectares": 2.0,
+             "created_at": now, "updated_at": now}
+            for i in range(FARMS)
+        ])
+        db.execute(insert(FarmCrop), [
+            {"farm_id": farm_id, "crop_name": CROPS[(farm_id + n) % len(CROPS)]}
+            for farm_id in range(1, FARMS + 1)
+            for n in range(2)
+        ])
+        db.commit()
+    yield
+    Base.metadata.drop_all(engine)
+
+def list_farms(crop=None):
+    """Run a farm listing, returning the serialized farms and the statements issued"""
+    statements = []
+
+    def record(conn, cursor, statement, *_):
+        statements.append(statement)
+
+    async def run():
+        async with AsyncSessionLocal() as db:
+            farms = await FarmService(db).get_farms_by_user(1, crop)
+            # Serializing must not lazy-load anything further
+            return [FarmResponse.model_validate(farm) for farm in farms]
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        farms = asyncio.run(run())
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+        asyncio.run(async_engine.dispose())
+    return farms, statements
+
+def test_listing_issues_at_most_two_statements():
+    farms, statements = list_farms()
+    assert len(farms) == FARMS
+    assert all(farm.main_crops for farm in farms)
+    assert len(statements) <= 2
+
+def test_crop_filtered_listing_issues_at_most_two_statements():
+    farms, statements = list_farms("Cassava")
+    assert farms
+    assert all("cassava" in farm.main_crops for farm in farms)
+    assert len(statements) <= 2
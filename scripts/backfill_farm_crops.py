@@ -0,0 +1,58 @@
+"""Populate farm_crops from the legacy comma-separated farms.main_crops column.
+
+Migration 0002 runs the same backfill on upgrade; this script is for
+databases migrated with offline SQL. Idempotent: pairs already present are
+skipped, so it can be re-run safely.
+"""
+import os
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, insert, select
+
+# Make the backend package importable
+sys.path.append(str(Path(__file__).parent.parent / "backend"))
+
+# Load environment variables
+load_dotenv()
+
+from app.models import crop_db  # noqa: F401  (registers CropDB for User.crops)
+from app.models.farm import Farm, FarmCrop, normalize_crop_names
+
+BATCH_SIZE = 1000
+
+def backfill(connection) -> int:
+    """Insert missing (farm_id, crop_name) rows; returns how many were added"""
+    FarmCrop.__table__.create(connection, checkfirst=True)
+    existing = set(connection.execute(select(FarmCrop.farm_id, FarmCrop.crop_name)).all())
+    pending = []
+    added = 0
+    rows = connection.execution_options(stream_results=True, yield_per=BATCH_SIZE).execute(
+        select(Farm.id, Farm.main_crops).where(Farm.main_crops.isnot(None))
+    )
+    for farm_id, main_crops in rows:
+        for name in normalize_crop_names(main_crops):
+            if (farm_id, name) not in existing:
+                pending.append({"farm_id": farm_id, "crop_name": name})
+        if len(pending) >= BATCH_SIZE:
+            connection.execute(insert(FarmCrop), pending)
+            added += len(pending)
+            pending = []
+    if pending:
+        connection.execute(insert(FarmCrop), pending)
+        added += len(pending)
+    return added
+
+def main():
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        print("Error: DATABASE_URL environment variable not set")
+        sys.exit(1)
+    engine = create_engine(database_url)
+    with engine.begin() as connection:
+        added = backfill(connection)
+    print(f"Added {added} farm_crops rows")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Compare event-loop responsiveness with blocking vs async DB sessions.
+
+    python scripts/benchmark_db_concurrency.py --concurrency 50 --requests 2000
+
+Runs the same crop listing query from many concurrent request handlers,
+once through the synchronous Session (as `async def` handlers used to) and
+once through the async engine, while a probe task measures how late the
+event loop wakes it up.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Make the backend package importable
+sys.path.append(str(Path(__file__).parent.parent / "backend"))
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark event-loop lag under database load")
+    parser.add_argument("--database-url", help="Sync SQLAlchemy URL (defaults to a temporary SQLite file)")
+    parser.add_argument("--users", type=int, default=200, help="Users to seed")
+    parser.add_argument("--crops-per-user", type=int, default=50, help="Crops seeded per user")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent request handlers")
+    parser.add_argument("--requests", type=int, default=2000, help="Total requests per mode")
+    parser.add_argument("--probe-interval", type=float, default=0.005, help="Seconds between loop probes")
+    return parser.parse_args()
+
+args = parse_args()
+os.environ["DATABASE_URL"] = args.database_url or "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+# Settings the database module does not use but the settings model requires
+for name in ("REDIS_URL", "SECRET_KEY", "WEATHER_API_KEY", "SMS_API_KEY", "SMS_SENDER_ID"):
+    os.environ.setdefault(name, "benchmark")
+
+from sqlalchemy import insert, select
+
+from app.config.database import AsyncSessionLocal, Base, SessionLocal, async_engine, engine
+from app.models.crop_db import CropDB
+from app.models.user import User
+
+def seed():
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    now = datetime.utcnow()
+    with SessionLocal() as db:
+        db.execute(insert(User), [
+            {"username": f"farmer{i}", "email": f"farmer{i}@example.com", "created_at": now}
+            for i in range(args.users)
+        ])
+        db.execute(insert(CropDB), [
+            {
+                "user_id": user_id, "name": "maize", "variety": f"v{n}",
+                "planting_date": now, "expected_harvest_date": now + timedelta(days=120),
+                "field_location": "plot", "area_size": 1.5
+            }
+            for user_id in range(1, args.users + 1)
+            for n in range(args.crops_per_user)
+        ])
+        db.commit()
+
+def crops_query(user_id: int):
+    return select(CropDB).where(CropDB.user_id == user_id).order_by(CropDB.id)
+
+async def blocking_handler(user_id: int):
+    # What CropService did before: a sync Session inside a coroutine
+    with SessionLocal() as db:
+        return list(db.scalars(crops_query(user_id)))
+
+async def async_handler(user_id: int):
+    async with AsyncSessionLocal() as db:
+        return list(await db.scalars(crops_query(user_id)))
+
+async def probe(lags, stop: asyncio.Event):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(args.probe_interval)
+        lags.append(time.perf_counter() - started - args.probe_interval)
+
+async def run(handler):
+    lags = []
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(lags, stop))
+    queue = asyncio.Queue()
+    for i in range(args.requests):
+        queue.put_nowait(i % args.users + 1)
+
+    async def worker():
+        while not queue.empty():
+            await handler(queue.get_nowait())
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe_task
+    lags.sort()
+    return {
+        "requests_per_second": args.requests / elapsed,
+        "lag_p50_ms": statistics.median(lags) * 1000 if lags else 0.0,
+        "lag_p99_ms": lags[int(len(lags) * 0.99) - 1] * 1000 if lags else 0.0,
+        "lag_max_ms": lags[-1] * 1000 if lags else 0.0,
+        "probes": len(lags)
+    }
+
+async def main():
+    seed()
+    print(f"{args.users * args.crops_per_user:,} crops, {args.concurrency} concurrent handlers, "
+          f"{args.requests:,} requests per mode")
+    print(f"{'mode':>8} {'req/s':>10} {'lag p50':>10} {'lag p99':>10} {'lag max':>10} {'probes':>8}")
+    for name, handler in (("blocking", blocking_handler), ("async", async_handler)):
+        report = await run(handler)
+        print(f"{name:>8} {report['requests_per_second']:>10.1f} {report['lag_p50_ms']:>8.2f}ms "
+              f"{report['lag_p99_ms']:>8.2f}ms {report['lag_max_ms']:>8.2f}ms {report['probes']:>8}")
+    await async_engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
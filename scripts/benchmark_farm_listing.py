@@ -0,0 +1,100 @@
+"""Count the SQL statements a farm listing page issues.
+
+    python scripts/benchmark_farm_listing.py --farms 200
+
+Seeds a temporary SQLite database, then lists one user's farms with their
+crops through FarmService (eager loading) and through plain lazy loading,
+reporting statements issued and wall time for each.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Make the backend package importable
+sys.path.append(str(Path(__file__).parent.parent / "backend"))
+
+parser = argparse.ArgumentParser(description="Count queries per farm listing")
+parser.add_argument("--farms", type=int, default=200, help="Farms seeded for the user")
+parser.add_argument("--crops-per-farm", type=int, default=4, help="Crops per farm")
+args = parser.parse_args()
+
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "farms.db")
+# Settings the database module does not use but the settings model requires
+for name in ("REDIS_URL", "SECRET_KEY", "WEATHER_API_KEY", "SMS_API_KEY", "SMS_SENDER_ID"):
+    os.environ.setdefault(name, "benchmark")
+
+from sqlalchemy import event, insert, select
+from sqlalchemy.orm import lazyload
+
+from app.config.database import AsyncSessionLocal, Base, SessionLocal, async_engine, engine
+from app.models.farm import Farm, FarmCrop, FarmResponse
+from app.models.user import User
+from app.services.farm_service import FarmService
+
+CROPS = ["maize", "beans", "cassava", "coffee", "bananas", "sorghum", "millet", "groundnuts"]
+
+def seed():
+    Base.metadata.create_all(engine)
+    now = datetime.utcnow()
+    with SessionLocal() as db:
+        db.execute(insert(User), [{"username": "farmer", "email": "farmer@example.com"}])
+        db.execute(insert(Farm), [
+            {"user_id": 1, "name": f"Farm {i}", "location": "Eastern", "size_hectares": 2.0,
+             "created_at": now, "updated_at": now}
+            for i in range(args.farms)
+        ])
+        db.execute(insert(FarmCrop), [
+            {"farm_id": farm_id, "crop_name": CROPS[(farm_id + n) % len(CROPS)]}
+            for farm_id in range(1, args.farms + 1)
+            for n in range(args.crops_per_farm)
+        ])
+        db.commit()
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *_):
+        self.count += 1
+
+def lazy_listing():
+    # The per-farm pattern: one query for farms, then one per farm for crops
+    with SessionLocal() as db:
+        farms = db.scalars(select(Farm).where(Farm.user_id == 1).options(lazyload(Farm.crops)))
+        return [FarmResponse.model_validate(farm) for farm in farms]
+
+async def eager_listing():
+    async with AsyncSessionLocal() as db:
+        farms = await FarmService(db).get_farms_by_user(1)
+        return [FarmResponse.model_validate(farm) for farm in farms]
+
+async def filtered_listing():
+    async with AsyncSessionLocal() as db:
+        farms = await FarmService(db).get_farms_by_user(1, "cassava")
+        return [FarmResponse.model_validate(farm) for farm in farms]
+
+async def main():
+    seed()
+    counter = StatementCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", counter)
+
+    print(f"{args.farms} farms x {args.crops_per_farm} crops")
+    print(f"{'listing':>16} {'farms':>6} {'queries':>8} {'ms':>8}")
+    for name, run in (("lazy", lambda: asyncio.to_thread(lazy_listing)),
+                      ("eager", eager_listing),
+                      ("eager+crop", filtered_listing)):
+        counter.count = 0
+        started = time.perf_counter()
+        farms = await run()
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"{name:>16} {len(farms):>6} {counter.count:>8} {elapsed:>8.1f}")
+    await async_engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,135 @@
+"""Measure how responsive the API stays during a burst of logins.
+
+    python scripts/benchmark_login_storm.py --clients 40 --logins 200
+
+Fires concurrent POST /token requests from many client IPs while a probe
+client keeps calling GET /users/me, once with bcrypt running inline on the
+event loop (as the login route used to) and once on the bounded password
+executor, and reports probe latency and login outcomes for each.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+# Make the backend package importable
+sys.path.append(str(Path(__file__).parent.parent / "backend"))
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark API responsiveness during a login storm")
+    parser.add_argument("--clients", type=int, default=40, help="Concurrent login clients, one IP each")
+    parser.add_argument("--logins", type=int, default=200, help="Total login attempts per mode")
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost of the seeded password")
+    parser.add_argument("--workers", type=int, default=2, help="Password executor threads")
+    parser.add_argument("--max-pending", type=int, default=64, help="Password executor queue bound")
+    parser.add_argument("--probe-interval", type=float, default=0.01, help="Seconds between probe requests")
+    return parser.parse_args()
+
+args = parse_args()
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+os.environ["PASSWORD_HASH_ROUNDS"] = str(args.rounds)
+os.environ["PASSWORD_HASH_WORKERS"] = str(args.workers)
+os.environ["PASSWORD_HASH_MAX_PENDING"] = str(args.max_pending)
+os.environ.pop("PASSWORD_HASH_TARGET_MS", None)
+os.environ["AUTH_CACHE_BACKEND"] = "memory"
+# Settings the auth module does not use but the settings model requires
+for name in ("REDIS_URL", "SECRET_KEY", "WEATHER_API_KEY", "SMS_API_KEY", "SMS_SENDER_ID"):
+    os.environ.setdefault(name, "benchmark")
+
+import httpx
+from fastapi import FastAPI
+
+from app.api import auth
+from app.config.database import Base, async_engine, engine
+from app.services.user_service import UserService
+from app.utils.security import password_hasher
+
+PASSWORD = "correct horse battery staple"
+
+app = FastAPI()
+app.include_router(auth.router, prefix="/api/v1")
+
+async def run_inline(func, *func_args):
+    # What the login route did before: bcrypt on the event loop thread
+    return func(*func_args)
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+async def run(inline: bool):
+    if inline:
+        password_hasher._run = run_inline
+    else:
+        password_hasher.__dict__.pop("_run", None)
+    transport = httpx.ASGITransport(app=app, client=("10.0.0.1", 1000))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as probe_client:
+        token = auth.create_access_token({"sub": "farmer"})
+        headers = {"Authorization": f"Bearer {token}"}
+        await probe_client.get("/api/v1/users/me", headers=headers)
+
+        latencies = []
+        stop = asyncio.Event()
+
+        async def probe():
+            while not stop.is_set():
+                # Includes the wait to be scheduled, which is where a blocked loop shows
+                started = time.perf_counter()
+                await asyncio.sleep(args.probe_interval)
+                response = await probe_client.get("/api/v1/users/me", headers=headers)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started - args.probe_interval)
+
+        outcomes = Counter()
+        queue = asyncio.Queue()
+        for _ in range(args.logins):
+            queue.put_nowait(None)
+
+        async def login_client(number: int):
+            transport = httpx.ASGITransport(app=app, client=(f"10.1.{number // 256}.{number % 256}", 1000))
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                while not queue.empty():
+                    queue.get_nowait()
+                    response = await client.post(
+                        "/api/v1/token", data={"username": "farmer", "password": PASSWORD}
+                    )
+                    outcomes[response.status_code] += 1
+
+        probe_task = asyncio.create_task(probe())
+        started = time.perf_counter()
+        await asyncio.gather(*(login_client(n) for n in range(args.clients)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await probe_task
+
+    latencies.sort()
+    return {
+        "logins_per_second": args.logins / elapsed,
+        "probe_p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "probe_p99_ms": percentile(latencies, 0.99) * 1000,
+        "probe_max_ms": latencies[-1] * 1000 if latencies else 0.0,
+        "probes": len(latencies),
+        "outcomes": dict(sorted(outcomes.items()))
+    }
+
+async def main():
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    await UserService.create_user("farmer", "farmer@example.com", PASSWORD)
+    print(f"{args.logins} logins from {args.clients} clients, bcrypt cost {args.rounds}, "
+          f"{args.workers} password workers")
+    print(f"{'mode':>8} {'logins/s':>10} {'probe p50':>10} {'probe p99':>10} {'probe max':>10} "
+          f"{'probes':>7}  outcomes")
+    for name, inline in (("inline", True), ("executor", False)):
+        report = await run(inline)
+        print(f"{name:>8} {report['logins_per_second']:>10.1f} {report['probe_p50_ms']:>8.2f}ms "
+              f"{report['probe_p99_ms']:>8.2f}ms {report['probe_max_ms']:>8.2f}ms "
+              f"{report['probes']:>7}  {report['outcomes']}")
+    await async_engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
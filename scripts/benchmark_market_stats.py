@@ -0,0 +1,89 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Make the backend package importable
+sys.path.append(str(Path(__file__).parent.parent / "backend"))
+
+from app.ml.market_stats import MarketStatsEngine
+
+def generate_prices(series: int, points: int, seed: int = 42) -> pd.DataFrame:
+    """Generate synthetic daily price history for a number of crop/region series"""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2020-01-01", periods=points, freq="D")
+    frames = []
+    for i in range(series):
+        walk = 1000 + np.cumsum(rng.normal(0, 10, points))
+        frames.append(pd.DataFrame({
+            "crop": f"crop{i % 50}",
+            "region": f"region{i // 50}",
+            "price": np.abs(walk) + 1,
+            "date": dates
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+def full_recompute(data: pd.DataFrame, windows=(7, 30), volatility_window: int = 30):
+    """Baseline: recompute every rolling statistic over the full frame"""
+    data = data.sort_values("date", kind="mergesort")
+    grouped = data.groupby(["crop", "region"])["price"]
+    result = {}
+    for size in windows:
+        result[size] = grouped.rolling(size, min_periods=1).mean().groupby(level=[0, 1]).last()
+    log_returns = np.log(data["price"]).groupby([data["crop"], data["region"]]).diff()
+    result["volatility"] = log_returns.groupby([data["crop"], data["region"]]).rolling(
+        volatility_window, min_periods=2
+    ).std().groupby(level=[0, 1]).last()
+    monthly = data.groupby(["crop", "region", data["date"].dt.month])["price"].mean()
+    result["seasonal"] = monthly / data.groupby(["crop", "region"])["price"].mean()
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark incremental vs full rolling market statistics")
+    parser.add_argument("--series", type=int, default=200, help="Number of crop/region series")
+    parser.add_argument("--points", type=int, default=1000, help="Historical prices per series")
+    parser.add_argument("--updates", type=int, default=50, help="New prices to ingest")
+    args = parser.parse_args()
+
+    data = generate_prices(args.series, args.points)
+    print(f"History: {len(data):,} rows across {args.series} series")
+
+    engine = MarketStatsEngine()
+    start = time.perf_counter()
+    engine.load(data)
+    print(f"Incremental engine bootstrap: {time.perf_counter() - start:.3f}s (one-off)")
+
+    rng = np.random.default_rng(7)
+    keys = data[["crop", "region"]].drop_duplicates().values.tolist()
+    next_date = data["date"].max() + pd.Timedelta(days=1)
+    updates = [
+        (*keys[rng.integers(len(keys))], float(rng.uniform(500, 1500)))
+        for _ in range(args.updates)
+    ]
+
+    # Incremental: O(1) update followed by a read of the affected series
+    start = time.perf_counter()
+    for crop, region, price in updates:
+        engine.update(crop, region, price, next_date)
+        engine.get(crop, region)
+    incremental = (time.perf_counter() - start) / len(updates)
+
+    # Full recompute: append the row and rerun pandas rolling() over everything
+    frame = data
+    start = time.perf_counter()
+    for crop, region, price in updates:
+        frame = pd.concat([frame, pd.DataFrame([{
+            "crop": crop, "region": region, "price": price, "date": next_date
+        }])], ignore_index=True)
+        full_recompute(frame)
+    recompute = (time.perf_counter() - start) / len(updates)
+
+    print(f"Incremental update + read: {incremental * 1e6:10.1f} us per price")
+    print(f"Full pandas recompute:     {recompute * 1e6:10.1f} us per price")
+    print(f"Speedup: {recompute / incremental:,.0f}x")
+
+if __name__ == "__main__":
+    main()
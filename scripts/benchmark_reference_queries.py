@@ -0,0 +1,171 @@
+"""Plan and latency of the hot reference-data queries before and after the
+composite indexes of migration 0003.
+
+    python scripts/benchmark_reference_queries.py --rows 2000000
+    python scripts/benchmark_reference_queries.py --database-url postgresql://... --rows 5000000
+
+Migrates a scratch database to 0002, seeds synthetic market prices,
+calendars and diseases, measures every query, upgrades to 0003 and measures
+again. Use an empty database: the schema is created from scratch.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, insert, table, column, text
+
+BACKEND_DIR = Path(__file__).parent.parent / "backend"
+sys.path.append(str(BACKEND_DIR))
+
+REGIONS = ["central", "eastern", "northern", "western"]
+BATCH_SIZE = 50000
+
+# (name, SQL) pairs mirroring the analytics access patterns
+QUERIES = [
+    ("latest price", """
+        SELECT price, unit, date FROM market_prices
+        WHERE crop_id = :crop_id AND region = :region
+        ORDER BY date DESC LIMIT 1"""),
+    ("price history 90d", """
+        SELECT date, price FROM market_prices
+        WHERE crop_id = :crop_id AND region = :region AND date >= :since
+        ORDER BY date"""),
+    ("regional averages 30d", """
+        SELECT region, AVG(price) FROM market_prices
+        WHERE crop_id = :crop_id AND date >= :recent
+        GROUP BY region"""),
+    ("region snapshot 7d", """
+        SELECT crop_id, price, date FROM market_prices
+        WHERE region = :region AND date >= :week"""),
+    ("planting calendar", """
+        SELECT planting_start, planting_end, harvesting_start, harvesting_end
+        FROM planting_calendars WHERE crop_id = :crop_id AND region = :region"""),
+    ("crop diseases", """
+        SELECT name, symptoms, treatment FROM diseases
+        WHERE crop_id = :crop_id ORDER BY name"""),
+]
+
+def alembic_config(database_url: str) -> Config:
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "migrations"))
+    config.set_main_option("sqlalchemy.url", database_url)
+    return config
+
+def seed(engine, rows: int, crops: int, seed_value: int = 7) -> datetime:
+    rng = random.Random(seed_value)
+    end = datetime(2026, 1, 1)
+    days = max(1, rows // (crops * len(REGIONS)))
+    crops_t = table("crops", column("id"), column("name"))
+    prices_t = table("market_prices", column("crop_id"), column("region"), column("price"),
+                     column("unit"), column("date"), column("source"))
+    calendars_t = table("planting_calendars", column("crop_id"), column("region"),
+                        column("planting_start"), column("planting_end"),
+                        column("harvesting_start"), column("harvesting_end"))
+    diseases_t = table("diseases", column("crop_id"), column("name"), column("symptoms"),
+                       column("treatment"))
+
+    with engine.begin() as connection:
+        connection.execute(insert(crops_t), [{"id": i, "name": f"crop{i}"} for i in range(1, crops + 1)])
+        connection.execute(insert(diseases_t), [
+            {"crop_id": crop_id, "name": f"disease{n}", "symptoms": "spots", "treatment": "spray"}
+            for crop_id in range(1, crops + 1) for n in range(25)
+        ])
+        connection.execute(insert(calendars_t), [
+            {"crop_id": crop_id, "region": region,
+             "planting_start": end.replace(month=3), "planting_end": end.replace(month=4),
+             "harvesting_start": end.replace(month=7), "harvesting_end": end.replace(month=8)}
+            for crop_id in range(1, crops + 1) for region in REGIONS for _ in range(3)
+        ])
+
+    # Interleave crops and regions per day, as daily ingestion would
+    batch = []
+    written = 0
+    started = time.perf_counter()
+    with engine.begin() as connection:
+        for day in range(days):
+            date = end - timedelta(days=days - day)
+            for crop_id in range(1, crops + 1):
+                for region in REGIONS:
+                    batch.append({"crop_id": crop_id, "region": region, "unit": "kg",
+                                  "price": rng.uniform(500, 5000), "date": date, "source": "synthetic"})
+            if len(batch) >= BATCH_SIZE:
+                connection.execute(insert(prices_t), batch)
+                written += len(batch)
+                batch = []
+                print(f"\r  seeded {written:,} market prices", end="", flush=True)
+        if batch:
+            connection.execute(insert(prices_t), batch)
+            written += len(batch)
+    print(f"\r  seeded {written:,} market prices in {time.perf_counter() - started:.1f}s")
+    return end
+
+def explain(connection, sql: str, params) -> str:
+    if connection.dialect.name == "sqlite":
+        rows = connection.execute(text("EXPLAIN QUERY PLAN " + sql), params).all()
+        return "; ".join(row[-1] for row in rows)
+    rows = connection.execute(text("EXPLAIN " + sql), params).all()
+    return " / ".join(row[0].strip() for row in rows[:3])
+
+def measure(engine, params, repeat: int):
+    report = {}
+    with engine.connect() as connection:
+        # Fresh planner statistics so the new indexes are considered
+        connection.execute(text("ANALYZE"))
+        connection.commit()
+        for name, sql in QUERIES:
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                connection.execute(text(sql), params).all()
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            report[name] = {
+                "plan": explain(connection, sql, params),
+                "p50_ms": statistics.median(timings),
+                "p95_ms": timings[max(0, int(len(timings) * 0.95) - 1)]
+            }
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark reference-data queries before and after indexing")
+    parser.add_argument("--database-url", help="Empty scratch database (defaults to a temporary SQLite file)")
+    parser.add_argument("--rows", type=int, default=2000000, help="Approximate market price rows")
+    parser.add_argument("--crops", type=int, default=40, help="Distinct crops")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per query")
+    args = parser.parse_args()
+
+    database_url = args.database_url or "sqlite:///" + os.path.join(tempfile.mkdtemp(), "reference.db")
+    config = alembic_config(database_url)
+    engine = create_engine(database_url)
+
+    print(f"Database: {engine.url.render_as_string(hide_password=True)}")
+    command.upgrade(config, "0002")
+    end = seed(engine, args.rows, args.crops)
+    params = {
+        "crop_id": args.crops // 2, "region": "eastern",
+        "since": end - timedelta(days=90), "recent": end - timedelta(days=30),
+        "week": end - timedelta(days=7)
+    }
+
+    before = measure(engine, params, args.repeat)
+    started = time.perf_counter()
+    # Only 0003: later migrations add triggers and columns that would skew "after"
+    command.upgrade(config, "0003")
+    print(f"  built composite indexes in {time.perf_counter() - started:.1f}s")
+    after = measure(engine, params, args.repeat)
+
+    for name, _ in QUERIES:
+        print(f"\n{name}")
+        for label, report in (("before", before[name]), ("after", after[name])):
+            print(f"  {label:>6}: p50 {report['p50_ms']:9.2f}ms  p95 {report['p95_ms']:9.2f}ms  {report['plan']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""Compare bytes on the wire and encode cost of response encodings per endpoint.
+
+    python scripts/benchmark_response_encoding.py --repeat 200
+
+Builds representative payloads (a weatherapi forecast passthrough, current
+weather, market insights with a price list and a page of crops), applies
+the server-side views a mobile client can ask for (compact weather,
+`fields=` selection) and encodes each as JSON or MessagePack, uncompressed,
+gzip and brotli, the same way ResponseEncodingMiddleware does.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Make the backend package importable
+sys.path.append(str(Path(__file__).parent.parent / "backend"))
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark response encodings for mobile clients")
+    parser.add_argument("--repeat", type=int, default=200, help="Encodings timed per combination")
+    parser.add_argument("--prices", type=int, default=200, help="Records in current_prices")
+    parser.add_argument("--json", action="store_true", help="Print a JSON report")
+    return parser.parse_args()
+
+args = parse_args()
+# Settings the weather views do not use but the settings model requires
+for name in ("DATABASE_URL", "REDIS_URL", "SECRET_KEY", "WEATHER_API_KEY", "SMS_API_KEY", "SMS_SENDER_ID"):
+    os.environ.setdefault(name, "benchmark")
+
+from app.services.weather_service import compact_current, compact_forecast
+from app.utils.encoding import compress, encode_msgpack, parse_fields, select_fields
+
+random.seed(7)
+
+def condition():
+    return {"text": random.choice(["Patchy rain possible", "Sunny", "Partly cloudy"]),
+            "icon": "//cdn.weatherapi.com/weather/64x64/day/176.png", "code": 1063}
+
+def hour(moment: datetime):
+    temp = round(random.uniform(16, 30), 1)
+    return {
+        "time_epoch": int(moment.timestamp()), "time": moment.strftime("%Y-%m-%d %H:%M"),
+        "temp_c": temp, "temp_f": round(temp * 9 / 5 + 32, 1), "is_day": int(6 <= moment.hour < 18),
+        "condition": condition(), "wind_mph": 5.4, "wind_kph": 8.6, "wind_degree": 120, "wind_dir": "ESE",
+        "pressure_mb": 1012.0, "pressure_in": 29.88, "precip_mm": 0.2, "precip_in": 0.01,
+        "humidity": random.randint(40, 95), "cloud": random.randint(0, 100), "feelslike_c": temp,
+        "feelslike_f": round(temp * 9 / 5 + 32, 1), "windchill_c": temp, "windchill_f": 80.1,
+        "heatindex_c": temp, "heatindex_f": 80.1, "dewpoint_c": 15.2, "dewpoint_f": 59.4,
+        "will_it_rain": 1, "chance_of_rain": random.randint(0, 100), "will_it_snow": 0,
+        "chance_of_snow": 0, "vis_km": 10.0, "vis_miles": 6.0, "gust_mph": 8.1, "gust_kph": 13.0, "uv": 5.0
+    }
+
+def forecast_payload():
+    today = datetime(2024, 3, 1)
+    days = []
+    for offset in range(7):
+        date = today + timedelta(days=offset)
+        days.append({
+            "date": date.strftime("%Y-%m-%d"), "date_epoch": int(date.timestamp()),
+            "day": {
+                "maxtemp_c": 29.1, "maxtemp_f": 84.4, "mintemp_c": 17.2, "mintemp_f": 63.0,
+                "avgtemp_c": 22.6, "avgtemp_f": 72.7, "maxwind_mph": 9.2, "maxwind_kph": 14.8,
+                "totalprecip_mm": 3.1, "totalprecip_in": 0.12, "totalsnow_cm": 0.0, "avgvis_km": 9.6,
+                "avgvis_miles": 5.0, "avghumidity": 71.0, "daily_will_it_rain": 1,
+                "daily_chance_of_rain": 86, "daily_will_it_snow": 0, "daily_chance_of_snow": 0,
+                "condition": condition(), "uv": 6.0
+            },
+            "astro": {"sunrise": "06:58 AM", "sunset": "07:06 PM", "moonrise": "10:12 PM",
+                      "moonset": "09:40 AM", "moon_phase": "Waning Gibbous", "moon_illumination": 72},
+            "hour": [hour(date + timedelta(hours=h)) for h in range(24)]
+        })
+    return days
+
+def current_payload():
+    current = hour(datetime(2024, 3, 1, 12))
+    current.update({"last_updated": "2024-03-01 12:00", "last_updated_epoch": 1709283600,
+                    "air_quality": {"co": 317.1, "no2": 4.2, "o3": 52.9, "so2": 1.1, "pm2_5": 11.3,
+                                    "pm10": 14.7, "us-epa-index": 1, "gb-defra-index": 1}})
+    return {
+        "location": {"name": "Kampala", "region": "Kampala", "country": "Uganda", "lat": 0.32,
+                     "lon": 32.58, "tz_id": "Africa/Kampala", "localtime_epoch": 1709283600,
+                     "localtime": "2024-03-01 12:00"},
+        "current": current
+    }
+
+def market_payload():
+    start = datetime(2023, 9, 1)
+    return {
+        "status": "success",
+        "insights": {
+            "crop": "maize", "region": "Central",
+            "current_prices": [
+                {"crop": "maize", "region": "Central", "price": round(random.uniform(800, 1400), 2),
+                 "date": (start + timedelta(days=n)).isoformat(), "unit": "UGX/kg",
+                 "market": "Owino", "source": "farmgain"}
+                for n in range(args.prices)
+            ],
+            "price_trend": {"crop": "maize", "region": "Central", "current_price": 1120.5,
+                            "predicted_prices": [round(1120.5 + n * 3.7, 2) for n in range(30)],
+                            "trend": "increasing", "confidence": 0.8},
+            "recommendation": "Consider holding onto your produce as prices are expected to rise",
+            "last_updated": "2024-03-01T12:00:00"
+        }
+    }
+
+def crops_payload():
+    return [
+        {"id": n, "user_id": 7, "name": random.choice(["maize", "beans", "cassava"]),
+         "variety": f"variety {n % 9}", "planting_date": "2024-02-01T00:00:00",
+         "expected_harvest_date": "2024-06-01T00:00:00", "field_location": "Plot behind the house",
+         "area_size": 1.5, "description": "Intercropped with beans along the contour lines",
+         "created_at": "2024-02-01T08:15:00", "updated_at": "2024-02-03T17:45:00"}
+        for n in range(50)
+    ]
+
+def endpoint_views():
+    forecast = forecast_payload()
+    current = current_payload()
+    market = market_payload()
+    crops = crops_payload()
+    return [
+        ("GET /weather/forecast/{location}", "full", forecast),
+        ("GET /weather/forecast/{location}", "compact=true", compact_forecast(forecast)),
+        ("GET /weather/current/{location}", "full", current),
+        ("GET /weather/current/{location}", "compact=true", compact_current(current)),
+        ("GET /market-prices", "full", market),
+        ("GET /market-prices", "fields=insights.current_prices.price,insights.current_prices.date,"
+         "insights.price_trend.trend", None),
+        ("GET /crops", "full", crops),
+        ("GET /crops", "fields=id,name,variety,expected_harvest_date", None)
+    ], {"GET /market-prices": market, "GET /crops": crops}
+
+def encode_json(content) -> bytes:
+    # Same settings as Starlette's JSONResponse
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None,
+                      separators=(",", ":")).encode("utf-8")
+
+FORMATS = {"json": encode_json, "msgpack": encode_msgpack}
+CODINGS = ("identity", "gzip", "br")
+
+def measure(content):
+    results = []
+    for format_name, encode in FORMATS.items():
+        for coding in CODINGS:
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                body = encode(content)
+                if coding != "identity":
+                    body = compress(body, coding)
+                timings.append(time.perf_counter() - started)
+            results.append({"format": format_name, "coding": coding, "bytes": len(body),
+                            "encode_us": statistics.median(timings) * 1e6})
+    return results
+
+def main():
+    views, sources = endpoint_views()
+    report = []
+    for endpoint, view, content in views:
+        if content is None:
+            content = select_fields(sources[endpoint], parse_fields(view.split("=", 1)[1]))
+        report.append({"endpoint": endpoint, "view": view, "encodings": measure(content)})
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    baselines = {}
+    for entry in report:
+        # Relative to the full JSON response of the endpoint, uncompressed
+        baseline = baselines.setdefault(entry["endpoint"], entry["encodings"][0]["bytes"])
+        view = entry["view"] if len(entry["view"]) <= 40 else entry["view"][:37] + "..."
+        print(f"\n{entry['endpoint']}  [{view}]")
+        print(f"{'format':>8} {'coding':>9} {'bytes':>9} {'vs full':>8} {'encode':>10}")
+        for result in entry["encodings"]:
+            print(f"{result['format']:>8} {result['coding']:>9} {result['bytes']:>9,} "
+                  f"{result['bytes'] / baseline:>7.1%} {result['encode_us']:>8.0f}us")
+
+if __name__ == "__main__":
+    main()
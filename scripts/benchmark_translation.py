@@ -0,0 +1,89 @@
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Make the backend package importable
+sys.path.append(str(Path(__file__).parent.parent / "backend"))
+
+from app.utils.translation_engine import TOKEN_RE, TranslationEngine
+
+# Phrases the API actually emits, with made-up target strings
+CATALOG = {
+    "Consider holding onto your produce as prices are expected to rise": "Kuuma ebirime byo kubanga emiwendo gyakulinnya",
+    "Consider selling now as prices are expected to decrease": "Tunda kati kubanga emiwendo gyakukka",
+    "increasing": "gyeyongera",
+    "decreasing": "gikendeera",
+    "{price} UGX": "UGX {price}",
+    "per {unit}": "buli {unit}",
+    "Apply fungicides containing mancozeb or chlorothalonil": "Fuuyira eddagala eririmu mancozeb oba chlorothalonil",
+    "Remove and destroy infected plants": "Ggyawo era oyokye ebimera ebirwadde",
+    "Crop rotation": "Okukyusa ebirime",
+    "resistant varieties": "ebika ebigumira endwadde",
+    "heavy rain": "enkuba ey'amaanyi",
+    "Weather alert": "Okulabula ku budde",
+    "maize": "kasooli",
+    "beans": "ebijanjaalo",
+    "coffee": "emmwanyi",
+    "cassava": "muwogo",
+}
+
+FILLER = ("the farmers in the region should plan ahead for the season and check "
+          "market prices before selling their harvest").split()
+
+def build_catalog(extra_phrases: int, seed: int = 1):
+    """Realistic catalog padded with synthetic multi-word agronomy phrases"""
+    rng = random.Random(seed)
+    catalog = dict(CATALOG)
+    vocabulary = [f"term{i}" for i in range(2000)]
+    for i in range(extra_phrases):
+        length = rng.randint(1, 6)
+        catalog[" ".join(rng.choice(vocabulary) for _ in range(length))] = f"phrase{i}"
+    return catalog
+
+def build_payload(tokens: int, seed: int = 2) -> str:
+    """Mix catalog phrases, prices and untranslatable filler up to a token count"""
+    rng = random.Random(seed)
+    pieces = []
+    count = 0
+    sources = list(CATALOG) + [" ".join(rng.sample(FILLER, 4)) for _ in range(20)]
+    while count < tokens:
+        piece = rng.choice(sources).replace("{price}", f"{rng.randint(500, 5000):,}").replace("{unit}", "kg")
+        pieces.append(piece)
+        count += len(TOKEN_RE.findall(piece))
+    return ". ".join(pieces)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark phrase translation cost against input length")
+    parser.add_argument("--catalog-size", type=int, default=20000, help="Synthetic phrases added to the catalog")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per payload size")
+    args = parser.parse_args()
+
+    catalog = build_catalog(args.catalog_size)
+    start = time.perf_counter()
+    # Cache disabled so every run pays the full segmentation cost
+    engine = TranslationEngine({"lg": catalog}, cache_size=0)
+    engine.trie("lg")
+    print(f"Compiled {len(catalog):,} phrases in {time.perf_counter() - start:.3f}s")
+    print(f"{'tokens':>8} {'total ms':>10} {'us/token':>10}")
+
+    for size in (10, 100, 1000, 10000, 50000):
+        payload = build_payload(size)
+        tokens = len(TOKEN_RE.findall(payload))
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            engine.translate(payload, "lg")
+        elapsed = (time.perf_counter() - start) / args.repeat
+        print(f"{tokens:>8} {elapsed * 1000:>10.3f} {elapsed / tokens * 1e6:>10.2f}")
+
+    cached = TranslationEngine({"lg": catalog}, cache_size=1024)
+    payload = build_payload(50)
+    cached.translate(payload, "lg")
+    start = time.perf_counter()
+    for _ in range(10000):
+        cached.translate(payload, "lg")
+    print(f"LRU hit: {(time.perf_counter() - start) / 10000 * 1e6:.2f} us per translation")
+
+if __name__ == "__main__":
+    main()
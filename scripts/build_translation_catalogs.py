@@ -0,0 +1,38 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Make the backend package importable
+sys.path.append(str(Path(__file__).parent.parent / "backend"))
+
+from app.utils.translation_catalog import CATALOG_SUFFIX, MappedCatalog, catalog_version, write_catalog
+
+def build(source: Path, output: Path):
+    """Compile every <lang>.json catalog in source into <lang>.agtc in output"""
+    output.mkdir(parents=True, exist_ok=True)
+    for json_path in sorted(source.glob("*.json")):
+        with open(json_path, "r", encoding="utf-8") as f:
+            catalog = json.load(f)
+        target = output / f"{json_path.stem}{CATALOG_SUFFIX}"
+        if target.exists():
+            try:
+                if MappedCatalog(target).version == catalog_version(catalog):
+                    print(f"{json_path.name}: unchanged")
+                    continue
+            except ValueError:
+                pass
+        version = write_catalog(target, catalog)
+        print(f"{json_path.name}: {len(catalog):,} entries -> {target} "
+              f"({target.stat().st_size:,} bytes, version {version:016x})")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile JSON translation catalogs into binary catalogs")
+    parser.add_argument("--source", default="backend/app/translations", help="Directory of <lang>.json catalogs")
+    parser.add_argument("--output", help="Output directory (defaults to the source directory)")
+    args = parser.parse_args()
+    source = Path(args.source)
+    build(source, Path(args.output) if args.output else source)
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,17 @@
+import argparse
 import os
 import sys
 from pathlib import Path
 
-# Add the parent directory to Python path
-sys.path.append(str(Path(__file__).parent.parent))
-
-from backend.app.models.database import Base
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from alembic import command
+from alembic.config import Config
 from dotenv import load_dotenv
 
+BACKEND_DIR = Path(__file__).parent.parent / "backend"
+
+# Make the backend package importable for the migration environment
+sys.path.append(str(BACKEND_DIR))
+
 # Load environment variables
 load_dotenv()
 
@@ -20,18 +22,20 @@ if not DATABASE_URL:
     print("Error: DATABASE_URL environment variable not set")
     sys.exit(1)
 
-def init_db():
-    """Initialize the database with required tables"""
+def alembic_config() -> Config:
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "migrations"))
+    config.set_main_option("sqlalchemy.url", DATABASE_URL)
+    return config
+
+def init_db(revision: str = "head", stamp: str = None):
+    """Bring the database schema up to `revision` through the migrations"""
     try:
-        # Create database engine
-        engine = create_engine(DATABASE_URL)
-        
-        # Create all tables
-        Base.metadata.create_all(bind=engine)
-        
-        # Create session factory
-        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-        
+        config = alembic_config()
+        if stamp:
+            # Databases created with create_all before migrations existed
+            command.stamp(config, stamp)
+        command.upgrade(config, revision)
         print("Database initialized successfully!")
         return True
         
@@ -40,4 +44,9 @@ def init_db():
         return False
 
 if __name__ == "__main__":
-    init_db() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Create or upgrade the database schema")
+    parser.add_argument("--revision", default="head", help="Target migration revision")
+    parser.add_argument("--stamp", help="Mark an existing pre-migration database as this revision first")
+    args = parser.parse_args()
+    if not init_db(args.revision, args.stamp):
+        sys.exit(1)
@@ -0,0 +1,470 @@
+"""Find the API's throughput ceiling offline, with stand-ins for every external service.
+
+    python scripts/load_test.py --concurrency 1,4,16,64 --duration 20 --output report.json
+
+Generates tiny stand-in models and market data, migrates a fresh SQLite
+database and starts the stub weather API, the stub SMS gateway and the API
+itself (uvicorn) on free local ports. It then drives a weighted mix of
+diagnosis, weather, market, USSD and crop CRUD requests at each concurrency
+level in turn, and writes a JSON report of throughput, p50/p95/p99 latency
+and error rate, overall and per endpoint, for every level.
+
+With --target, an already running API is tested instead; its dependencies
+are then up to you, and diagnosis only works if it can read --image-path.
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+BACKEND = ROOT / "backend"
+
+# Share of requests per scenario; override with --mix name=weight,...
+DEFAULT_MIX = {
+    "diagnose": 5,
+    "weather_current": 10,
+    "weather_forecast": 10,
+    "weather_model": 10,
+    "market_prices": 15,
+    "market_comparison": 5,
+    "ussd": 15,
+    "crops_list": 10,
+    "crop_create": 8,
+    "crop_update": 6,
+    "crop_delete": 4,
+    "sync": 2
+}
+CROPS = ["maize", "beans", "coffee", "bananas", "cassava"]
+REGIONS = ["central", "eastern", "northern", "western"]
+LOCATIONS = ["Kampala", "Gulu", "Mbarara", "Mbale", "Jinja"]
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load test the API against local stand-ins")
+    parser.add_argument("--concurrency", default="1,4,16,64", help="Comma-separated concurrency levels")
+    parser.add_argument("--duration", type=float, default=20.0, help="Measured seconds per level")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Unmeasured seconds before each level")
+    parser.add_argument("--mix", help="Scenario weights, e.g. market_prices=5,ussd=1 (others drop out)")
+    parser.add_argument("--max-p99-ms", type=float, default=0.0,
+                        help="Stop raising concurrency once overall p99 exceeds this (0 = never)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the API")
+    parser.add_argument("--weather-latency-ms", type=float, default=80.0, help="Stub weather API latency")
+    parser.add_argument("--weather-error-rate", type=float, default=0.0, help="Stub weather API 503 rate")
+    parser.add_argument("--sms-latency-ms", type=float, default=50.0, help="Stub SMS gateway latency")
+    parser.add_argument("--sms-error-rate", type=float, default=0.0, help="Stub SMS gateway 503 rate")
+    parser.add_argument("--workdir", help="Directory for fixtures, database and logs (default: temporary)")
+    parser.add_argument("--target", help="Test the API at this URL instead of starting one")
+    parser.add_argument("--username", default="loadtest", help="User to log in as")
+    parser.add_argument("--password", default="loadtest-password", help="Password of that user")
+    parser.add_argument("--image-path", help="Leaf image for diagnosis requests (default: generated)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the traffic mix")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    return parser.parse_args()
+
+# Fixtures
+
+def write_disease_model(directory: Path) -> Dict[str, str]:
+    """ResNet-18 with random weights and the classifier's 1000-way head"""
+    import torch
+    import torchvision.models as models
+    from PIL import Image
+
+    model_path = directory / "disease_classifier.pth"
+    if not model_path.exists():
+        model = models.resnet18(weights=None)
+        model.fc = torch.nn.Linear(model.fc.in_features, 1000)
+        torch.save(model.state_dict(), model_path)
+
+    config_path = directory / "disease_config.json"
+    diseases = ["Maize Streak Virus", "Cassava Mosaic", "Coffee Leaf Rust", "Banana Bacterial Wilt"]
+    config = {str(index): name for index, name in enumerate(diseases)}
+    config["disease_info"] = {
+        name: {"description": f"{name} stand-in", "treatment": "Remove infected plants",
+               "prevention": "Use clean planting material"}
+        for name in diseases
+    }
+    config_path.write_text(json.dumps(config))
+
+    image_path = directory / "leaf.jpg"
+    if not image_path.exists():
+        Image.effect_noise((256, 256), 64).convert("RGB").save(image_path)
+    return {"DISEASE_MODEL_PATH": str(model_path), "DISEASE_CONFIG_PATH": str(config_path),
+            "DISEASE_MODEL_ARCH": "resnet18", "image_path": str(image_path)}
+
+def write_weather_model(directory: Path) -> Dict[str, str]:
+    """A few shallow trees fitted on the predictor's (lat, lon, month, day, year) features"""
+    import joblib
+    import numpy as np
+    from sklearn.ensemble import RandomForestRegressor
+
+    model_path = directory / "weather_predictor.joblib"
+    if not model_path.exists():
+        rng = np.random.default_rng(0)
+        features = np.column_stack([
+            rng.uniform(0, 3, 500), rng.uniform(30, 34, 500), rng.integers(1, 13, 500),
+            rng.integers(1, 29, 500), rng.integers(2020, 2030, 500)
+        ])
+        temperatures = 22 + 3 * np.sin(features[:, 2] / 12 * 2 * np.pi) + rng.normal(0, 1, 500)
+        model = RandomForestRegressor(n_estimators=5, max_depth=4, random_state=0)
+        model.fit(features, temperatures)
+        joblib.dump(model, model_path)
+    return {"WEATHER_MODEL_PATH": str(model_path)}
+
+def write_market_data(directory: Path, days: int = 90) -> Dict[str, str]:
+    """Daily prices up to today, so current prices and trends are never empty"""
+    data_path = directory / "market_prices.csv"
+    rng = random.Random(0)
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    with open(data_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["crop", "region", "price", "unit", "date", "source"])
+        for crop in CROPS:
+            for region in REGIONS:
+                price = rng.uniform(500, 5000)
+                for offset in range(days, -1, -1):
+                    price = max(100.0, price * rng.uniform(0.97, 1.03))
+                    date = (today - timedelta(days=offset)).strftime("%Y-%m-%d")
+                    writer.writerow([crop, region, round(price, 2), "UGX/kg", date, "load-test"])
+    return {"MARKET_DATA_PATH": str(data_path)}
+
+# Processes
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start(command: List[str], workdir: Path, name: str, env: Dict[str, str],
+          cwd: Path = ROOT) -> subprocess.Popen:
+    log = open(workdir / f"{name}.log", "w")
+    return subprocess.Popen(command, cwd=cwd, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+async def wait_ready(url: str, process: Optional[subprocess.Popen], timeout: float = 180.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            if process is not None and process.poll() is not None:
+                raise RuntimeError(f"{url} exited with status {process.returncode}; see its log")
+            try:
+                await client.get(url, timeout=2.0)
+                return
+            except httpx.HTTPError:
+                await asyncio.sleep(0.5)
+    raise RuntimeError(f"{url} did not become ready within {timeout:.0f}s")
+
+def check_app_imports(env: Dict[str, str], timeout: float = 120.0):
+    """Import the app once in the foreground, so a bad setting fails with its
+    traceback right away instead of as a timeout in every uvicorn worker"""
+    result = subprocess.run([sys.executable, "-c", "import main"], cwd=BACKEND, env=env,
+                            capture_output=True, text=True, timeout=timeout)
+    if result.returncode != 0:
+        tail = "\n".join(result.stderr.strip().splitlines()[-15:])
+        raise RuntimeError(f"The API does not start with the load-test environment:\n{tail}")
+
+def prepare_environment(args, workdir: Path) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update(write_weather_model(workdir))
+    env.update(write_market_data(workdir))
+    disease = write_disease_model(workdir)
+    image_path = disease.pop("image_path")
+    args.image_path = args.image_path or image_path
+    env.update(disease)
+    env.update({
+        "DATABASE_URL": "sqlite:///" + str(workdir / "loadtest.db"),
+        "REDIS_URL": env.get("REDIS_URL", "redis://127.0.0.1:6379/0"),
+        "SECRET_KEY": "load-test",
+        "WEATHER_API_KEY": "load-test",
+        "SMS_API_KEY": "load-test",
+        "SMS_API_SECRET": "load-test",
+        "SMS_SENDER_ID": "AgroGPT",
+        # No Redis is started; revocation checks would fail on every request
+        "AUTH_CACHE_BACKEND": "memory",
+        # Cheapest bcrypt cost: logins are not what is being measured
+        "PASSWORD_HASH_ROUNDS": "4",
+        "METRICS_ENABLED": "true"
+    })
+    env.pop("PASSWORD_HASH_TARGET_MS", None)
+    return env
+
+def seed_database(env: Dict[str, str], username: str, password: str):
+    subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"],
+                   cwd=BACKEND, env=env, check=True, capture_output=True)
+    script = (
+        "import asyncio, sys\n"
+        "from app.services.user_service import UserService\n"
+        "asyncio.run(UserService.create_user(sys.argv[1], sys.argv[1] + '@example.com', sys.argv[2]))\n"
+    )
+    subprocess.run([sys.executable, "-c", script, username, password],
+                   cwd=BACKEND, env=env, check=True, capture_output=True)
+
+# Traffic
+
+class Context:
+    def __init__(self, image_path: str, rng: random.Random):
+        self.image_path = image_path
+        self.rng = rng
+        self.crop_ids: List[int] = []
+
+async def diagnose(client: httpx.AsyncClient, ctx: Context):
+    return await client.post("/api/v1/diagnose-disease",
+                             json={"image_url": ctx.image_path, "crop_type": ctx.rng.choice(CROPS)})
+
+async def weather_current(client, ctx):
+    return await client.get(f"/api/v1/weather/current/{ctx.rng.choice(LOCATIONS)}")
+
+async def weather_forecast(client, ctx):
+    return await client.get(f"/api/v1/weather/forecast/{ctx.rng.choice(LOCATIONS)}",
+                            params={"days": 3, "compact": "true"})
+
+async def weather_model(client, ctx):
+    return await client.get("/api/v1/weather-forecast", params={"region": ctx.rng.choice(REGIONS)})
+
+async def market_prices(client, ctx):
+    return await client.get("/api/v1/market-prices", params={
+        "crop": ctx.rng.choice(CROPS), "region": ctx.rng.choice(REGIONS),
+        "language": ctx.rng.choice(["en", "en", "lg"])
+    })
+
+async def market_comparison(client, ctx):
+    return await client.get("/api/v1/market-comparison", params={"crop": ctx.rng.choice(CROPS)})
+
+async def ussd(client, ctx):
+    return await client.post("/api/v1/ussd", params={
+        "session_id": uuid.uuid4().hex, "phone_number": f"+2567{ctx.rng.randrange(10 ** 8):08d}",
+        "ussd_code": "*284#", "text": ctx.rng.choice(["", "1", "2", "1*1", "2*1"])
+    })
+
+async def crops_list(client, ctx):
+    return await client.get("/api/v1/crops/", params={"limit": 20})
+
+def crop_body(ctx: Context) -> Dict:
+    planted = datetime.utcnow() - timedelta(days=ctx.rng.randrange(60))
+    return {
+        "name": ctx.rng.choice(CROPS), "variety": "load-test",
+        "planting_date": planted.isoformat(),
+        "expected_harvest_date": (planted + timedelta(days=120)).isoformat(),
+        "field_location": "Plot 1", "area_size": round(ctx.rng.uniform(0.2, 5), 2)
+    }
+
+async def crop_create(client, ctx):
+    response = await client.post("/api/v1/crops/", json=crop_body(ctx))
+    if response.status_code == 200:
+        ctx.crop_ids.append(response.json()["id"])
+    return response
+
+async def crop_update(client, ctx):
+    if not ctx.crop_ids:
+        return await crop_create(client, ctx)
+    crop_id = ctx.rng.choice(ctx.crop_ids)
+    return await client.put(f"/api/v1/crops/{crop_id}", json={"area_size": round(ctx.rng.uniform(0.2, 5), 2)})
+
+async def crop_delete(client, ctx):
+    if not ctx.crop_ids:
+        return await crop_create(client, ctx)
+    crop_id = ctx.crop_ids.pop(ctx.rng.randrange(len(ctx.crop_ids)))
+    return await client.delete(f"/api/v1/crops/{crop_id}")
+
+async def sync(client, ctx):
+    return await client.get("/api/v1/sync", params={"limit": 200})
+
+SCENARIOS: Dict[str, Callable[[httpx.AsyncClient, Context], Awaitable[httpx.Response]]] = {
+    "diagnose": diagnose,
+    "weather_current": weather_current,
+    "weather_forecast": weather_forecast,
+    "weather_model": weather_model,
+    "market_prices": market_prices,
+    "market_comparison": market_comparison,
+    "ussd": ussd,
+    "crops_list": crops_list,
+    "crop_create": crop_create,
+    "crop_update": crop_update,
+    "crop_delete": crop_delete,
+    "sync": sync
+}
+
+def parse_mix(value: Optional[str]) -> Dict[str, float]:
+    if not value:
+        return dict(DEFAULT_MIX)
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in SCENARIOS:
+            raise SystemExit(f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+class Sample(NamedTuple):
+    scenario: str
+    seconds: float
+    ok: bool
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted values"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, int(round(fraction * len(values))) - 1))]
+
+def summarize(samples: List[Sample], seconds: float) -> Dict:
+    latencies = sorted(sample.seconds for sample in samples)
+    errors = sum(not sample.ok for sample in samples)
+    return {
+        "requests": len(samples),
+        "throughput_rps": round(len(samples) / seconds, 2),
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2)
+    }
+
+async def run_level(base_url: str, token: str, mix: Dict[str, float], concurrency: int,
+                    warmup: float, duration: float, ctx: Context) -> Dict:
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    samples: List[Sample] = []
+    errors: Counter = Counter()
+    started = time.monotonic()
+    measure_from = started + warmup
+    stop_at = measure_from + duration
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0,
+                                 headers={"Authorization": f"Bearer {token}"}) as client:
+        async def worker():
+            while time.monotonic() < stop_at:
+                name = ctx.rng.choices(names, weights)[0]
+                request_started = time.perf_counter()
+                try:
+                    response = await SCENARIOS[name](client, ctx)
+                    ok = response.status_code < 400
+                    if not ok:
+                        detail = f"{name}: HTTP {response.status_code}"
+                except httpx.HTTPError as e:
+                    ok = False
+                    detail = f"{name}: {type(e).__name__}"
+                elapsed = time.perf_counter() - request_started
+                if time.monotonic() >= measure_from:
+                    samples.append(Sample(name, elapsed, ok))
+                    if not ok:
+                        errors[detail] += 1
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    measured = max(time.monotonic() - measure_from, 1e-9)
+    by_scenario = defaultdict(list)
+    for sample in samples:
+        by_scenario[sample.scenario].append(sample)
+    return {
+        "concurrency": concurrency,
+        "duration_seconds": round(measured, 2),
+        **summarize(samples, measured),
+        "endpoints": {name: summarize(by_scenario[name], measured) for name in names if by_scenario[name]},
+        "errors": dict(errors.most_common(10))
+    }
+
+async def login(base_url: str, username: str, password: str) -> str:
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0) as client:
+        response = await client.post("/api/v1/token", data={"username": username, "password": password})
+        response.raise_for_status()
+        return response.json()["access_token"]
+
+def print_level(level: Dict):
+    print(f"\nconcurrency {level['concurrency']}: {level['throughput_rps']:.1f} req/s, "
+          f"p50 {level['p50_ms']:.1f}ms p95 {level['p95_ms']:.1f}ms p99 {level['p99_ms']:.1f}ms, "
+          f"errors {level['error_rate']:.2%}", file=sys.stderr)
+    for name, stats in level["endpoints"].items():
+        print(f"  {name:>18} {stats['throughput_rps']:>8.1f}/s {stats['p50_ms']:>8.1f} "
+              f"{stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f}ms  err {stats['error_rate']:.2%}",
+              file=sys.stderr)
+
+async def main():
+    args = parse_args()
+    mix = parse_mix(args.mix)
+    levels = [int(level) for level in args.concurrency.split(",")]
+    workdir = Path(args.workdir or tempfile.mkdtemp(prefix="agrogpt-load-"))
+    workdir.mkdir(parents=True, exist_ok=True)
+    processes: List[subprocess.Popen] = []
+
+    try:
+        if args.target:
+            base_url = args.target.rstrip("/")
+            if not args.image_path:
+                args.image_path = write_disease_model(workdir)["image_path"]
+        else:
+            print(f"Preparing stand-ins in {workdir}", file=sys.stderr)
+            env = prepare_environment(args, workdir)
+            seed_database(env, args.username, args.password)
+
+            weather_port, sms_port, api_port = free_port(), free_port(), free_port()
+            processes.append(start([sys.executable, "scripts/stub_weather_api.py", "--port", str(weather_port),
+                                    "--latency-ms", str(args.weather_latency_ms),
+                                    "--error-rate", str(args.weather_error_rate)], workdir, "weather", env))
+            processes.append(start([sys.executable, "scripts/stub_sms_gateway.py", "--port", str(sms_port),
+                                    "--latency-ms", str(args.sms_latency_ms),
+                                    "--error-rate", str(args.sms_error_rate)], workdir, "sms", env))
+            env["WEATHER_API_BASE_URL"] = f"http://127.0.0.1:{weather_port}"
+            env["SMS_API_BASE_URL"] = f"http://127.0.0.1:{sms_port}"
+            await wait_ready(f"http://127.0.0.1:{weather_port}/stats", processes[0])
+            await wait_ready(f"http://127.0.0.1:{sms_port}/stats", processes[1])
+
+            check_app_imports(env)
+            base_url = f"http://127.0.0.1:{api_port}"
+            api = start([sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1",
+                         "--port", str(api_port), "--workers", str(args.workers), "--log-level", "warning"],
+                        workdir, "api", env, cwd=BACKEND)
+            processes.append(api)
+            print("Waiting for the API to load its models", file=sys.stderr)
+            await wait_ready(base_url + "/", api)
+
+        token = await login(base_url, args.username, args.password)
+        ctx = Context(args.image_path, random.Random(args.seed))
+        report = {
+            "config": {
+                "target": base_url, "levels": levels, "duration_seconds": args.duration,
+                "warmup_seconds": args.warmup, "mix": mix, "api_workers": args.workers,
+                "weather_latency_ms": args.weather_latency_ms, "sms_latency_ms": args.sms_latency_ms,
+                "started_at": datetime.utcnow().isoformat()
+            },
+            "levels": []
+        }
+        for concurrency in levels:
+            level = await run_level(base_url, token, mix, concurrency, args.warmup, args.duration, ctx)
+            report["levels"].append(level)
+            print_level(level)
+            if args.max_p99_ms and level["p99_ms"] > args.max_p99_ms:
+                print(f"p99 above {args.max_p99_ms:.0f}ms; not raising concurrency further", file=sys.stderr)
+                break
+
+        peak = max(report["levels"], key=lambda level: level["throughput_rps"])
+        report["peak"] = {"concurrency": peak["concurrency"], "throughput_rps": peak["throughput_rps"],
+                          "p99_ms": peak["p99_ms"], "error_rate": peak["error_rate"]}
+        output = json.dumps(report, indent=2)
+        if args.output:
+            Path(args.output).write_text(output + "\n")
+            print(f"\nReport written to {args.output}", file=sys.stderr)
+        else:
+            print(output)
+    finally:
+        for process in reversed(processes):
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+if __name__ == "__main__":
+    asyncio.run(main())
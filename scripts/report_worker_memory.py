@@ -0,0 +1,57 @@
+"""Report unique vs shared memory of a gunicorn master and its workers.
+
+    python scripts/report_worker_memory.py <master pid> [--json]
+
+Reads /proc/<pid>/smaps_rollup for the master and each worker. With the
+app preloaded in the master, most of a worker's resident memory should
+show as shared; the sum of PSS is what the whole server really uses.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Make the backend package importable
+sys.path.append(str(Path(__file__).parent.parent / "backend"))
+
+from app.utils.memory import child_pids, memory_usage
+
+MIB = 2 ** 20
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Report per-worker unique vs shared memory")
+    parser.add_argument("pid", type=int, help="PID of the gunicorn master")
+    parser.add_argument("--json", action="store_true", help="Print a JSON report")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    processes = [("master", memory_usage(args.pid))]
+    processes += [("worker", memory_usage(pid)) for pid in child_pids(args.pid)]
+    unavailable = [usage["pid"] for _, usage in processes if not usage["available"]]
+    if unavailable:
+        sys.exit(f"smaps_rollup not readable for {unavailable} (Linux 4.14+ and permissions required)")
+
+    totals = {
+        "rss": sum(usage["rss"] for _, usage in processes),
+        "pss": sum(usage["pss"] for _, usage in processes),
+        "unique": sum(usage["unique"] for _, usage in processes)
+    }
+    if args.json:
+        print(json.dumps({
+            "processes": [dict(usage, role=role) for role, usage in processes],
+            "totals": totals
+        }, indent=2))
+        return
+
+    print(f"{'role':>8} {'pid':>8} {'rss':>10} {'unique':>10} {'shared':>10} {'pss':>10}")
+    for role, usage in processes:
+        print(f"{role:>8} {usage['pid']:>8} {usage['rss'] / MIB:>8.1f}Mi {usage['unique'] / MIB:>8.1f}Mi "
+              f"{usage['shared'] / MIB:>8.1f}Mi {usage['pss'] / MIB:>8.1f}Mi")
+    print(f"{'total':>8} {'':>8} {totals['rss'] / MIB:>8.1f}Mi {totals['unique'] / MIB:>8.1f}Mi "
+          f"{'':>10} {totals['pss'] / MIB:>8.1f}Mi")
+    print(f"RSS counts shared pages once per process; PSS total is the real footprint "
+          f"({totals['rss'] / max(totals['pss'], 1):.1f}x less)")
+
+if __name__ == "__main__":
+    main()
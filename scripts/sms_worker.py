@@ -0,0 +1,59 @@
+"""Outbound SMS queue worker. Run as many processes as needed:
+
+    python scripts/sms_worker.py --batch-size 200
+"""
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Make the backend package importable
+sys.path.append(str(Path(__file__).parent.parent / "backend"))
+
+# Load environment variables
+load_dotenv()
+
+from app.services.bulk_sms import BulkSMSSenderFactory
+from app.services.sms_queue import SMSQueueFactory, SMSQueueWorker
+
+def main():
+    parser = argparse.ArgumentParser(description="Deliver queued and scheduled SMS")
+    parser.add_argument("--batch-size", type=int, default=100, help="Messages claimed per batch")
+    parser.add_argument("--idle-poll", type=float, default=5.0,
+                        help="Maximum seconds to sleep before checking for new messages")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    api_key = os.getenv("SMS_API_KEY")
+    if not api_key:
+        print("Error: SMS_API_KEY environment variable not set")
+        sys.exit(1)
+
+    sender = BulkSMSSenderFactory.create_sender(
+        # An empty value (unset variable in a compose file) means the default
+        api_key, os.getenv("SMS_API_BASE_URL") or "https://api.smsprovider.com/v1"
+    )
+    worker = SMSQueueWorker(
+        SMSQueueFactory.create_queue(),
+        sender,
+        batch_size=args.batch_size,
+        idle_poll_seconds=args.idle_poll
+    )
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, worker.stop)
+        await worker.run()
+        print(f"Worker {worker.worker_id} stopped: {worker.sent} sent, {worker.failed} failed")
+
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    main()
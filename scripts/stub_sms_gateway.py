@@ -0,0 +1,88 @@
+"""Local stand-in for the SMS provider, for testing bulk and queued sends.
+
+Usage:
+    python scripts/stub_sms_gateway.py --port 9001 --latency-ms 50 --error-rate 0.05
+    SMS_API_BASE_URL=http://127.0.0.1:9001 SMS_BATCH_SIZE=100 uvicorn main:app
+"""
+import argparse
+import asyncio
+import itertools
+import random
+import time
+from typing import Dict, List, Union
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+def create_gateway(latency_ms: float = 0.0, error_rate: float = 0.0,
+                   rate_limit: float = 0.0) -> FastAPI:
+    """Build a stub gateway with configurable latency, errors and rate limit"""
+    app = FastAPI(title="Stub SMS Gateway")
+    message_ids = itertools.count(1)
+    stats = {"requests": 0, "messages": 0, "errors": 0, "throttled": 0}
+    window = {"started": time.monotonic(), "count": 0}
+
+    def throttled(messages: int) -> bool:
+        """Fixed one-second window limiter mimicking provider throttling"""
+        if not rate_limit:
+            return False
+        now = time.monotonic()
+        if now - window["started"] >= 1.0:
+            window["started"] = now
+            window["count"] = 0
+        if window["count"] + messages > rate_limit:
+            return True
+        window["count"] += messages
+        return False
+
+    async def accept(recipients: List[str]) -> Union[JSONResponse, List[Dict]]:
+        stats["requests"] += 1
+        if latency_ms:
+            await asyncio.sleep(random.uniform(0.5, 1.5) * latency_ms / 1000)
+        if throttled(len(recipients)):
+            stats["throttled"] += 1
+            return JSONResponse({"error": "rate limited"}, status_code=429,
+                                headers={"Retry-After": "1"})
+        if random.random() < error_rate:
+            stats["errors"] += 1
+            return JSONResponse({"error": "provider unavailable"}, status_code=503)
+        stats["messages"] += len(recipients)
+        return [
+            {"to": recipient, "status": "queued", "message_id": f"stub-{next(message_ids)}"}
+            for recipient in recipients
+        ]
+
+    @app.post("/sms/send")
+    async def send(request: Request):
+        payload = await request.json()
+        result = await accept([payload["to"]])
+        return result if isinstance(result, JSONResponse) else result[0]
+
+    @app.post("/sms/batch")
+    async def send_batch(request: Request):
+        payload = await request.json()
+        result = await accept(list(payload["to"]))
+        return result if isinstance(result, JSONResponse) else {"results": result}
+
+    @app.get("/stats")
+    async def get_stats():
+        return stats
+
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local stub SMS gateway")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9001)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mean response latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 503 responses")
+    parser.add_argument("--rate-limit", type=float, default=0.0,
+                        help="Messages per second before answering 429 (0 = unlimited)")
+    args = parser.parse_args()
+
+    app = create_gateway(args.latency_ms, args.error_rate, args.rate_limit)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Local stand-in for weatherapi.com, for load tests and offline development.
+
+Usage:
+    python scripts/stub_weather_api.py --port 9002 --latency-ms 80 --error-rate 0.01
+    WEATHER_API_BASE_URL=http://127.0.0.1:9002 uvicorn main:app
+"""
+import argparse
+import asyncio
+import random
+from datetime import datetime, timedelta
+from typing import Dict
+
+import uvicorn
+from fastapi import FastAPI, Query
+from fastapi.responses import JSONResponse
+
+CONDITIONS = ["Sunny", "Partly cloudy", "Patchy rain possible", "Moderate rain", "Thundery outbreaks possible"]
+
+def _condition() -> Dict:
+    return {"text": random.choice(CONDITIONS), "icon": "//cdn.weatherapi.com/weather/64x64/day/176.png",
+            "code": 1063}
+
+def _location(name: str) -> Dict:
+    now = datetime.utcnow()
+    return {"name": name, "region": name, "country": "Uganda", "lat": 0.32, "lon": 32.58,
+            "tz_id": "Africa/Kampala", "localtime_epoch": int(now.timestamp()),
+            "localtime": now.strftime("%Y-%m-%d %H:%M")}
+
+def _hour(moment: datetime) -> Dict:
+    temp = round(random.uniform(16, 30), 1)
+    return {
+        "time_epoch": int(moment.timestamp()), "time": moment.strftime("%Y-%m-%d %H:%M"),
+        "temp_c": temp, "temp_f": round(temp * 9 / 5 + 32, 1), "is_day": int(6 <= moment.hour < 18),
+        "condition": _condition(), "wind_kph": round(random.uniform(2, 20), 1), "wind_dir": "ESE",
+        "pressure_mb": 1012.0, "precip_mm": round(random.uniform(0, 3), 1),
+        "humidity": random.randint(40, 95), "cloud": random.randint(0, 100), "feelslike_c": temp,
+        "will_it_rain": random.randint(0, 1), "chance_of_rain": random.randint(0, 100),
+        "vis_km": 10.0, "gust_kph": 13.0, "uv": 5.0
+    }
+
+def current_payload(location: str) -> Dict:
+    current = _hour(datetime.utcnow())
+    current["last_updated"] = current["time"]
+    current["air_quality"] = {"co": 317.1, "no2": 4.2, "o3": 52.9, "so2": 1.1, "pm2_5": 11.3, "pm10": 14.7}
+    return {"location": _location(location), "current": current}
+
+def forecast_payload(location: str, days: int) -> Dict:
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    forecast_days = []
+    for offset in range(days):
+        date = today + timedelta(days=offset)
+        forecast_days.append({
+            "date": date.strftime("%Y-%m-%d"), "date_epoch": int(date.timestamp()),
+            "day": {
+                "maxtemp_c": round(random.uniform(25, 32), 1), "mintemp_c": round(random.uniform(14, 19), 1),
+                "avgtemp_c": 22.6, "maxwind_kph": 14.8, "totalprecip_mm": round(random.uniform(0, 20), 1),
+                "avghumidity": random.randint(50, 90), "daily_will_it_rain": 1,
+                "daily_chance_of_rain": random.randint(0, 100), "condition": _condition(), "uv": 6.0
+            },
+            "astro": {"sunrise": "06:58 AM", "sunset": "07:06 PM"},
+            "hour": [_hour(date + timedelta(hours=hour)) for hour in range(24)]
+        })
+    return {"location": _location(location), "current": _hour(datetime.utcnow()),
+            "forecast": {"forecastday": forecast_days}}
+
+def create_weather_api(latency_ms: float = 0.0, error_rate: float = 0.0) -> FastAPI:
+    """Build a stub weatherapi.com with configurable latency and error rate"""
+    app = FastAPI(title="Stub Weather API")
+    stats = {"requests": 0, "errors": 0}
+
+    async def respond(payload_factory):
+        stats["requests"] += 1
+        if latency_ms:
+            await asyncio.sleep(random.uniform(0.5, 1.5) * latency_ms / 1000)
+        if random.random() < error_rate:
+            stats["errors"] += 1
+            return JSONResponse({"error": {"code": 9999, "message": "Internal application error."}},
+                                status_code=503)
+        return payload_factory()
+
+    @app.get("/current.json")
+    async def current(q: str, key: str = ""):
+        return await respond(lambda: current_payload(q))
+
+    @app.get("/forecast.json")
+    async def forecast(q: str, days: int = Query(3, ge=1, le=14), key: str = ""):
+        return await respond(lambda: forecast_payload(q, days))
+
+    @app.get("/alerts.json")
+    async def alerts(q: str, key: str = ""):
+        return await respond(lambda: {"location": _location(q), "alerts": {"alert": []}})
+
+    @app.get("/stats")
+    async def get_stats():
+        return stats
+
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local stub weather API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9002)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mean response latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 503 responses")
+    args = parser.parse_args()
+
+    app = create_weather_api(args.latency_ms, args.error_rate)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()